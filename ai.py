@@ -0,0 +1,249 @@
+import functools
+import random
+from array import array
+
+from engine import FINAL_SQUARE
+
+# AI Policy
+# Decision logic of EnhancedAIPlayer as plain functions over positions and the
+# board's square map, so it can run headless (tournaments, servers) without pygame.
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def is_deterministic(difficulty):
+    """True if the policy always makes the same decision in the same position"""
+    return difficulty != "easy"
+
+
+def get_move_delay(difficulty):
+    """Get move delay based on difficulty"""
+    delays = {
+        "easy": 1.0,    # Fast moves
+        "medium": 1.5,  # Normal speed
+        "hard": 2.0     # Slower, more "thoughtful"
+    }
+    return delays.get(difficulty, 1.5)
+
+
+def get_strategy_weights(difficulty):
+    """Define strategy weights based on difficulty level"""
+    if difficulty == "easy":
+        return {
+            'aggressive': 0.3,
+            'cautious': 0.5,
+            'random': 0.2
+        }
+    elif difficulty == "hard":
+        return {
+            'aggressive': 0.7,
+            'cautious': 0.3,
+            'random': 0.0
+        }
+    else:  # medium
+        return {
+            'aggressive': 0.5,
+            'cautious': 0.4,
+            'random': 0.1
+        }
+
+
+def analyze_board_position(position, opponent_position, squares, final_square=FINAL_SQUARE):
+    """Analyze board position to determine strategy"""
+    analysis = {
+        'nearby_ladders': [],
+        'nearby_snakes': [],
+        'distance_to_opponent': abs(position - opponent_position),
+        'progress_percentage': position / final_square,
+        'opponent_ahead': opponent_position > position
+    }
+
+    # Find ladders and snakes within reach (1-6 steps)
+    for steps in range(1, 7):
+        target_pos = position + steps
+        if target_pos <= final_square and target_pos in squares:
+            if squares[target_pos] > target_pos:
+                analysis['nearby_ladders'].append({
+                    'steps': steps,
+                    'from': target_pos,
+                    'to': squares[target_pos],
+                    'gain': squares[target_pos] - target_pos
+                })
+            else:
+                analysis['nearby_snakes'].append({
+                    'steps': steps,
+                    'from': target_pos,
+                    'to': squares[target_pos],
+                    'loss': target_pos - squares[target_pos]
+                })
+
+    return analysis
+
+
+def calculate_move_desirability(position, steps, opponent_position, squares, final_square=FINAL_SQUARE):
+    """Calculate how desirable a move is"""
+    target_pos = min(position + steps, final_square)
+    score = 0
+
+    # Base score: closer to the final square is better
+    progress_score = (target_pos - position) * 10
+    score += progress_score
+
+    # Bonus for landing on ladder
+    if target_pos in squares and squares[target_pos] > target_pos:
+        ladder_bonus = (squares[target_pos] - target_pos) * 15
+        score += ladder_bonus
+
+    # Penalty for landing on snake
+    if target_pos in squares and squares[target_pos] < target_pos:
+        snake_penalty = (target_pos - squares[target_pos]) * -20
+        score += snake_penalty
+
+    # Strategy based on opponent position
+    if target_pos > opponent_position:
+        score += 8  # Bonus for being ahead
+    elif target_pos == opponent_position:
+        score += 5  # Small bonus for tying
+
+    # End game strategy - be more aggressive near finish
+    if position > final_square - 20:
+        if target_pos == final_square:
+            score += 50  # Big bonus for winning
+        elif target_pos > final_square - 5:
+            score += 20  # Bonus for getting very close
+
+    return score
+
+
+def decide_roll(difficulty, position, opponent_position, squares, final_square=FINAL_SQUARE, rng=random):
+    """Decide whether the AI rolls now (True) or holds back (False)"""
+    # For easy AI, sometimes make random decisions
+    if difficulty == "easy" and rng.random() < 0.1:
+        return rng.choice([True, False])
+
+    # Analyze position before rolling
+    analysis = analyze_board_position(position, opponent_position, squares, final_square)
+
+    # Simulate possible dice outcomes (1-6) and average their desirability
+    avg_desirability = sum(
+        calculate_move_desirability(position, dice_value, opponent_position, squares, final_square)
+        for dice_value in range(1, 7)) / 6
+
+    # Decision making based on difficulty
+    if difficulty == "hard":
+        # Hard AI is very strategic
+        if len(analysis['nearby_snakes']) > 2:
+            return avg_desirability > 5  # More cautious with many snakes
+        else:
+            return avg_desirability > -5  # Generally willing to take risks
+
+    elif difficulty == "easy":
+        # Easy AI is less strategic
+        return avg_desirability > -15  # Takes more risks
+
+    else:  # medium
+        # Medium AI balances risk and reward
+        return avg_desirability > -8
+
+
+def get_ai_decision_info(difficulty, position, opponent_position, squares, final_square=FINAL_SQUARE):
+    """Get information about AI's decision making for display"""
+    analysis = analyze_board_position(position, opponent_position, squares, final_square)
+
+    decision_info = {
+        'thinking': f"Analyzing position {position}...",
+        'ladders_nearby': len(analysis['nearby_ladders']),
+        'snakes_nearby': len(analysis['nearby_snakes']),
+        'strategy': difficulty.capitalize() + " AI"
+    }
+
+    if analysis['opponent_ahead']:
+        decision_info['status'] = "Trying to catch up"
+    else:
+        decision_info['status'] = "Playing defensively"
+
+    return decision_info
+
+
+class AITables:
+    """Precomputed decisions of one difficulty on one board.
+
+    Everything the policy looks at depends only on (own position, opponent
+    position). The opponent only adds a bonus that shrinks as the opponent
+    moves up, so from each position the AI rolls exactly while the opponent
+    is below a cutoff square; decisions are stored as one cutoff per position
+    and per-frame AI work becomes a lookup.
+    """
+
+    def __init__(self, difficulty, squares, final_square=FINAL_SQUARE):
+        self.difficulty = difficulty
+        self.final_square = final_square
+        self.size = size = final_square + 1
+        self.random_decisions = not is_deterministic(difficulty)
+
+        # Per-position counts of ladders/snakes within reach of one roll
+        self.ladders_nearby = array('B', bytes(size))
+        self.snakes_nearby = array('B', bytes(size))
+        # Roll while the opponent is on a square below roll_until[position]
+        self.roll_until = array('L', [0]) * size
+
+        for position in range(size):
+            analysis = analyze_board_position(position, 0, squares, final_square)
+            self.ladders_nearby[position] = len(analysis['nearby_ladders'])
+            self.snakes_nearby[position] = len(analysis['nearby_snakes'])
+
+            # The opponent only adds +8 per target ahead of it and +5 per tie,
+            # so score everything else once per position
+            targets = [min(position + steps, final_square) for steps in range(1, 7)]
+            base = sum(calculate_move_desirability(position, steps, -1, squares, final_square) - 8
+                       for steps in range(1, 7))
+
+            # The bonus only changes at a target square and just past it
+            cutoff = size
+            for opponent in sorted({0} | set(targets) | {target + 1 for target in targets}):
+                if opponent >= size:
+                    break
+                bonus = sum(8 if target > opponent else 5 if target == opponent else 0
+                            for target in targets)
+                if not self._decide((base + bonus) / 6, self.snakes_nearby[position]):
+                    cutoff = opponent
+                    break
+            self.roll_until[position] = cutoff
+
+    def _decide(self, avg_desirability, snakes_nearby):
+        """Deterministic part of decide_roll"""
+        if self.difficulty == "hard":
+            if snakes_nearby > 2:
+                return avg_desirability > 5
+            return avg_desirability > -5
+        elif self.difficulty == "easy":
+            return avg_desirability > -15
+        else:  # medium
+            return avg_desirability > -8
+
+    def should_roll(self, position, opponent_position, rng=random):
+        """Same decision as decide_roll, as a table lookup"""
+        # For easy AI, sometimes make random decisions
+        if self.random_decisions and rng.random() < 0.1:
+            return rng.choice([True, False])
+        return opponent_position < self.roll_until[position]
+
+    def decision_info(self, position, opponent_position):
+        """Same information as get_ai_decision_info, from the tables"""
+        return {
+            'thinking': f"Analyzing position {position}...",
+            'ladders_nearby': self.ladders_nearby[position],
+            'snakes_nearby': self.snakes_nearby[position],
+            'strategy': self.difficulty.capitalize() + " AI",
+            'status': "Trying to catch up" if opponent_position > position else "Playing defensively",
+        }
+
+
+def get_tables(difficulty, squares, final_square=FINAL_SQUARE):
+    """Shared AITables for a difficulty and board layout"""
+    return _get_tables(difficulty, final_square, tuple(sorted(squares.items())))
+
+
+@functools.lru_cache(maxsize=32)
+def _get_tables(difficulty, final_square, items):
+    return AITables(difficulty, dict(items), final_square)
@@ -0,0 +1,263 @@
+import argparse
+import functools
+from collections import namedtuple
+
+import numpy as np
+
+from engine import START_SQUARE, FINAL_SQUARE, default_squares, resolve_move
+from board_spec import load_board
+
+try:
+    from scipy import sparse
+    from scipy.sparse.linalg import spsolve
+except ImportError:  # Dense linear algebra is used for every board size
+    sparse = None
+
+# Exact Markov-Chain Analyzer
+# A single token is an absorbing Markov chain over squares 1..final_square:
+# every roll (1-6, equally likely) follows engine.resolve_move and the final
+# square is absorbing. Players never interact, so race statistics follow from
+# the single-token turn distribution.
+
+SPARSE_THRESHOLD = 400  # Boards with more squares use scipy.sparse when available
+PMF_TOLERANCE = 1e-12  # Stop extending a turn PMF once this much mass is left
+MAX_PMF_TURNS = 100_000
+MAX_TABLE_SQUARES = 1000  # Win tables grow with the square of the board; larger boards get none
+MAX_DENSE_SQUARES = 2500  # Without scipy, larger boards are too big to solve densely
+
+# expected_turns[s]: expected rolls to finish from square s (index 0 unused)
+# turn_pmf[n]: probability one player needs exactly n rolls from the start square
+# game_length_pmf[n]: probability a 2-player game lasts exactly n rolls in total
+BoardAnalysis = namedtuple('BoardAnalysis', 'expected_turns turn_pmf game_length_pmf first_player_win')
+
+
+def board_key(squares, final_square=FINAL_SQUARE):
+    """Hashable identity of a board layout, used to cache results per board"""
+    return final_square, tuple(sorted(squares.items()))
+
+
+def transition_matrix(squares, final_square=FINAL_SQUARE, use_sparse=None):
+    """Return the (final_square + 1) square transition matrix of one roll.
+
+    Row/column index is the square number; row 0 is unused and the final
+    square is absorbing.
+    """
+    size = final_square + 1
+    if use_sparse is None:
+        use_sparse = sparse is not None and final_square > SPARSE_THRESHOLD
+
+    rows, cols, probs = [], [], []
+    for square in range(START_SQUARE, final_square):
+        for dice in range(1, 7):
+            _, position = resolve_move(square, dice, squares, final_square)
+            rows.append(square)
+            cols.append(position)
+            probs.append(1 / 6)
+    rows.append(final_square)
+    cols.append(final_square)
+    probs.append(1.0)
+
+    if use_sparse:
+        # Duplicate (row, col) pairs are summed on conversion
+        return sparse.csr_matrix((probs, (rows, cols)), shape=(size, size))
+    matrix = np.zeros((size, size))
+    np.add.at(matrix, (rows, cols), probs)
+    return matrix
+
+
+def expected_turns(squares, final_square=FINAL_SQUARE):
+    """Expected rolls to reach the final square from every square (index = square)"""
+    return analyze(squares, final_square).expected_turns
+
+
+def analyze(squares=None, final_square=FINAL_SQUARE):
+    """Full exact analysis of a board, cached per layout"""
+    if squares is None:
+        squares = default_squares()
+    return _analyze(board_key(squares, final_square))
+
+
+@functools.lru_cache(maxsize=32)
+def _analyze(key):
+    final_square, items = key
+    squares = dict(items)
+    matrix = transition_matrix(squares, final_square)
+
+    # Solve (I - Q) E = 1 over the transient squares
+    transient = slice(START_SQUARE, final_square)
+    count = final_square - START_SQUARE
+    result = np.zeros(final_square + 1)
+    if sparse is not None and sparse.issparse(matrix):
+        system = sparse.identity(count, format='csr') - matrix[transient, transient]
+        result[transient] = spsolve(system.tocsc(), np.ones(count))
+    else:
+        system = np.eye(count) - matrix[transient, transient]
+        result[transient] = np.linalg.solve(system, np.ones(count))
+
+    turn_pmf = _turn_pmf(matrix, START_SQUARE, final_square)
+    game_pmf, first_win = _race(turn_pmf)
+    return BoardAnalysis(result, turn_pmf, game_pmf, first_win)
+
+
+def can_solve(final_square):
+    """Whether boards of this size can be solved here (large ones need scipy)"""
+    return sparse is not None or final_square <= MAX_DENSE_SQUARES
+
+
+def landing_frequencies(squares=None, final_square=FINAL_SQUARE):
+    """Share of all rolls in a game from the start that land on each square, before snakes and ladders (index = square)"""
+    if squares is None:
+        squares = default_squares()
+    return _landing_frequencies(board_key(squares, final_square))
+
+
+@functools.lru_cache(maxsize=32)
+def _landing_frequencies(key):
+    final_square, items = key
+    matrix = transition_matrix(dict(items), final_square)
+
+    # Expected visits v to each transient square: (I - Q)^T v = e_start.
+    # Every visit is one roll from that square
+    transient = slice(START_SQUARE, final_square)
+    count = final_square - START_SQUARE
+    start = np.zeros(count)
+    start[0] = 1.0
+    if sparse is not None and sparse.issparse(matrix):
+        system = sparse.identity(count, format='csr') - matrix[transient, transient].T
+        visits = spsolve(system.tocsc(), start)
+    else:
+        system = np.eye(count) - matrix[transient, transient].T
+        visits = np.linalg.solve(system, start)
+
+    # Spread each square's rolls over the squares they land on before any
+    # snake or ladder (clamped to the last square), as simulator.py counts them
+    squares = np.arange(START_SQUARE, final_square)
+    landings = np.zeros(final_square + 1)
+    for dice in range(1, 7):
+        np.add.at(landings, np.minimum(squares + dice, final_square), visits / 6)
+    return landings / landings.sum()
+
+
+def _turn_pmf(matrix, start, final_square):
+    """Probability of finishing in exactly n rolls from `start` (index = n)"""
+    transposed = matrix.T.tocsr() if sparse is not None and sparse.issparse(matrix) else matrix.T
+    distribution = np.zeros(final_square + 1)
+    distribution[start] = 1.0
+    pmf = [0.0]
+    absorbed = distribution[final_square]
+    while 1.0 - absorbed > PMF_TOLERANCE and len(pmf) <= MAX_PMF_TURNS:
+        distribution = transposed @ distribution
+        pmf.append(distribution[final_square] - absorbed)
+        absorbed = distribution[final_square]
+    return np.array(pmf)
+
+
+def _race(turn_pmf):
+    """Game-length PMF (total rolls) and first-player win chance of a 2-player race"""
+    # survival[n] = P(T >= n), later[n] = P(T > n)
+    later = 1.0 - np.cumsum(turn_pmf)
+    survival = later + turn_pmf
+
+    # Player 1 finishes on roll 2n - 1 if player 2 has not finished in n - 1 rolls;
+    # player 2 finishes on roll 2n if player 1 needed more than n rolls
+    first = turn_pmf * survival
+    second = turn_pmf * later
+    game_pmf = np.zeros(2 * len(turn_pmf))
+    game_pmf[1::2][:len(first) - 1] = first[1:]
+    game_pmf[2::2][:len(second) - 1] = second[1:]
+    return game_pmf, first.sum()
+
+
+def turn_pmfs(squares, final_square=FINAL_SQUARE):
+    """pmf[s, n]: probability a token on square s needs exactly n more rolls"""
+    matrix = transition_matrix(squares, final_square)
+    # Work backwards from the final square: f_n = M f_(n-1), one matrix-vector product per roll
+    column = np.zeros(final_square + 1)
+    column[final_square] = 1.0
+    columns = [column]
+    finished = column.copy()
+    while 1.0 - finished[START_SQUARE:].min() > PMF_TOLERANCE and len(columns) <= MAX_PMF_TURNS:
+        column = matrix @ column
+        column[final_square] = 0.0  # Already finished tokens need exactly 0 rolls
+        columns.append(column)
+        finished += column
+    return np.stack(columns, axis=1)
+
+
+class WinTable:
+    """Win chances and expected remaining rolls for every position on a board.
+
+    Tokens never interact, so a player on square a who moves first beats one
+    on square b with probability sum_n P(a needs n) * P(b needs >= n). One
+    matrix product of the per-square turn PMFs gives that for every (a, b);
+    `table[a, b, side]` is seat 0's chance with `side` to move.
+    """
+
+    def __init__(self, squares, final_square=FINAL_SQUARE):
+        pmf = turn_pmfs(squares, final_square)
+        self.later = 1.0 - np.cumsum(pmf, axis=1)  # P(needs > n)
+        self.survival = self.later + pmf  # P(needs >= n)
+        self.pmf = pmf
+        self.expected_turns = pmf @ np.arange(pmf.shape[1])
+        first = pmf @ self.survival.T
+        self.table = np.stack([first, 1.0 - first.T], axis=2)
+
+    def win_chances(self, positions, current):
+        """Each seat's chance to win from `positions` with `current` to move"""
+        if len(positions) == 2:
+            chance = float(self.table[positions[0], positions[1], current])
+            return [chance, 1.0 - chance]
+        # More players: seat i wins on its n-th roll if the seats moving before it
+        # need more than n rolls and the ones after it at least n
+        count = len(positions)
+        chances = []
+        for seat, position in enumerate(positions):
+            rank = (seat - current) % count
+            terms = self.pmf[position].copy()
+            for other, other_position in enumerate(positions):
+                if other != seat:
+                    before = (other - current) % count < rank
+                    terms *= self.later[other_position] if before else self.survival[other_position]
+            chances.append(float(terms.sum()))
+        return chances
+
+
+def win_table(squares=None, final_square=FINAL_SQUARE):
+    """WinTable of a board, cached per layout"""
+    if squares is None:
+        squares = default_squares()
+    return _win_table(board_key(squares, final_square))
+
+
+@functools.lru_cache(maxsize=8)
+def _win_table(key):
+    final_square, items = key
+    return WinTable(dict(items), final_square)
+
+
+def format_report(result):
+    """Human readable summary of an analysis"""
+    lengths = np.arange(len(result.game_length_pmf))
+    mean_game = (lengths * result.game_length_pmf).sum()
+    turns = np.arange(len(result.turn_pmf))
+    mode = int(turns[np.argmax(result.turn_pmf)])
+    lines = [
+        f"Expected rolls for one player from the start: {result.expected_turns[START_SQUARE]:.4f}",
+        f"Most likely number of rolls: {mode} ({result.turn_pmf[mode]:.4%})",
+        f"Expected 2-player game length: {mean_game:.4f} rolls",
+        f"First player wins a 2-player race: {result.first_player_win:.4%}",
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact Markov-chain statistics for an Ular Tangga board")
+    parser.add_argument('--board', default=None, help="board spec file (JSON/TOML), classic board by default")
+    args = parser.parse_args()
+
+    layout = load_board(args.board)
+    print(format_report(analyze(layout.squares, layout.cells)))
+
+
+if __name__ == "__main__":
+    main()
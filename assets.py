@@ -0,0 +1,81 @@
+import pygame
+from collections import OrderedDict
+
+# Shared Surface Cache
+# Off-screen surfaces that are expensive to build or would otherwise be
+# allocated every frame (board tiles, backgrounds, translucent panels) are kept
+# here by key. Memory is bounded by total pixels rather than entry count, since
+# a board tile and a button glow differ in size by orders of magnitude; the
+# least recently used surfaces are evicted first. Keys are tuples whose first
+# item names the owner, so one owner's surfaces can be dropped together.
+
+ASSET_CACHE_PIXELS = 24_000_000  # About 96 MB of 32-bit surfaces
+
+
+class SurfaceCache:
+    """Surfaces by key, least recently used evicted once over a pixel budget"""
+
+    def __init__(self, max_pixels=ASSET_CACHE_PIXELS):
+        self.max_pixels = max_pixels
+        self._surfaces = OrderedDict()
+        self.pixels = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def get(self, key):
+        """Cached surface for `key`, or None"""
+        surface = self._surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self._surfaces.move_to_end(key)
+        self.hits += 1
+        return surface
+
+    def peek(self, key):
+        """Like get, without counting or refreshing the entry"""
+        return self._surfaces.get(key)
+
+    def put(self, key, surface):
+        old = self._surfaces.pop(key, None)
+        if old is not None:
+            self.pixels -= old.get_width() * old.get_height()
+        self._surfaces[key] = surface
+        self.pixels += surface.get_width() * surface.get_height()
+        # The newest surface always stays, even when it alone is over budget
+        while self.pixels > self.max_pixels and len(self._surfaces) > 1:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.pixels -= evicted.get_width() * evicted.get_height()
+        return surface
+
+    def get_or_build(self, key, build):
+        """Cached surface for `key`, calling build() to create it on a miss"""
+        surface = self.get(key)
+        if surface is None:
+            surface = self.put(key, build())
+        return surface
+
+    def discard(self, owner):
+        """Drop every surface whose key starts with `owner`"""
+        for key in [key for key in self._surfaces if key[0] == owner]:
+            surface = self._surfaces.pop(key)
+            self.pixels -= surface.get_width() * surface.get_height()
+
+    def clear(self):
+        self._surfaces.clear()
+        self.pixels = 0
+
+    def translucent(self, size, color, alpha):
+        """Shared solid surface of `size` drawn at `alpha`; callers only blit it"""
+        def build():
+            surface = pygame.Surface(size)
+            surface.fill(color)
+            surface.set_alpha(alpha)
+            return surface
+        return self.get_or_build(('translucent', tuple(size), tuple(color), alpha), build)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'surfaces': len(self._surfaces), 'pixels': self.pixels}
@@ -1,36 +1,222 @@
 import pygame
 import math
+from assets import SurfaceCache
+from camera import Camera
+from fonts import get_font
+from engine import resolve_move
+from board_spec import BoardSpecError, compile_spec, load_board, spec_from_squares
+
+try:
+    import analysis  # Needs numpy; without it there is no heatmap overlay
+except ImportError:
+    analysis = None
+
+# Heatmap overlays: mode -> legend text
+OVERLAYS = {
+    'landing': "PETA PANAS: peluang mendarat per lemparan (biru jarang, merah sering)",
+    'turns': "PETA PANAS: rata-rata lemparan sampai finis (biru sedikit, merah banyak)",
+}
+OVERLAY_ALPHA = 150
 
 # Board Class (Enhanced Visual Layout for Snake and Ladder)
 class Board:
-    def __init__(self):
+    # Screen area the board is shown in (the camera viewport)
+    VIEWPORT = pygame.Rect(50, 50, 800, 600)
+    CELL_WIDTH = 80
+    CELL_HEIGHT = 60
+    TILE_CELLS = 10  # Boards are rendered and cached in tiles of 10x10 squares
+    TILE_CACHE_PIXELS = 16_000_000  # Tile budget when the board has its own cache (least recently used evicted)
+
+    def __init__(self, spec_path=None, assets=None):
+        # Tiles live in a surface cache, shared with other screens when one is passed in;
+        # keys are (tile owner, tile_x, tile_y, zoom, overlay)
+        self.assets = assets if assets is not None else SurfaceCache(self.TILE_CACHE_PIXELS)
+        self.tile_owner = object()  # Replaced when the layout changes, orphaning the old tiles
+        self._legend = None
+        self.overlay = None  # Heatmap mode from OVERLAYS, or None
+        self._overlay_values = {}  # mode -> per-square values scaled to 0..1
+        self.version = 0  # Bumped whenever the layout changes, for derived caches
+        # Layout comes from a board spec file (boards/classic.json by default)
+        self.layout = load_board(spec_path)
+        self.rows = self.layout.rows
+        self.cols = self.layout.cols
+        self.final_square = self.layout.cells
+        self.camera = Camera(self.VIEWPORT, (self.cols * self.CELL_WIDTH, self.rows * self.CELL_HEIGHT))
         self.squares = self.generate_board()
-        self.font_small = pygame.font.SysFont('Arial', 12, bold=True)
-        self.font_medium = pygame.font.SysFont('Arial', 14, bold=True)
+
+    # Fonts are looked up when the first tile is drawn, not when the board is built
+    @property
+    def font_small(self):
+        return get_font('Arial', 12, bold=True)
+
+    @property
+    def font_medium(self):
+        return get_font('Arial', 14, bold=True)
+
+    @property
+    def squares(self):
+        return self._squares
+
+    @squares.setter
+    def squares(self, squares):
+        self._squares = dict(squares)
+        self.invalidate()
+
+    def invalidate(self):
+        """Recompile the layout and drop cached data derived from it (call after editing squares in place)"""
+        if self._squares != self.layout.squares:
+            # Edited at runtime: compile it like a spec file, so chains resolve the same way and
+            # layout.spec_hash (used by replays, results and online matches) names this board
+            try:
+                spec = spec_from_squares(self._squares, self.rows, self.cols, self.layout.name)
+            except BoardSpecError:
+                # Rejected (a loop, a square off the board): keep the last valid board
+                self._squares.clear()
+                self._squares.update(self.layout.squares)
+                raise
+            self.layout = compile_spec(spec, use_cache=False)
+            self._squares.clear()
+            self._squares.update(self.layout.squares)
+        self.jump = self.layout.jump
+        self.assets.discard(self.tile_owner)
+        self.tile_owner = object()
+        self._legend = None
+        self._overlay_values = {}
+        self.version += 1
 
     def generate_board(self):
-        # Snake and Ladder mapping (square: destination)
-        # Ladders (positive moves) - Tangga
-        ladders = {1: 38, 4: 14, 9: 31, 21: 42, 28: 84, 36: 44, 51: 67, 71: 91, 80: 100}
-        # Snakes (negative moves) - Ular
-        snakes = {16: 6, 47: 26, 49: 11, 56: 53, 62: 19, 64: 60, 87: 24, 93: 73, 95: 75, 98: 78}
+        # Snake and Ladder mapping (square: destination) from the compiled spec
+        return self.layout.squares
+
+    def square_cell(self, square):
+        """Grid (column, row from the top) of a square"""
+        # Adjust for 1-based indexing
+        pos = square - 1
+        row = pos // self.cols
+        col = pos % self.cols
         
-        # Combine both dictionaries
-        board = {**ladders, **snakes}
-        return board
+        # Handle zigzag pattern (odd rows go right to left)
+        if row % 2 == 1:
+            col = self.cols - 1 - col
+        
+        return col, self.rows - 1 - row  # Flip Y so square 1 is at the bottom
+
+    def square_position(self, square):
+        """World position where tokens stand on a square"""
+        col, row = self.square_cell(max(square, 1))
+        return col * self.CELL_WIDTH + 25, row * self.CELL_HEIGHT + 15
+
+    def cell_size(self):
+        """On-screen (width, height) of a square at the camera's zoom level"""
+        zoom = self.camera.zoom
+        return self.CELL_WIDTH * zoom, self.CELL_HEIGHT * zoom
+
+    def follow(self, square):
+        """Scroll the camera so a square is in view"""
+        self.camera.ensure_visible(*self.square_position(square))
+
+    def overlay_available(self):
+        return analysis is not None and analysis.can_solve(self.final_square)
+
+    def toggle_overlay(self):
+        """Cycle the heatmap overlay: landing chance, expected rolls left, off"""
+        if not self.overlay_available():
+            return None
+        modes = [None, *OVERLAYS]
+        self.overlay = modes[(modes.index(self.overlay) + 1) % len(modes)]
+        self._legend = None
+        return self.overlay
+
+    def overlay_values(self, mode):
+        """Per-square values of a heatmap mode (index = square), computed once per layout"""
+        values = self._overlay_values.get(mode)
+        if values is None:
+            if mode == 'landing':
+                raw = analysis.landing_frequencies(self.squares, self.final_square)
+            else:
+                raw = analysis.expected_turns(self.squares, self.final_square)
+            values = (raw, raw / max(raw.max(), 1e-12))
+            self._overlay_values[mode] = values
+        return values
 
     def draw(self, screen):
+        """Draw the board tiles that intersect the viewport, then the legend"""
+        camera = self.camera
+        viewport = camera.viewport
+        tile_width = self.TILE_CELLS * self.CELL_WIDTH
+        tile_height = self.TILE_CELLS * self.CELL_HEIGHT
+        tiles_x = math.ceil(self.cols / self.TILE_CELLS)
+        tiles_y = math.ceil(self.rows / self.TILE_CELLS)
+
+        # Only tiles inside the visible world area are looked at, so the cost
+        # depends on the viewport and zoom, not on the board size
+        left, top, right, bottom = camera.visible_world_rect()
+        first_x = max(0, int(left // tile_width))
+        last_x = min(tiles_x - 1, int(right // tile_width))
+        first_y = max(0, int(top // tile_height))
+        last_y = min(tiles_y - 1, int(bottom // tile_height))
+
+        for tile_y in range(first_y, last_y + 1):
+            for tile_x in range(first_x, last_x + 1):
+                x, y = camera.world_to_screen(tile_x * tile_width, tile_y * tile_height)
+                tile = self.get_tile(tile_x, tile_y, camera.zoom)
+                tile_rect = tile.get_rect(topleft=(x, y))
+                visible = tile_rect.clip(viewport)
+                if visible.width and visible.height:
+                    screen.blit(tile, visible, visible.move(-x, -y))
+
+        # Draw legend
+        if self._legend is None:
+            self._legend = self.render_legend()
+        screen.blit(self._legend, (40, 615))
+
+    def get_tile(self, tile_x, tile_y, zoom):
+        """Rendered tile at a zoom level, from the tile cache when possible"""
+        # The overlay is baked into its own tiles, so showing it costs nothing per frame
+        key = (self.tile_owner, tile_x, tile_y, zoom, self.overlay)
+        tile = self.assets.get(key)
+        if tile is not None:
+            return tile
+
+        if zoom == 1.0:
+            tile = self.render_tile(tile_x, tile_y)
+        else:
+            # Scale the full-size tile; edges come from rounded world positions
+            # so neighbouring tiles meet without gaps. The full-size render is
+            # not cached, or zoomed-out views would flood the cache with it
+            base = (self.assets.peek((self.tile_owner, tile_x, tile_y, 1.0, self.overlay))
+                    or self.render_tile(tile_x, tile_y))
+            left = tile_x * self.TILE_CELLS * self.CELL_WIDTH
+            top = tile_y * self.TILE_CELLS * self.CELL_HEIGHT
+            width, height = base.get_size()
+            size = (round((left + width) * zoom) - round(left * zoom),
+                    round((top + height) * zoom) - round(top * zoom))
+            tile = pygame.transform.smoothscale(base, size)
+
+        return self.assets.put(key, tile)
+
+    def render_tile(self, tile_x, tile_y):
+        """Render one tile of squares, snakes and ladders off-screen at full size"""
+        first_col = tile_x * self.TILE_CELLS
+        first_row = tile_y * self.TILE_CELLS
+        cols = min(self.TILE_CELLS, self.cols - first_col)
+        rows = min(self.TILE_CELLS, self.rows - first_row)
+        surface = pygame.Surface((cols * self.CELL_WIDTH, rows * self.CELL_HEIGHT))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+
         # Draw board grid with enhanced visuals
-        for row in range(10):
-            for col in range(10):
+        for grid_row in range(first_row, first_row + rows):
+            row = self.rows - 1 - grid_row  # Board row, counted from the bottom
+            for col in range(first_col, first_col + cols):
                 # Calculate square number based on snake and ladder board layout
                 if row % 2 == 0:  # Even rows go left to right
-                    square_number = row * 10 + col + 1
+                    square_number = row * self.cols + col + 1
                 else:  # Odd rows go right to left
-                    square_number = row * 10 + (9 - col) + 1
+                    square_number = row * self.cols + (self.cols - 1 - col) + 1
                 
-                x = col * 80 + 50
-                y = (9 - row) * 60 + 50  # Flip Y coordinate so square 1 is at bottom
+                x = (col - first_col) * self.CELL_WIDTH
+                y = (grid_row - first_row) * self.CELL_HEIGHT
                 
                 # Determine square color based on position
                 if (row + col) % 2 == 0:
@@ -39,19 +225,19 @@ class Board:
                     square_color = (220, 220, 200)  # Slightly darker beige
                 
                 # Fill square background
-                pygame.draw.rect(screen, square_color, (x, y, 80, 60))
+                pygame.draw.rect(surface, square_color, (x, y, self.CELL_WIDTH, self.CELL_HEIGHT))
                 
                 # Highlight squares with snakes or ladders
                 if square_number in self.squares:
                     if self.squares[square_number] > square_number:
                         # Ladder (green gradient)
-                        self.draw_ladder(screen, x, y, square_number, self.squares[square_number])
+                        self.draw_ladder(surface, x, y, square_number, self.squares[square_number])
                     else:
                         # Snake (red gradient)
-                        self.draw_snake(screen, x, y, square_number, self.squares[square_number])
+                        self.draw_snake(surface, x, y, square_number, self.squares[square_number])
                 
                 # Draw square border
-                pygame.draw.rect(screen, (100, 100, 100), (x, y, 80, 60), 2)
+                pygame.draw.rect(surface, (100, 100, 100), (x, y, self.CELL_WIDTH, self.CELL_HEIGHT), 2)
                 
                 # Draw square number with better styling
                 number_color = (50, 50, 50)
@@ -60,17 +246,47 @@ class Board:
                 
                 text = self.font_medium.render(str(square_number), True, number_color)
                 text_rect = text.get_rect(center=(x + 15, y + 15))  # Top-left corner
-                screen.blit(text, text_rect)
+                surface.blit(text, text_rect)
         
-        # Draw legend
-        self.draw_legend(screen)
+        if self.overlay is not None:
+            surface.blit(self.render_overlay(first_col, first_row, cols, rows), (0, 0))
+        return surface
+
+    def render_overlay(self, first_col, first_row, cols, rows):
+        """Translucent heatmap layer for one tile, with each square's value printed"""
+        raw, scaled = self.overlay_values(self.overlay)
+        surface = pygame.Surface((cols * self.CELL_WIDTH, rows * self.CELL_HEIGHT), pygame.SRCALPHA)
+        for grid_row in range(first_row, first_row + rows):
+            row = self.rows - 1 - grid_row
+            for col in range(first_col, first_col + cols):
+                board_col = col if row % 2 == 0 else self.cols - 1 - col
+                square = row * self.cols + board_col + 1
+                x = (col - first_col) * self.CELL_WIDTH
+                y = (grid_row - first_row) * self.CELL_HEIGHT
+                surface.fill((*heat_color(scaled[square]), OVERLAY_ALPHA), (x, y, self.CELL_WIDTH, self.CELL_HEIGHT))
+                label = f"{raw[square]:.1%}" if self.overlay == 'landing' else f"{raw[square]:.1f}"
+                text = self.font_small.render(label, True, (255, 255, 255))
+                surface.blit(text, text.get_rect(bottomright=(x + self.CELL_WIDTH - 4, y + self.CELL_HEIGHT - 3)))
+        return surface
+
+    def render_legend(self):
+        """Render the legend strip shown along the bottom of the viewport"""
+        surface = pygame.Surface((800, 25))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        if self.overlay is None:
+            self.draw_legend(surface, -40, -615)
+        else:
+            text = get_font('Arial', 16, bold=True).render(OVERLAYS[self.overlay], True, (255, 255, 255))
+            surface.blit(text, (10, 5))
+        return surface
 
     def draw_ladder(self, screen, x, y, start, end):
         """Draw ladder visualization"""
         # Green gradient background
         colors = [(0, 150, 0), (0, 200, 0), (0, 255, 0)]
         for i, color in enumerate(colors):
-            rect = pygame.Rect(x + 2 + i, y + 2 + i, 76 - 2*i, 56 - 2*i)
+            rect = pygame.Rect(x + 2 + i, y + 2 + i, self.CELL_WIDTH - 4 - 2*i, self.CELL_HEIGHT - 4 - 2*i)
             pygame.draw.rect(screen, color, rect)
         
         # Draw ladder rungs
@@ -92,7 +308,7 @@ class Board:
         # Red gradient background
         colors = [(150, 0, 0), (200, 0, 0), (255, 0, 0)]
         for i, color in enumerate(colors):
-            rect = pygame.Rect(x + 2 + i, y + 2 + i, 76 - 2*i, 56 - 2*i)
+            rect = pygame.Rect(x + 2 + i, y + 2 + i, self.CELL_WIDTH - 4 - 2*i, self.CELL_HEIGHT - 4 - 2*i)
             pygame.draw.rect(screen, color, rect)
         
         # Draw snake body (wavy line)
@@ -117,17 +333,17 @@ class Board:
         arrow_surface = self.font_small.render(arrow_text, True, (255, 255, 255))
         screen.blit(arrow_surface, (x + 5, y + 35))
 
-    def draw_legend(self, screen):
+    def draw_legend(self, screen, offset_x=0, offset_y=0):
         """Draw game legend/info"""
-        legend_x = 50
-        legend_y = 620
+        legend_x = 50 + offset_x
+        legend_y = 620 + offset_y
         
         # Background for legend
         legend_rect = pygame.Rect(legend_x - 10, legend_y - 5, 800, 25)
-        pygame.draw.rect(screen, (0, 0, 0, 100), legend_rect)
+        pygame.draw.rect(screen, (0, 0, 0), legend_rect)
         
         # Legend text
-        legend_font = pygame.font.SysFont('Arial', 16, bold=True)
+        legend_font = get_font('Arial', 16, bold=True)
         
         # Ladder info
         ladder_text = "🪜 TANGGA: Naik ke kotak yang lebih tinggi"
@@ -147,15 +363,18 @@ class Board:
 
     def get_movement_description(self, start_square, dice_value):
         """Get description of player movement"""
-        landing_square = start_square + dice_value
-        if landing_square > 100:
-            landing_square = 100
+        landing_square, final_square = resolve_move(start_square, dice_value, self.squares, self.final_square)
         
-        if landing_square in self.squares:
-            final_square = self.squares[landing_square]
+        if final_square != landing_square:
             if final_square > landing_square:
                 return f"Mendarat di kotak {landing_square} dan naik tangga ke kotak {final_square}! 🪜"
             else:
                 return f"Mendarat di kotak {landing_square} dan turun ular ke kotak {final_square}! 🐍"
         else:
-            return f"Pindah ke kotak {landing_square}"
\ No newline at end of file
+            return f"Pindah ke kotak {landing_square}"
+
+
+def heat_color(value):
+    """Blue (0) through purple to red (1)"""
+    value = min(max(float(value), 0.0), 1.0)
+    return round(255 * value), round(60 * (1 - abs(2 * value - 1))), round(255 * (1 - value))
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import os
+import struct
+from array import array
+
+from engine import build_jump_table
+from utils import cache_dir
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:  # TOML specs are then rejected with a clear error
+        tomllib = None
+
+# Board Specs
+# Boards are described by JSON or TOML files:
+#
+#   name = "Klasik"
+#   rows = 10
+#   cols = 10
+#   [ladders]      # start square = destination
+#   "1" = 38
+#   [snakes]
+#   "16" = 6
+#
+# A spec is validated on load and compiled into flat jump tables, which are
+# cached on disk keyed by the spec's hash.
+
+BOARDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'boards')
+DEFAULT_SPEC = os.path.join(BOARDS_DIR, 'classic.json')
+MAX_SIDE = 100  # Up to 100x100 = 10,000 squares
+
+CACHE_MAGIC = b'UTB1'
+CACHE_HEADER = struct.Struct('<4sHHHH')  # magic, rows, cols, ladder count, snake count
+
+
+class BoardSpecError(ValueError):
+    """Raised when a board spec file is malformed or describes an invalid board"""
+
+
+class CompiledBoard:
+    """A validated board layout with precomputed lookup tables"""
+
+    def __init__(self, name, rows, cols, jump, ladder_starts, snake_starts, spec_hash):
+        self.name = name
+        self.rows = rows
+        self.cols = cols
+        self.cells = rows * cols
+        self.jump = jump  # array('H'): square -> final square after snakes/ladders
+        self.ladder_starts = ladder_starts  # array('H'), ascending
+        self.snake_starts = snake_starts  # array('H'), ascending
+        self.spec_hash = spec_hash
+
+    @property
+    def squares(self):
+        """Snake and ladder mapping (square: destination), as used by the engine"""
+        starts = sorted(self.ladder_starts.tolist() + self.snake_starts.tolist())
+        return {start: self.jump[start] for start in starts}
+
+
+def read_spec(path):
+    """Parse a JSON or TOML spec file into a dict"""
+    is_toml = path.endswith('.toml')
+    if is_toml and tomllib is None:
+        raise BoardSpecError(f"{path}: TOML specs need Python 3.11+ or the tomli package")
+    try:
+        if is_toml:
+            with open(path, 'rb') as spec_file:
+                return tomllib.load(spec_file)
+        with open(path, encoding='utf-8') as spec_file:
+            return json.load(spec_file)
+    except (OSError, ValueError) as error:  # TOML and JSON decode errors are ValueErrors
+        raise BoardSpecError(f"{path}: {error}") from error
+
+
+def validate_spec(spec):
+    """Check a parsed spec and return it normalized (integer squares, defaults filled in)"""
+    if not isinstance(spec, dict):
+        raise BoardSpecError("A board spec must be a table/object")
+
+    rows = spec.get('rows', 10)
+    cols = spec.get('cols', 10)
+    for label, value in (('rows', rows), ('cols', cols)):
+        if not isinstance(value, int) or not 2 <= value <= MAX_SIDE:
+            raise BoardSpecError(f"'{label}' must be an integer between 2 and {MAX_SIDE}")
+    cells = rows * cols
+
+    moves = {}
+    normalized = {'name': str(spec.get('name', 'Papan')), 'rows': rows, 'cols': cols}
+    for kind in ('ladders', 'snakes'):
+        entries = spec.get(kind, {})
+        if not isinstance(entries, dict):
+            raise BoardSpecError(f"'{kind}' must map start squares to destinations")
+        normalized[kind] = {}
+        for start, end in entries.items():
+            try:
+                start, end = int(start), int(end)
+            except (TypeError, ValueError):
+                raise BoardSpecError(f"{kind}: {start!r} -> {end!r} is not a pair of square numbers")
+            if not 1 <= start < cells or not 1 <= end <= cells:
+                raise BoardSpecError(f"{kind}: {start} -> {end} is outside squares 1..{cells}")
+            if kind == 'ladders' and end <= start:
+                raise BoardSpecError(f"ladders: {start} -> {end} must go up")
+            if kind == 'snakes' and end >= start:
+                raise BoardSpecError(f"snakes: {start} -> {end} must go down")
+            if start in moves:
+                raise BoardSpecError(f"Square {start} has more than one snake or ladder")
+            moves[start] = end
+            normalized[kind][start] = end
+
+    # Chained jumps must end somewhere, or a token would loop forever
+    for start in moves:
+        seen = {start}
+        square = moves[start]
+        while square in moves:
+            if square in seen:
+                raise BoardSpecError(f"Snakes and ladders starting at {start} form a loop")
+            seen.add(square)
+            square = moves[square]
+    return normalized
+
+
+def spec_from_squares(squares, rows, cols, name='Papan'):
+    """Normalized spec of a snake/ladder mapping (square: destination), such as one edited at runtime"""
+    return validate_spec({'name': name, 'rows': rows, 'cols': cols,
+                          'ladders': {start: end for start, end in squares.items() if end >= start},
+                          'snakes': {start: end for start, end in squares.items() if end < start}})
+
+
+def spec_hash(spec):
+    """Stable hash of a normalized spec"""
+    canonical = json.dumps({**spec,
+                            'ladders': sorted(spec['ladders'].items()),
+                            'snakes': sorted(spec['snakes'].items())},
+                           sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def compile_jump_table(moves, cells):
+    """Jump table of a snake/ladder mapping with chains resolved, so one lookup is enough.
+
+    A ladder ending on a snake's head (and so on) sends a token straight to
+    where the chain ends. Boards assigned at runtime go through here too.
+    """
+    jump = build_jump_table(moves, cells)
+    for start in moves:
+        square = jump[start]
+        for _ in range(len(moves)):
+            if jump[square] == square:
+                break
+            square = jump[square]
+        else:
+            raise BoardSpecError(f"Snakes and ladders starting at {start} form a loop")
+        jump[start] = square
+    return jump
+
+
+def compile_spec(spec, use_cache=True):
+    """Compile a normalized spec into a CompiledBoard, reusing the on-disk cache"""
+    digest = spec_hash(spec)
+    cache_path = None
+    if use_cache:
+        try:
+            cache_path = os.path.join(cache_dir('boards'), digest + '.bin')
+        except OSError:
+            pass  # No writable cache directory: compile every time
+    if cache_path:
+        board = _read_cache(cache_path, spec['name'], digest)
+        if board is not None:
+            return board
+
+    rows, cols = spec['rows'], spec['cols']
+    cells = rows * cols
+    jump = compile_jump_table({**spec['ladders'], **spec['snakes']}, cells)
+    board = CompiledBoard(spec['name'], rows, cols, jump,
+                          array('H', sorted(spec['ladders'])),
+                          array('H', sorted(spec['snakes'])), digest)
+    if cache_path:
+        _write_cache(cache_path, board)
+    return board
+
+
+def load_board(path=None, use_cache=True):
+    """Load, validate and compile a board spec file (the classic board by default)"""
+    path = path or DEFAULT_SPEC
+    return compile_spec(validate_spec(read_spec(path)), use_cache)
+
+
+def spec_paths(search_dir=BOARDS_DIR):
+    """Path of every valid spec file in search_dir, by spec hash"""
+    try:
+        names = sorted(os.listdir(search_dir))
+    except OSError:
+        return {}
+    paths = {}
+    for name in names:
+        if not name.endswith(('.json', '.toml')):
+            continue
+        path = os.path.join(search_dir, name)
+        try:
+            paths.setdefault(load_board(path).spec_hash, path)
+        except BoardSpecError:
+            continue
+    return paths
+
+
+def find_spec(digest, search_dir=BOARDS_DIR):
+    """Path of the spec file in search_dir whose hash is `digest`, or None"""
+    return spec_paths(search_dir).get(digest)
+
+
+def _read_cache(path, name, digest):
+    try:
+        with open(path, 'rb') as cache_file:
+            data = cache_file.read()
+        magic, rows, cols, ladders, snakes = CACHE_HEADER.unpack_from(data)
+        if magic != CACHE_MAGIC:
+            return None
+        tables = array('H')
+        tables.frombytes(data[CACHE_HEADER.size:])
+    except (OSError, struct.error, ValueError):
+        return None  # Missing or corrupt cache: compile again
+
+    cells = rows * cols
+    if len(tables) != cells + 1 + ladders + snakes:
+        return None
+    jump = tables[:cells + 1]
+    ladder_starts = tables[cells + 1:cells + 1 + ladders]
+    snake_starts = tables[cells + 1 + ladders:]
+    return CompiledBoard(name, rows, cols, jump, ladder_starts, snake_starts, digest)
+
+
+def _write_cache(path, board):
+    header = CACHE_HEADER.pack(CACHE_MAGIC, board.rows, board.cols,
+                               len(board.ladder_starts), len(board.snake_starts))
+    temporary = path + '.tmp'
+    try:
+        with open(temporary, 'wb') as cache_file:
+            cache_file.write(header)
+            cache_file.write((board.jump + board.ladder_starts + board.snake_starts).tobytes())
+        os.replace(temporary, path)
+    except OSError:
+        pass  # The cache is only an optimization
@@ -0,0 +1,96 @@
+import pygame
+
+# Board Camera
+# Maps board ("world") pixels to the on-screen viewport with scrolling and zoom.
+# Zoom snaps to fixed levels so scaled board tiles can be cached per level.
+
+ZOOM_LEVELS = (0.2, 0.25, 0.32, 0.4, 0.5, 0.64, 0.8, 1.0, 1.25, 1.6, 2.0)
+
+
+class Camera:
+    """Scrollable, zoomable view of a world_size board inside `viewport`"""
+
+    def __init__(self, viewport, world_size):
+        self.viewport = pygame.Rect(viewport)
+        self.world_width, self.world_height = world_size
+
+        # Zoom out no further than the level that shows the whole board (or 100%
+        # for boards that fit the viewport already)
+        fit = min(self.viewport.width / self.world_width, self.viewport.height / self.world_height, 1.0)
+        smaller = [level for level in ZOOM_LEVELS if level <= fit]
+        first = ZOOM_LEVELS.index(smaller[-1]) if smaller else 0
+        self.levels = ZOOM_LEVELS[first:]
+        self.level = self.levels.index(1.0)
+
+        # Top-left of the viewport in zoomed world pixels; start at the bottom
+        # left corner, where square 1 is
+        self.x = 0
+        self.y = self.scaled_height()
+        self.clamp()
+
+    @property
+    def zoom(self):
+        return self.levels[self.level]
+
+    @property
+    def state(self):
+        """Hashable camera state, changes whenever the view moves"""
+        return self.level, self.x, self.y
+
+    def scaled_width(self):
+        return round(self.world_width * self.zoom)
+
+    def scaled_height(self):
+        return round(self.world_height * self.zoom)
+
+    def clamp(self):
+        """Keep the board inside the viewport (centered when it is smaller)"""
+        for axis, scaled, view in (('x', self.scaled_width(), self.viewport.width),
+                                   ('y', self.scaled_height(), self.viewport.height)):
+            if scaled <= view:
+                setattr(self, axis, (scaled - view) // 2)
+            else:
+                setattr(self, axis, max(0, min(getattr(self, axis), scaled - view)))
+
+    def world_to_screen(self, world_x, world_y):
+        return (self.viewport.x + round(world_x * self.zoom) - self.x,
+                self.viewport.y + round(world_y * self.zoom) - self.y)
+
+    def screen_to_world(self, screen_x, screen_y):
+        return ((screen_x - self.viewport.x + self.x) / self.zoom,
+                (screen_y - self.viewport.y + self.y) / self.zoom)
+
+    def visible_world_rect(self):
+        """World area shown in the viewport"""
+        left, top = self.screen_to_world(*self.viewport.topleft)
+        right, bottom = self.screen_to_world(*self.viewport.bottomright)
+        return left, top, right, bottom
+
+    def scroll(self, dx, dy):
+        """Move the view by (dx, dy) screen pixels"""
+        self.x += int(dx)
+        self.y += int(dy)
+        self.clamp()
+
+    def zoom_by(self, steps, anchor=None):
+        """Change zoom level by `steps`, keeping the world point under `anchor` in place"""
+        level = max(0, min(self.level + steps, len(self.levels) - 1))
+        if level == self.level:
+            return
+        anchor = anchor or self.viewport.center
+        world_x, world_y = self.screen_to_world(*anchor)
+        self.level = level
+        self.x = round(world_x * self.zoom) - (anchor[0] - self.viewport.x)
+        self.y = round(world_y * self.zoom) - (anchor[1] - self.viewport.y)
+        self.clamp()
+
+    def center_on(self, world_x, world_y):
+        self.x = round(world_x * self.zoom) - self.viewport.width // 2
+        self.y = round(world_y * self.zoom) - self.viewport.height // 2
+        self.clamp()
+
+    def ensure_visible(self, world_x, world_y, margin=60):
+        """Recenter on a world point if it is outside (or too close to the edge of) the view"""
+        if not self.viewport.inflate(-2 * margin, -2 * margin).collidepoint(
+                self.world_to_screen(world_x, world_y)):
+            self.center_on(world_x, world_y)
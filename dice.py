@@ -1,8 +1,9 @@
 import pygame
-import random
+from fonts import get_font, render_text
+from rng import default_rng
 
 class Dice:
-    def __init__(self, x, y, size=80):
+    def __init__(self, x, y, size=80, rng=None):
         self.x = x
         self.y = y
         self.size = size
@@ -11,6 +12,7 @@ class Dice:
         self.rolling = False
         self.roll_timer = 0
         self.roll_duration = 30  # frames
+        self.rng = rng or default_rng()  # Real rolls and animation faces come from separate streams
         
         # Colors
         self.dice_color = (255, 255, 255)
@@ -31,12 +33,12 @@ class Dice:
             self.roll_timer += 1
             # Change value rapidly while rolling
             if self.roll_timer % 3 == 0:  # Change every 3 frames
-                self.value = random.randint(1, 6)
+                self.value = self.rng.cosmetic_roll()
             
             # Stop rolling after duration
             if self.roll_timer >= self.roll_duration:
                 self.rolling = False
-                self.value = random.randint(1, 6)
+                self.value = self.rng.roll()
                 return True  # Roll completed
         return False
 
@@ -61,8 +63,7 @@ class Dice:
         
         # Draw roll instruction
         if not self.rolling:
-            font = pygame.font.SysFont('Arial', 14)
-            instruction = font.render("Klik untuk roll", True, (100, 100, 100))
+            instruction = render_text(get_font('Arial', 14), "Klik untuk roll", (100, 100, 100))
             instruction_rect = instruction.get_rect(center=(self.x + self.size//2, self.y + self.size + 20))
             screen.blit(instruction, instruction_rect)
 
@@ -0,0 +1,61 @@
+import pygame
+
+# Dirty Rectangle Tracker
+class DirtyRectTracker:
+    """Track which screen regions changed since the last frame.
+
+    Each frame the owner describes its regions with track(key, rect, signature).
+    A region is dirty when its signature or rect differs from the previous frame;
+    both the old and the new rect are reported so moved objects get erased.
+    """
+
+    def __init__(self):
+        self.full_redraw = True
+        self.regions = {}  # key -> (rect, signature) from the last frame
+        self.dirty = []
+
+    def request_full_redraw(self):
+        """Repaint the whole window on the next frame (restart, win, expose...)"""
+        self.full_redraw = True
+
+    def track(self, key, rect, signature):
+        """Record the current state of a region, marking it dirty if it changed"""
+        previous = self.regions.get(key)
+        if previous is not None and previous[1] == signature and previous[0] == rect:
+            return
+
+        if previous is not None:
+            self.dirty.append(previous[0])
+        self.dirty.append(rect)
+        self.regions[key] = (rect, signature)
+
+    def forget(self, key):
+        """Stop tracking a region, marking its last rect dirty so it is erased"""
+        previous = self.regions.pop(key, None)
+        if previous is not None:
+            self.dirty.append(previous[0])
+
+    def collect(self):
+        """Return (full_redraw, rects) for this frame and reset for the next one"""
+        if self.full_redraw:
+            self.full_redraw = False
+            self.dirty = []
+            return True, []
+
+        rects = merge_rects(self.dirty)
+        self.dirty = []
+        return False, rects
+
+
+def merge_rects(rects):
+    """Merge overlapping rects so no pixel is repainted or pushed twice"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        # Keep absorbing overlapping rects until the merged rect stops growing
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
@@ -0,0 +1,187 @@
+import heapq
+import itertools
+import time
+from array import array
+from collections import namedtuple
+
+# Headless Game Engine
+# Rules, turn order and win detection for Ular Tangga. Deliberately imports no
+# pygame so matches can run in servers, simulations and tests without SDL.
+
+START_SQUARE = 1
+FINAL_SQUARE = 100
+
+# Ladders (positive moves) - Tangga
+DEFAULT_LADDERS = {1: 38, 4: 14, 9: 31, 21: 42, 28: 84, 36: 44, 51: 67, 71: 91, 80: 100}
+# Snakes (negative moves) - Ular
+DEFAULT_SNAKES = {16: 6, 47: 26, 49: 11, 56: 53, 62: 19, 64: 60, 87: 24, 93: 73, 95: 75, 98: 78}
+
+# Result of one roll: who moved, from where, the dice value, the square landed
+# on, the square after any snake/ladder, the jump kind and whether it won
+MoveResult = namedtuple('MoveResult', 'player start dice landing position jump won')
+
+
+def default_squares():
+    """Snake and ladder mapping (square: destination) of the classic board"""
+    return {**DEFAULT_LADDERS, **DEFAULT_SNAKES}
+
+
+def resolve_move(position, steps, squares, final_square=FINAL_SQUARE):
+    """Return (landing, final) squares when moving `steps` from `position`.
+
+    Moves past the last square stop on it, then one snake or ladder is applied.
+    """
+    landing = position + steps
+    if landing > final_square:
+        landing = final_square
+    return landing, squares.get(landing, landing)
+
+
+def build_jump_table(squares, final_square=FINAL_SQUARE):
+    """Flat table mapping every square 0..final_square to where a token landing there ends up"""
+    table = array('H', range(final_square + 1))
+    for start, end in squares.items():
+        table[start] = end
+    return table
+
+
+def jump_kind(landing, position):
+    """Classify a move's jump as 'ladder', 'snake' or None"""
+    if position > landing:
+        return 'ladder'
+    if position < landing:
+        return 'snake'
+    return None
+
+
+def log_move(name, landing, position):
+    """Print snake/ladder hits to the console"""
+    if position > landing:
+        print(f"{name} climbed a ladder from {landing} to {position}!")
+    elif position < landing:
+        print(f"{name} slid down a snake from {landing} to {position}!")
+
+
+class GameState:
+    """Positions, turn order and winner of one match"""
+
+    def __init__(self, num_players=2, squares=None, final_square=FINAL_SQUARE, jump=None):
+        if num_players < 1:
+            raise ValueError("A match needs at least one player")
+        self.num_players = num_players
+        self.squares = default_squares() if squares is None else squares
+        self.final_square = final_square
+        # Moves are resolved by indexing this table instead of probing the dict
+        self.jump = build_jump_table(self.squares, final_square) if jump is None else jump
+        self.reset()
+
+    def reset(self):
+        """Put every player back on the start square"""
+        self.positions = [START_SQUARE] * self.num_players
+        self.current = 0
+        self.winner = None
+        self.turn = 0  # Number of rolls applied so far
+
+    @property
+    def game_over(self):
+        return self.winner is not None
+
+    def advance_turn(self):
+        """Hand the turn to the next player in seat order"""
+        self.current = (self.current + 1) % self.num_players
+
+    def apply_roll(self, dice):
+        """Move the current player by `dice`, detect a win and pass the turn"""
+        if self.game_over:
+            raise ValueError("The game is already over")
+        if not 1 <= dice <= 6:
+            raise ValueError(f"Invalid dice value: {dice}")
+
+        player = self.current
+        start = self.positions[player]
+        landing = start + dice
+        if landing > self.final_square:
+            landing = self.final_square
+        position = self.jump[landing]
+        self.positions[player] = position
+        self.turn += 1
+
+        won = position >= self.final_square
+        if won:
+            self.winner = player
+        else:
+            self.advance_turn()
+        return MoveResult(player, start, dice, landing, position, jump_kind(landing, position), won)
+
+
+class TurnScheduler:
+    """Priority queue of callbacks due at monotonic clock times.
+
+    Used to fire computer turns once at their due time instead of polling the
+    clock every frame. While paused, time stops for every scheduled callback.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.queue = []  # Heap of [due, handle, callback, args]
+        self.handles = itertools.count()
+        self.cancelled = set()
+        self.paused_at = None
+
+    @property
+    def paused(self):
+        return self.paused_at is not None
+
+    def schedule(self, delay, callback, *args):
+        """Call callback(*args) after `delay` seconds; returns a handle for cancel()"""
+        handle = next(self.handles)
+        heapq.heappush(self.queue, [self.now() + delay, handle, callback, args])
+        return handle
+
+    def cancel(self, handle):
+        """Forget a scheduled callback"""
+        self.cancelled.add(handle)
+
+    def clear(self):
+        """Forget every scheduled callback"""
+        self.queue.clear()
+        self.cancelled.clear()
+
+    def now(self):
+        return self.paused_at if self.paused else self.clock()
+
+    def pause(self):
+        if not self.paused:
+            self.paused_at = self.clock()
+
+    def resume(self):
+        """Continue, shifting every due time by the length of the pause"""
+        if self.paused:
+            paused_for = self.clock() - self.paused_at
+            self.paused_at = None
+            # A uniform shift keeps the heap ordering valid
+            for entry in self.queue:
+                entry[0] += paused_for
+
+    def time_until_next(self):
+        """Seconds until the next callback is due, or None if nothing can fire"""
+        self._drop_cancelled()
+        if self.paused or not self.queue:
+            return None
+        return max(0.0, self.queue[0][0] - self.clock())
+
+    def run_due(self):
+        """Run every callback whose time has come; returns how many ran"""
+        ran = 0
+        while not self.paused:
+            self._drop_cancelled()
+            if not self.queue or self.queue[0][0] > self.clock():
+                break
+            _, _, callback, args = heapq.heappop(self.queue)
+            callback(*args)
+            ran += 1
+        return ran
+
+    def _drop_cancelled(self):
+        while self.queue and self.queue[0][1] in self.cancelled:
+            self.cancelled.discard(heapq.heappop(self.queue)[1])
@@ -0,0 +1,118 @@
+import json
+import os
+import pygame
+from collections import OrderedDict
+from utils import cache_dir
+
+# Process-wide font registry and rendered text cache shared by every draw path.
+# Fonts are created once per (face, size, bold) and text surfaces are reused
+# across frames. Finding a face's file means scanning the system fonts (fc-list
+# on Linux, seconds on a cold cache), so the file found for each (face, bold) is
+# kept in a small JSON file in the cache directory and later runs skip the scan.
+# Delete fonts.json there after installing or removing fonts.
+
+TEXT_CACHE_SIZE = 512  # Max rendered text surfaces kept (least recently used evicted)
+FONT_FILES = 'fonts.json'
+
+_fonts = {}
+_font_files = None  # "face|bold" -> [font file or None for pygame's own font, fake bold]
+_text_cache = OrderedDict()
+_stats = {'hits': 0, 'misses': 0, 'lookups': 0}
+
+
+def _font_files_path():
+    return os.path.join(cache_dir(), FONT_FILES)
+
+
+def _load_font_files():
+    try:
+        with open(_font_files_path(), encoding='utf-8') as file:
+            files = json.load(file)
+        return files if isinstance(files, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_font_files():
+    try:
+        path = _font_files_path()
+        with open(path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(_font_files, file, indent=1)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass  # Only costs a system font scan on the next start
+
+
+def font_file(face, bold=False):
+    """(file, fake_bold) that SysFont would pick for a face; file None means pygame's own font"""
+    global _font_files
+    if _font_files is None:
+        _font_files = _load_font_files()
+    key = f"{face}|{int(bold)}"
+    entry = _font_files.get(key)
+    if entry is not None and (entry[0] is None or os.path.exists(entry[0])):
+        return entry[0], entry[1]
+
+    # Same choice as SysFont: embolden the regular face when there is no bold one
+    _stats['lookups'] += 1
+    path = pygame.font.match_font(face, bold=bold)
+    fake_bold = bold and (path is None or path == pygame.font.match_font(face))
+    _font_files[key] = [path, fake_bold]
+    _save_font_files()
+    return path, fake_bold
+
+
+def get_font(face='Arial', size=16, bold=False):
+    """Return the shared Font for (face, size, bold), creating it on first use"""
+    key = (face, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        path, fake_bold = font_file(face, bold)
+        try:
+            font = pygame.font.Font(path, size)
+        except OSError:  # Unreadable font file: fall back to a fresh system lookup
+            font = pygame.font.SysFont(face, size, bold=bold)
+        else:
+            font.set_bold(fake_bold)
+        _fonts[key] = font
+    return font
+
+
+def render_text(font, text, color, antialias=True):
+    """Render text with a shared font, reusing the surface from earlier frames.
+
+    The returned surface is shared, so callers must only blit it, never draw on it.
+    """
+    key = (font, text, tuple(color), antialias)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        _stats['hits'] += 1
+        return surface
+
+    _stats['misses'] += 1
+    surface = font.render(text, antialias, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
+
+
+def cache_stats():
+    """Return hit/miss counters and current sizes of the font and text caches"""
+    return {
+        'hits': _stats['hits'],
+        'misses': _stats['misses'],
+        'text_surfaces': len(_text_cache),
+        'fonts': len(_fonts),
+        'font_lookups': _stats['lookups'],
+    }
+
+
+def clear_caches():
+    """Forget all fonts and rendered text (e.g. after pygame.font.quit())"""
+    _fonts.clear()
+    _text_cache.clear()
+    _stats['hits'] = 0
+    _stats['misses'] = 0
+    _stats['lookups'] = 0
@@ -1,10 +1,29 @@
 import pygame
-import random
+import math
 import time
+import threading
+from collections import deque
+import ai
+from assets import SurfaceCache
+from fonts import get_font, render_text
+from rng import MatchRNG, default_rng
+from dirty_rects import DirtyRectTracker
+from scheduler import IdleScheduler, window_visible
+from engine import GameState, TurnScheduler, log_move
+from replay import Replay, PASS
+from net_client import MatchClient
+from results import MatchResult, default_store
+
+try:
+    import analysis  # Needs numpy; without it the panel shows no win chances
+except ImportError:
+    analysis = None
+
+WAKE_EVENT = pygame.event.custom_type()  # Posted by background threads to wake the game loop
 
 # Dice Class
 class Dice:
-    def __init__(self, x, y, size=80):
+    def __init__(self, x, y, size=80, rng=None):
         self.x = x
         self.y = y
         self.size = size
@@ -13,6 +32,9 @@ class Dice:
         self.rolling = False
         self.roll_timer = 0
         self.roll_duration = 30  # frames
+        self.rng = rng or default_rng()  # Real rolls and animation faces come from separate streams
+        self.remote = False  # The result is rolled elsewhere and handed in with deliver()
+        self.delivered = None
         
         # Colors
         self.dice_color = (255, 255, 255)
@@ -23,22 +45,36 @@ class Dice:
     def is_clicked(self, mouse_pos):
         return self.rect.collidepoint(mouse_pos)
 
-    def start_roll(self):
+    def start_roll(self, remote=False):
         if not self.rolling:
             self.rolling = True
             self.roll_timer = 0
+            self.remote = remote
+            self.delivered = None
+
+    def deliver(self, value):
+        """Result of a remote roll; the animation settles on it"""
+        self.delivered = value
+
+    def awaiting_result(self):
+        return self.rolling and self.remote and self.delivered is None
 
     def update(self):
         if self.rolling:
             self.roll_timer += 1
             # Change value rapidly while rolling
             if self.roll_timer % 3 == 0:  # Change every 3 frames
-                self.value = random.randint(1, 6)
+                self.value = self.rng.cosmetic_roll()
             
             # Stop rolling after duration
             if self.roll_timer >= self.roll_duration:
+                if not self.remote:
+                    self.value = self.rng.roll()
+                elif self.delivered is None:
+                    return False  # Keep rolling until the remote result arrives
+                else:
+                    self.value = self.delivered
                 self.rolling = False
-                self.value = random.randint(1, 6)
                 return True  # Roll completed
         return False
 
@@ -63,8 +99,7 @@ class Dice:
         
         # Draw roll instruction
         if not self.rolling:
-            font = pygame.font.SysFont('Arial', 12)
-            instruction = font.render("Klik untuk roll", True, (100, 100, 100))
+            instruction = render_text(get_font('Arial', 12), "Klik untuk roll", (100, 100, 100))
             instruction_rect = instruction.get_rect(center=(self.x + self.size//2, self.y + self.size + 15))
             screen.blit(instruction, instruction_rect)
 
@@ -91,51 +126,123 @@ class Dice:
     def get_value(self):
         return self.value
 
+    def get_draw_rect(self):
+        """Screen area covered by the dice and its roll instruction"""
+        return pygame.Rect(self.x - 2, self.y - 2, self.size + 4, self.size + 27)
+
 # Game Logic
 class Game:
-    def __init__(self, screen, game_mode="1v1"):
+    def __init__(self, screen, game_mode="1v1", dirty_rects=True, board_path=None, num_players=2, seed=None,
+                 server=None, match_id=None, assets=None):
         self.screen = screen
-        self.clock = pygame.time.Clock()
+        self.assets = assets if assets is not None else SurfaceCache()  # Board tiles and overlays
+        self.rng = MatchRNG(seed)  # Same seed, same dice: matches can be reproduced
+        self.idle_scheduler = IdleScheduler(fps=60)
+        self.turn_scheduler = TurnScheduler()  # Fires computer turns when due
         
         # Import here to avoid circular import
         from board import Board
-        from player import Player
         
-        self.board = Board()
+        self.board = Board(board_path, self.assets)
         self.game_mode = game_mode
         
-        # Initialize players based on mode
-        if game_mode == "1v1":
-            self.player1 = Player("Player 1", (255, 0, 0))  # Red
-            self.player2 = Player("Player 2", (0, 0, 255))  # Blue
-        else:  # 1vcomputer
-            self.player1 = Player("Player", (255, 0, 0))  # Red
-            self.player2 = Player("Computer", (0, 0, 255), is_computer=True)  # Blue
+        # Rules and turn order live in the headless engine; players render its seats
+        self.set_players(self.create_players(game_mode, num_players))
+        self.replay = self.new_replay()
         
-        self.current_player = self.player1
         self.game_over = False
         self.winner = None
         self.waiting_for_roll = True
+        self.started_at = time.monotonic()
+        self.results_store = default_store()  # Finished matches are kept for the leaderboard
+        
+        # Online play (game_mode "online"): the server rolls and orders turns
+        self.client = None
+        self.connected = False
+        self.seat = None  # Our seat in the online match
+        self.match_started = False
+        self.remote_events = deque()  # Server moves and states still to be shown, in order
         
         # Initialize dice - moved to right panel area to avoid covering board
-        self.dice = Dice(850, 150)
+        self.dice = Dice(850, 150, rng=self.rng)
         
-        self.font = pygame.font.SysFont('Arial', 20)
+        self.font = get_font('Arial', 20)
+        self.wrapped_message = (None, None, [])  # (message, max_width, lines)
         
         # Set initial message based on player type
-        if self.current_player.is_computer:
-            self.message = "Computer sedang berpikir..."
-            self.current_player.set_move_time()
-        else:
-            self.message = "Klik dadu untuk roll"
-        
-        # Animation variables
-        self.moving_animation = False
-        self.animation_start_pos = 1
-        self.animation_target_pos = 1
-        self.animation_progress = 0
+        self.message = self.announce_turn()
+        
+        # Dirty-rect rendering: only changed regions are repainted and pushed
+        self.use_dirty_rects = dirty_rects
+        self.dirty = DirtyRectTracker()
+        self.drawn_game_over = False
+        self.back_button_rect = pygame.Rect(870, 580, 180, 35)
+        self.dragging = False  # Right mouse button drags the board
+        # Win chances come from a per-board table built on a background thread
+        self.win_table = None
+        self.odds = (None, None)  # ((positions, current), [(chance, expected rolls)] per seat)
+        self.start_win_table()
+        
+        if server is not None:
+            self.connect(server, match_id, num_players)
+
+    def set_players(self, players):
+        """Seat `players` in a fresh engine state"""
+        self.players = players
+        self.state = GameState(len(players), self.board.squares, self.board.final_square, self.board.jump)
+        for index, player in enumerate(players):
+            player.bind(self.state, index)
 
     def draw(self):
+        """Draw the frame, pushing only the changed regions in dirty-rect mode"""
+        mouse_pos = pygame.mouse.get_pos()
+        if not self.use_dirty_rects:
+            self.draw_scene(mouse_pos)
+            pygame.display.flip()
+            return
+        
+        self.track_dirty_regions(mouse_pos)
+        full_redraw, rects = self.dirty.collect()
+        if full_redraw:
+            self.draw_scene(mouse_pos)
+            pygame.display.flip()
+        elif rects:
+            # Repaint the scene clipped to each changed region
+            for rect in rects:
+                self.screen.set_clip(rect)
+                self.draw_scene(mouse_pos)
+            self.screen.set_clip(None)
+            pygame.display.update(rects)
+
+    def track_dirty_regions(self, mouse_pos):
+        """Describe every region that can change so the tracker can diff them"""
+        # The win overlay covers the whole window
+        if self.game_over != self.drawn_game_over:
+            self.drawn_game_over = self.game_over
+            self.dirty.request_full_redraw()
+        
+        dice_hovered = self.dice.rect.collidepoint(mouse_pos) and not self.dice.rolling
+        self.dirty.track('dice', self.dice.get_draw_rect(),
+                         (self.dice.value, self.dice.rolling, dice_hovered))
+        
+        # Scrolling or zooming repaints the whole viewport
+        self.dirty.track('board', self.board.camera.viewport, (self.board.camera.state, self.board.overlay))
+        
+        # Player tokens: old and new positions are both repainted on a move
+        for index, player in enumerate(self.players):
+            self.dirty.track(('player', index), player.get_draw_rect(self.board), player.position)
+        
+        # Right panel sections
+        self.dirty.track('turn', pygame.Rect(862, 112, 216, 24), self.current_player.name)
+        self.dirty.track('player_boxes', pygame.Rect(862, 248, 216, 154),
+                         (self.state.current, tuple(self.state.positions), self.win_table is not None))
+        self.dirty.track('dice_value', pygame.Rect(862, 406, 216, 28), self.dice.value)
+        self.dirty.track('message', pygame.Rect(862, 446, 216, 78), self.message)
+        self.dirty.track('back_button', self.back_button_rect,
+                         self.back_button_rect.collidepoint(mouse_pos))
+
+    def draw_scene(self, mouse_pos):
+        """Draw every layer of the game screen (respects the screen clip rect)"""
         # Fill background with dark green
         self.screen.fill((34, 139, 34))
         
@@ -147,9 +254,10 @@ class Game:
         # Draw board
         self.board.draw(self.screen)
         
-        # Draw players on board
-        self.player1.draw(self.screen)
-        self.player2.draw(self.screen)
+        # Draw players on board (tokens outside the viewport are skipped)
+        for player in self.players:
+            if player.get_draw_rect(self.board).colliderect(self.board.camera.viewport):
+                player.draw(self.screen, self.board)
         
         # Draw right panel background for UI elements
         right_panel = pygame.Rect(860, 30, 220, 620)
@@ -157,16 +265,13 @@ class Game:
         pygame.draw.rect(self.screen, (255, 255, 255), right_panel, 2)
         
         # Draw dice in right panel
-        mouse_pos = pygame.mouse.get_pos()
         self.dice.draw(self.screen, mouse_pos)
         
         # Draw game info in right panel
         self.draw_game_info()
         
         # Draw back to menu button in right panel
-        self.draw_back_button()
-        
-        pygame.display.flip()
+        self.draw_back_button(mouse_pos)
 
     def draw_game_info(self):
         """Draw current player, dice value, and messages in right panel"""
@@ -175,31 +280,31 @@ class Game:
         
         # Title
         title_text = "ULAR TANGGA"
-        title_surface = pygame.font.SysFont('Arial', 20, bold=True).render(title_text, True, (255, 255, 255))
+        title_surface = render_text(get_font('Arial', 20, bold=True), title_text, (255, 255, 255))
         self.screen.blit(title_surface, (panel_x, 40))
         
         # Game mode
         mode_text = f"Mode: {self.game_mode}"
-        mode_surface = pygame.font.SysFont('Arial', 16).render(mode_text, True, (200, 200, 200))
+        mode_surface = render_text(get_font('Arial', 16), mode_text, (200, 200, 200))
         self.screen.blit(mode_surface, (panel_x, 65))
         
         # Current player info with highlight
         current_text = "Giliran:"
-        current_surface = pygame.font.SysFont('Arial', 18, bold=True).render(current_text, True, (255, 255, 255))
+        current_surface = render_text(get_font('Arial', 18, bold=True), current_text, (255, 255, 255))
         self.screen.blit(current_surface, (panel_x, 95))
         
         player_text = self.current_player.name
-        player_surface = pygame.font.SysFont('Arial', 16, bold=True).render(player_text, True, self.current_player.color)
+        player_surface = render_text(get_font('Arial', 16, bold=True), player_text, self.current_player.color)
         self.screen.blit(player_surface, (panel_x, 115))
         
         # Player info boxes in right panel
-        self.draw_player_info_panel(self.player1, panel_x, 250)
-        self.draw_player_info_panel(self.player2, panel_x, 330)
+        for player, box_rect in self.player_panel_rows(panel_x, 250):
+            self.draw_player_info_panel(player, box_rect)
         
         # Dice value display
         if self.dice.value > 0:
             dice_text = f"Dadu: {self.dice.value}"
-            dice_surface = pygame.font.SysFont('Arial', 18, bold=True).render(dice_text, True, (255, 255, 0))
+            dice_surface = render_text(get_font('Arial', 18, bold=True), dice_text, (255, 255, 0))
             self.screen.blit(dice_surface, (panel_x, 410))
         
         # Message - word wrapped for narrow panel
@@ -209,11 +314,49 @@ class Game:
         if self.game_over and self.winner:
             self.draw_win_screen()
 
-    def draw_player_info_panel(self, player, x, y):
+    def player_panel_rows(self, x, y, width=180, height=150):
+        """Player info boxes that fit the panel area, as (player, rect) pairs.
+
+        Boxes shrink as players are added; when even the smallest boxes do not
+        fit, only a window of players around the current one is shown.
+        """
+        count = len(self.players)
+        gap = 10 if count <= 3 else 2
+        box_height = (height + gap) // count - gap
+        visible = count
+        if box_height < 16:
+            visible = (height + gap) // (16 + gap)
+            box_height = (height + gap) // visible - gap
+        first = max(0, min(self.state.current - visible // 2, count - visible))
+        return [(self.players[index], pygame.Rect(x, y + row * (box_height + gap), width, box_height))
+                for row, index in enumerate(range(first, first + visible))]
+
+    def start_win_table(self):
+        """Build the board's win table in the background; the panel shows odds once it is ready"""
+        if analysis is None or self.board.final_square > analysis.MAX_TABLE_SQUARES:
+            return
+        threading.Thread(target=self.build_win_table, name="win-table", daemon=True).start()
+
+    def build_win_table(self):
+        self.win_table = analysis.win_table(self.board.squares, self.board.final_square)
+        self.wake_loop()
+
+    def player_odds(self, player):
+        """(win chance, expected rolls left) of a player, or None before the table is ready"""
+        if self.win_table is None:
+            return None
+        key = (tuple(self.state.positions), self.state.current)
+        if self.odds[0] != key:
+            # Looked up once per move, not per frame
+            chances = self.win_table.win_chances(self.state.positions, self.state.current)
+            expected = [float(self.win_table.expected_turns[position]) for position in self.state.positions]
+            self.odds = (key, list(zip(chances, expected)))
+        return self.odds[1][player.index]
+
+    def draw_player_info_panel(self, player, box_rect):
         """Draw player info in right panel"""
-        box_width = 180
-        box_height = 70
-        box_rect = pygame.Rect(x, y, box_width, box_height)
+        x, y = box_rect.topleft
+        odds = self.player_odds(player)
         
         # Highlight current player's box
         if player == self.current_player:
@@ -225,208 +368,517 @@ class Game:
             pygame.draw.rect(self.screen, (120, 120, 120), box_rect, 1)
             text_color = (200, 200, 200)
         
+        type_text = "Computer" if player.is_computer else "Human"
+        if box_rect.height < 36:
+            # One line: name on the left, square on the right
+            name_surface = render_text(get_font('Arial', 14, bold=True), player.name, text_color)
+            self.screen.blit(name_surface, (x + 8, y + (box_rect.height - name_surface.get_height()) // 2))
+            pos_text = str(player.position) if odds is None else f"{odds[0]:.0%} | {player.position}"
+            pos_surface = render_text(get_font('Arial', 14), pos_text, text_color)
+            self.screen.blit(pos_surface, pos_surface.get_rect(midright=(box_rect.right - 8, box_rect.centery)))
+            return
+        
         # Player name
-        name_surface = pygame.font.SysFont('Arial', 16, bold=True).render(player.name, True, text_color)
+        name_surface = render_text(get_font('Arial', 16, bold=True), player.name, text_color)
+        if box_rect.height < 60:
+            # Two lines: name, then square and player type
+            self.screen.blit(name_surface, (x + 8, y + 2))
+            info_surface = render_text(get_font('Arial', 12), f"Kotak: {player.position} | {type_text}", text_color)
+            self.screen.blit(info_surface, (x + 8, y + 20))
+            if odds is not None:
+                chance_surface = render_text(get_font('Arial', 14, bold=True), f"{odds[0]:.0%}", text_color)
+                self.screen.blit(chance_surface, chance_surface.get_rect(topright=(box_rect.right - 8, y + 2)))
+            return
         self.screen.blit(name_surface, (x + 8, y + 8))
+        if odds is not None:
+            # Win chance beside the name, expected rolls left beside the square
+            chance_surface = render_text(get_font('Arial', 16, bold=True), f"{odds[0]:.0%}", text_color)
+            self.screen.blit(chance_surface, chance_surface.get_rect(topright=(box_rect.right - 8, y + 8)))
+            turns_surface = render_text(get_font('Arial', 12), f"±{odds[1]:.0f} giliran lagi", text_color)
+            self.screen.blit(turns_surface, turns_surface.get_rect(topright=(box_rect.right - 8, y + 30)))
         
         # Player position
         pos_text = f"Kotak: {player.position}"
-        pos_surface = pygame.font.SysFont('Arial', 14).render(pos_text, True, text_color)
+        pos_surface = render_text(get_font('Arial', 14), pos_text, text_color)
         self.screen.blit(pos_surface, (x + 8, y + 28))
         
         # Player type
-        type_text = "Computer" if player.is_computer else "Human"
-        type_surface = pygame.font.SysFont('Arial', 12).render(type_text, True, text_color)
+        type_surface = render_text(get_font('Arial', 12), type_text, text_color)
         self.screen.blit(type_surface, (x + 8, y + 48))
 
     def draw_wrapped_message(self, message, x, y, max_width):
         """Draw message with word wrapping"""
-        words = message.split(' ')
-        lines = []
-        current_line = []
+        font = get_font('Arial', 14)
         
-        font = pygame.font.SysFont('Arial', 14)
-        
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            test_surface = font.render(test_line, True, (255, 255, 255))
+        # Only re-wrap when the message or width changes
+        if self.wrapped_message[:2] != (message, max_width):
+            words = message.split(' ')
+            lines = []
+            current_line = []
             
-            if test_surface.get_width() <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
+            for word in words:
+                test_line = ' '.join(current_line + [word])
+                
+                if font.size(test_line)[0] <= max_width:
+                    current_line.append(word)
+                else:
+                    if current_line:
+                        lines.append(' '.join(current_line))
+                    current_line = [word]
+            
+            if current_line:
+                lines.append(' '.join(current_line))
+            self.wrapped_message = (message, max_width, lines)
         
-        if current_line:
-            lines.append(' '.join(current_line))
+        lines = self.wrapped_message[2]
         
         # Draw lines
         for i, line in enumerate(lines[:4]):  # Limit to 4 lines
-            line_surface = font.render(line, True, (255, 255, 255))
+            line_surface = render_text(font, line, (255, 255, 255))
             self.screen.blit(line_surface, (x, y + i * 18))
 
     def draw_win_screen(self):
         """Draw victory screen overlay"""
         # Semi-transparent overlay over entire screen
-        overlay = pygame.Surface((1100, 680))
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
+        overlay = self.assets.translucent((1100, 680), (0, 0, 0), 200)
         self.screen.blit(overlay, (0, 0))
         
+        # Final positions are listed in one column, or two for many players
+        columns = 1 if len(self.players) <= 6 else 2
+        shown = self.players[:16]
+        rows = math.ceil(len(shown) / columns)
+        extra_height = max(0, rows - 2) * 25
+        
         # Victory box
-        win_box = pygame.Rect(200, 200, 500, 280)
+        win_box = pygame.Rect(200, 200, 500, 280 + extra_height)
         pygame.draw.rect(self.screen, (40, 40, 40), win_box)
         pygame.draw.rect(self.screen, (255, 255, 0), win_box, 4)
         
         # Victory message
         win_text = f"{self.winner.name} MENANG!"
-        win_surface = pygame.font.SysFont('Arial', 48, bold=True).render(win_text, True, (255, 255, 0))
+        win_surface = render_text(get_font('Arial', 48, bold=True), win_text, (255, 255, 0))
         win_rect = win_surface.get_rect(center=(450, 280))
         self.screen.blit(win_surface, win_rect)
         
         # Final positions
         final_text = f"Posisi Final:"
-        final_surface = pygame.font.SysFont('Arial', 20).render(final_text, True, (255, 255, 255))
+        final_surface = render_text(get_font('Arial', 20), final_text, (255, 255, 255))
         final_rect = final_surface.get_rect(center=(450, 330))
         self.screen.blit(final_surface, final_rect)
         
-        p1_text = f"{self.player1.name}: {self.player1.position}"
-        p1_surface = pygame.font.SysFont('Arial', 18).render(p1_text, True, self.player1.color)
-        p1_rect = p1_surface.get_rect(center=(450, 355))
-        self.screen.blit(p1_surface, p1_rect)
-        
-        p2_text = f"{self.player2.name}: {self.player2.position}"
-        p2_surface = pygame.font.SysFont('Arial', 18).render(p2_text, True, self.player2.color)
-        p2_rect = p2_surface.get_rect(center=(450, 380))
-        self.screen.blit(p2_surface, p2_rect)
+        column_x = [450] if columns == 1 else [340, 560]
+        for index, player in enumerate(shown):
+            player_text = f"{player.name}: {player.position}"
+            player_surface = render_text(get_font('Arial', 18), player_text, player.color)
+            player_rect = player_surface.get_rect(center=(column_x[index // rows], 355 + index % rows * 25))
+            self.screen.blit(player_surface, player_rect)
         
         # Instructions
-        restart_text = "Tekan R untuk main lagi | Tekan M untuk menu utama"
-        restart_surface = pygame.font.SysFont('Arial', 16).render(restart_text, True, (200, 200, 200))
-        restart_rect = restart_surface.get_rect(center=(450, 420))
+        if self.client is None:
+            restart_text = "Tekan R untuk main lagi | Tekan M untuk menu utama"
+        else:
+            restart_text = "Tekan M untuk menu utama"
+        restart_surface = render_text(get_font('Arial', 16), restart_text, (200, 200, 200))
+        restart_rect = restart_surface.get_rect(center=(450, 420 + extra_height))
         self.screen.blit(restart_surface, restart_rect)
 
-    def draw_back_button(self):
+    def draw_back_button(self, mouse_pos=None):
         """Draw back to menu button in right panel"""
-        button_rect = pygame.Rect(870, 580, 180, 35)
-        pygame.draw.rect(self.screen, (100, 100, 100), button_rect)
+        button_rect = self.back_button_rect
+        is_hovered = mouse_pos is not None and button_rect.collidepoint(mouse_pos)
+        button_color = (130, 130, 130) if is_hovered else (100, 100, 100)
+        pygame.draw.rect(self.screen, button_color, button_rect)
         pygame.draw.rect(self.screen, (255, 255, 255), button_rect, 2)
         
-        button_text = pygame.font.SysFont('Arial', 16).render("Menu Utama", True, (255, 255, 255))
+        button_text = render_text(get_font('Arial', 16), "Menu Utama", (255, 255, 255))
         button_text_rect = button_text.get_rect(center=button_rect.center)
         self.screen.blit(button_text, button_text_rect)
         
         return button_rect
 
-    def handle_input(self):
-        for event in pygame.event.get():
+    def handle_input(self, events=None):
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 return "quit"
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.ACTIVEEVENT):
+                # Window contents may have been lost
+                self.dirty.request_full_redraw()
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_r and self.game_over:
+                if event.key == pygame.K_r and self.game_over and self.client is None:
                     self.restart_game()
                 elif event.key == pygame.K_m and self.game_over:
                     return "menu"
+                else:
+                    self.handle_camera_key(event.key)
+            elif event.type == pygame.MOUSEWHEEL:
+                # Zoom around the mouse pointer
+                mouse_pos = pygame.mouse.get_pos()
+                if self.board.camera.viewport.collidepoint(mouse_pos):
+                    self.board.camera.zoom_by(event.y, mouse_pos)
+            elif event.type == pygame.MOUSEBUTTONUP:
+                if event.button == 3:
+                    self.dragging = False
+            elif event.type == pygame.MOUSEMOTION:
+                if self.dragging:
+                    self.board.camera.scroll(-event.rel[0], -event.rel[1])
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Left click
+                if event.button == 3 and self.board.camera.viewport.collidepoint(event.pos):
+                    self.dragging = True
+                elif event.button == 1:  # Left click
                     mouse_pos = pygame.mouse.get_pos()
                     
                     # Check back button
-                    back_button = self.draw_back_button()
-                    if back_button.collidepoint(mouse_pos):
+                    if self.back_button_rect.collidepoint(mouse_pos):
                         return "menu"
                     
                     # Check dice click
                     if (self.dice.is_clicked(mouse_pos) and 
                         self.waiting_for_roll and 
                         not self.game_over and 
-                        not self.current_player.is_computer):
+                        not self.current_player.is_computer and
+                        (self.client is None or self.our_turn_online())):
                         self.roll_and_move()
         
         return None
 
+    def handle_camera_key(self, key):
+        """Arrow keys scroll the board, +/- zoom, Home jumps to the current player, H toggles the heatmap"""
+        camera = self.board.camera
+        step_x, step_y = self.board.cell_size()
+        if key == pygame.K_LEFT:
+            camera.scroll(-step_x, 0)
+        elif key == pygame.K_RIGHT:
+            camera.scroll(step_x, 0)
+        elif key == pygame.K_UP:
+            camera.scroll(0, -step_y)
+        elif key == pygame.K_DOWN:
+            camera.scroll(0, step_y)
+        elif key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+            camera.zoom_by(1)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            camera.zoom_by(-1)
+        elif key == pygame.K_HOME:
+            camera.center_on(*self.board.square_position(self.current_player.position))
+        elif key == pygame.K_h:
+            self.board.toggle_overlay()
+
     def roll_and_move(self):
         """Roll dice and move current player"""
-        self.dice.start_roll()
+        if self.client is not None:
+            # Predict: the animation starts now and settles on the server's roll when it arrives
+            self.client.send({'op': 'roll'})
+        self.dice.start_roll(remote=self.client is not None)
         self.waiting_for_roll = False
         self.message = f"{self.current_player.name} sedang roll dadu..."
 
     def update_game(self):
         """Update game state"""
+        if self.client is not None:
+            self.handle_network()
+        
         # Update dice animation
         if self.dice.update():  # Dice roll completed
-            dice_value = self.dice.get_value()
-            self.move_player(dice_value)
+            if self.client is not None:
+                self.apply_remote_move(self.remote_events.popleft())
+            else:
+                self.move_player(self.dice.get_value())
         
-        # Handle computer player
-        if (self.current_player.is_computer and 
+        # Fire the computer's turn once its move delay has passed
+        self.turn_scheduler.run_due()
+
+    def schedule_computer_turn(self):
+        """Let the computer roll once its move delay has passed"""
+        self.turn_scheduler.clear()
+        self.turn_scheduler.schedule(self.current_player.move_delay, self.computer_turn_due)
+
+    def computer_turn_due(self):
+        """Scheduled callback: roll for the computer if it is still its turn"""
+        player = self.current_player
+        if (player.is_computer and 
             self.waiting_for_roll and 
-            not self.game_over and
-            self.current_player.should_computer_roll()):
+            not self.game_over):
             self.roll_and_move()
 
+    def announce_turn(self):
+        """Prompt for the player whose turn it is, scheduling computer turns"""
+        if self.client is not None:
+            if not self.match_started:
+                return "Menunggu pemain lain..."
+            if self.state.current != self.seat:
+                return f"Menunggu {self.current_player.name}..."
+            return "Giliranmu! Klik dadu untuk roll"
+        if self.current_player.is_computer:
+            self.schedule_computer_turn()
+            return f"{self.current_player.name} sedang berpikir..."
+        return "Klik dadu untuk roll"
+
+    @staticmethod
+    def create_players(game_mode, num_players=2):
+        """Players for a menu mode: all humans for "1v1" and "online", otherwise one human against computers"""
+        from player import Player, EnhancedAIPlayer, player_color
+        
+        if game_mode in ("1v1", "online"):
+            return [Player(f"Player {index + 1}", player_color(index)) for index in range(num_players)]
+        
+        # "1vcomputer_<difficulty>" uses the enhanced AI, plain "1vcomputer" the basic one
+        difficulty = game_mode.partition('_')[2]
+        players = [Player("Player", player_color(0))]
+        for index in range(1, num_players):
+            name = "Computer" if num_players == 2 else f"Computer {index}"
+            if difficulty in ai.DIFFICULTIES:
+                players.append(EnhancedAIPlayer(name, player_color(index), difficulty))
+            else:
+                players.append(Player(name, player_color(index), is_computer=True))
+        return players
+
+    @property
+    def current_player(self):
+        return self.players[self.state.current]
+
     def move_player(self, dice_value):
         """Move player and handle game logic"""
-        old_position = self.current_player.position
-        self.current_player.move(dice_value, self.board)
+        mover = self.current_player
+        result = self.state.apply_roll(dice_value)
+        self.replay.record(dice_value)
+        log_move(mover.name, result.landing, result.position)
+        self.board.follow(result.position)  # Keep the moved token in view
         
         # Update message based on movement
-        if self.current_player.position != old_position + dice_value:
-            # Landed on snake or ladder
-            if self.current_player.position > old_position + dice_value:
-                self.message = f"{self.current_player.name} naik tangga! {old_position + dice_value} → {self.current_player.position}"
-            else:
-                self.message = f"{self.current_player.name} kena ular! {old_position + dice_value} → {self.current_player.position}"
+        if result.jump == 'ladder':
+            self.message = f"{mover.name} naik tangga! {result.landing} → {result.position}"
+        elif result.jump == 'snake':
+            self.message = f"{mover.name} kena ular! {result.landing} → {result.position}"
         else:
-            self.message = f"{self.current_player.name} pindah ke kotak {self.current_player.position}"
+            self.message = f"{mover.name} pindah ke kotak {result.position}"
         
-        # Check for win condition
-        if self.current_player.position >= 100:
-            self.current_player.position = 100
+        # Check for win condition (the engine already passed the turn otherwise)
+        if result.won:
             self.game_over = True
-            self.winner = self.current_player
-            self.message = f"{self.current_player.name} menang!"
+            self.winner = mover
+            self.message = f"{mover.name} menang!"
+            self.save_replay()
+            self.record_result()
         else:
-            # Switch to next player
-            self.switch_player()
-            
             # Update message for next player
-            if self.current_player.is_computer:
-                self.message += " | Computer sedang berpikir..."
-                self.current_player.set_move_time()
-            else:
-                self.message += " | Klik dadu untuk roll"
+            self.message += " | " + self.announce_turn()
         
         self.waiting_for_roll = True
 
     def switch_player(self):
-        """Switch to the other player"""
-        self.current_player = self.player2 if self.current_player == self.player1 else self.player1
+        """Hand the turn to the next player in seat order"""
+        self.state.advance_turn()
 
-    def restart_game(self):
+    def new_replay(self):
+        """Empty replay for the match that is about to start"""
+        roster = [(player.name, getattr(player, 'difficulty', "computer" if player.is_computer else "human"))
+                  for player in self.players]
+        return Replay(self.board.layout.spec_hash, roster, seed=self.roll_seed(), game_mode=self.game_mode)
+
+    def roll_seed(self):
+        """Seed of this match's dice, or None online where the server rolls and keeps it"""
+        return None if self.game_mode == "online" else self.rng.seed
+
+    def save_replay(self):
+        """Write the current match's replay once, if anything happened"""
+        if not self.replay.turns or self.replay.saved_path:
+            return
+        try:
+            print(f"Replay saved to {self.replay.save()}")
+        except OSError as error:
+            print(f"Could not save replay: {error}")
+
+    def record_result(self):
+        """Queue the finished match for the results database (written on a background thread)"""
+        if self.results_store is None:
+            return
+        self.results_store.record(MatchResult(
+            mode=self.game_mode, difficulty=self.game_mode.partition('_')[2] or None, players=len(self.players),
+            turns=len(self.replay.turns), winner=self.winner.name,
+            winner_kind=self.replay.roster[self.state.winner][1], duration=time.monotonic() - self.started_at,
+            board=self.board.layout.spec_hash, seed=self.roll_seed(), finished_at=time.time()))
+
+    def new_match(self, game_mode, num_players=2, seed=None):
+        """Start over in another mode, keeping the board, dice and caches.
+
+        Players are only rebuilt when the roster changes.
+        """
+        if game_mode != self.game_mode or num_players != len(self.players):
+            self.game_mode = game_mode
+            self.set_players(self.create_players(game_mode, num_players))
+        self.restart_game(seed)
+
+    def restart_game(self, seed=None):
         """Restart the game"""
-        self.player1.position = 1
-        self.player2.position = 1
-        self.current_player = self.player1
+        self.save_replay()
+        self.rng = self.dice.rng = MatchRNG(seed)  # Every match gets its own seed unless one is given
+        self.replay = self.new_replay()
+        self.started_at = time.monotonic()
+        self.state.reset()
+        self.board.follow(self.current_player.position)
         self.game_over = False
         self.winner = None
         self.dice.value = 1
+        self.dice.rolling = False  # A roll may have been left running when leaving for the menu
         self.waiting_for_roll = True
+        self.dragging = False
+        self.dirty.request_full_redraw()
+        self.turn_scheduler.clear()
         
-        if self.current_player.is_computer:
-            self.message = "Computer sedang berpikir..."
-            self.current_player.set_move_time()
+        self.message = self.announce_turn()
+
+    def connect(self, server, match_id, num_players):
+        """Create (or join, given `match_id`) a match on the server at (host, port)"""
+        host, port = server
+        self.client = MatchClient(host, port, wake=self.wake_loop)
+        if match_id is None:
+            self.client.send({'op': 'create', 'players': num_players})
         else:
-            self.message = "Klik dadu untuk roll"
+            self.client.send({'op': 'join', 'match': match_id})
+        self.waiting_for_roll = False
+        self.message = f"Menghubungkan ke {host}:{port}..."
+
+    def wake_loop(self):
+        # Runs on a background thread: wakes a game loop that is blocked on its event queue
+        try:
+            pygame.event.post(pygame.event.Event(WAKE_EVENT))
+        except pygame.error:
+            pass  # Display already shut down
+
+    def close_connection(self):
+        if self.client is not None:
+            self.client.close()
+            self.connected = False
+
+    def our_turn_online(self):
+        """Whether we may roll now in an online match"""
+        return (self.connected and self.match_started and self.state.current == self.seat and
+                not self.remote_events and not self.dice.rolling)
+
+    def handle_network(self):
+        """Apply server messages received since the last frame"""
+        for message in self.client.poll():
+            op = message.get('op')
+            if op in ('moved', 'state'):
+                self.remote_events.append(message)  # Shown in order, after the dice animation
+            elif op == 'connected':
+                self.connected = True
+            elif op == 'joined':
+                self.join_online_match(message)
+            elif op == 'player_joined':
+                self.players[message['seat']].name = message['name']
+                self.dirty.request_full_redraw()
+            elif op == 'start':
+                self.start_online_match(message)
+            elif op == 'player_left':
+                self.message = f"{self.players[message['seat']].name} keluar dari permainan"
+            elif op == 'error':
+                self.server_error(message['message'])
+            elif op == 'disconnected':
+                self.connected = False
+                self.waiting_for_roll = False
+                self.message = f"Koneksi terputus: {message['message']}"
+        self.play_remote_events()
+
+    def join_online_match(self, message):
+        if message['board'] != self.board.layout.spec_hash:
+            self.close_connection()
+            self.message = "Server memakai papan yang berbeda"
+            return
+        self.seat = message['seat']
+        names = message['players']
+        if len(names) != len(self.players):
+            self.set_players(self.create_players("online", len(names)))
+        for player, name in zip(self.players, names):
+            player.name = name or "Menunggu..."
+        self.dirty.request_full_redraw()
+        self.message = f"Match {message['match']} (bergabung dengan --match {message['match']}) | " + self.announce_turn()
+
+    def start_online_match(self, message):
+        for player, name in zip(self.players, message['players']):
+            player.name = name
+        self.match_started = True
+        # Only the dice animation runs locally; its seed cannot reproduce the server's rolls
+        self.rng = self.dice.rng = MatchRNG(message['cosmetic_seed'])
+        self.replay = self.new_replay()
+        self.started_at = time.monotonic()
+        self.sync_state(message)
+        self.waiting_for_roll = True
+        self.dirty.request_full_redraw()
+        self.message = self.announce_turn()
+
+    def server_error(self, text):
+        if self.dice.awaiting_result() and not self.remote_events:
+            # Our roll was refused: stop the predicted animation
+            self.dice.rolling = False
+            self.waiting_for_roll = True
+        self.message = f"Server: {text}"
+
+    def sync_state(self, info):
+        """Adopt the server's positions and turn"""
+        self.state.positions[:] = info['positions']
+        self.state.current = info['current']
+        self.state.winner = info['winner']
+
+    def play_remote_events(self):
+        """Start the dice animation for the next server move, or apply a state once the dice is idle"""
+        while self.remote_events:
+            event = self.remote_events[0]
+            if event['op'] == 'state':
+                if self.dice.rolling:
+                    return
+                self.remote_events.popleft()
+                self.sync_state(event)
+                self.message = self.announce_turn()
+                continue
+            if not self.dice.rolling:
+                self.dice.start_roll(remote=True)  # Another player's roll
+            if self.dice.awaiting_result():
+                self.dice.deliver(event['dice'])
+            return
+
+    def apply_remote_move(self, move):
+        """Apply a server move once its dice animation finished, then reconcile with the server"""
+        self.state.current = move['seat']
+        self.move_player(move['dice'])
+        # The server also skips seats whose player has left
+        self.state.positions[move['seat']] = move['position']
+        skipped = False
+        while not self.game_over and self.state.current != move['current']:
+            self.state.advance_turn()
+            self.replay.record(PASS)
+            skipped = True
+        if skipped:
+            self.message = self.message.rsplit(" | ", 1)[0] + " | " + self.announce_turn()
+        self.waiting_for_roll = not self.game_over
+
+    def is_animating(self):
+        """True while something on screen moves without user input"""
+        if not window_visible():
+            return False  # Minimized: pause animations until restored
+        return self.dice.rolling
+
+    def time_until_next_action(self):
+        """Seconds until the computer is due to roll, or None if waiting on input"""
+        return self.turn_scheduler.time_until_next()
 
     def run(self):
         """Main game loop"""
         while True:
-            result = self.handle_input()
+            # Computer turns wait while the window is minimized
+            if window_visible():
+                self.turn_scheduler.resume()
+            else:
+                self.turn_scheduler.pause()
+            
+            # 60 FPS while animating, otherwise sleep until input or the next AI move
+            events = self.idle_scheduler.wait(self.is_animating(), self.time_until_next_action())
+            result = self.handle_input(events)
             if result:
+                self.save_replay()  # Unfinished matches are kept too
+                self.close_connection()
                 return result
             
             self.update_game()
-            self.draw()
-            self.clock.tick(60)  # 60 FPS for smooth animation
\ No newline at end of file
+            self.draw()
\ No newline at end of file
@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from server import DEFAULT_PORT, raise_file_limit
+
+# Match Server Load Test
+# Opens many idle matches (a creator waiting for an opponent) plus active
+# 2-player matches whose clients roll at a human-like pace, then reports the
+# turn latency: the time from sending "roll" to receiving its "moved" reply.
+
+CONNECT_CONCURRENCY = 200  # Connections opened at the same time
+
+
+async def connect(host, port, limiter):
+    async with limiter:
+        return await asyncio.open_connection(host, port)
+
+
+async def request(connection, payload):
+    reader, writer = connection
+    writer.write(json.dumps(payload).encode('utf-8') + b'\n')
+    return await read(connection)
+
+
+async def read(connection):
+    line = await connection[0].readline()
+    if not line:
+        raise ConnectionError("Server closed the connection")
+    return json.loads(line)
+
+
+async def idle_match(host, port, limiter, connections):
+    """One creator waiting for an opponent that never comes"""
+    connection = await connect(host, port, limiter)
+    await request(connection, {'op': 'create', 'players': 2, 'name': 'Idle'})
+    connections.append(connection)
+
+
+async def active_match(host, port, limiter, interval, latencies, deadline):
+    """Two clients playing matches back to back until the deadline"""
+    first = await connect(host, port, limiter)
+    second = await connect(host, port, limiter)
+    players = [first, second]
+    games = 0
+    while time.monotonic() < deadline:
+        joined = await request(first, {'op': 'create', 'players': 2, 'name': 'A'})
+        await request(second, {'op': 'join', 'match': joined['match'], 'name': 'B'})
+        await read(first)  # player_joined
+        await read(first)  # start
+        start = await read(second)
+
+        current = start['current']
+        won = False
+        while not won and time.monotonic() < deadline:
+            await asyncio.sleep(interval * random.uniform(0.5, 1.5))
+            sent = time.perf_counter()
+            moved = await request(players[current], {'op': 'roll'})
+            latencies.append(time.perf_counter() - sent)
+            await read(players[1 - current])
+            current, won = moved['current'], moved['won']
+        games += won
+        if not won:
+            break
+    for _, writer in players:
+        writer.close()
+    return games
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def server_memory(pid):
+    """Resident memory of a process in MB (Linux only), or None"""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+
+async def run(args, server_pid=None):
+    limiter = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    idle_connections = []
+    started = time.perf_counter()
+    await asyncio.gather(*(idle_match(args.host, args.port, limiter, idle_connections)
+                           for _ in range(args.idle)))
+    print(f"{len(idle_connections):,} idle matches open after {time.perf_counter() - started:.1f} s")
+
+    latencies = []
+    deadline = time.monotonic() + args.duration
+    games = await asyncio.gather(*(active_match(args.host, args.port, limiter, args.interval, latencies, deadline)
+                                   for _ in range(args.active)))
+
+    print(f"{args.active:,} active matches for {args.duration:.0f} s: {sum(games):,} games finished, "
+          f"{len(latencies):,} turns ({len(latencies) / args.duration:,.0f} turns/s)")
+    if latencies:
+        print(f"Turn latency: p50 {percentile(latencies, 0.5) * 1000:.2f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms, max {max(latencies) * 1000:.2f} ms")
+    if server_pid is not None:
+        memory = server_memory(server_pid)
+        if memory is not None:
+            print(f"Server memory: {memory:.0f} MB")
+    for _, writer in idle_connections:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the Ular Tangga match server")
+    parser.add_argument('--host', default='127.0.0.1', help="server address")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="server port")
+    parser.add_argument('--idle', type=int, default=10_000, help="matches waiting for an opponent")
+    parser.add_argument('--active', type=int, default=1_000, help="2-player matches being played")
+    parser.add_argument('--interval', type=float, default=1.0, help="mean seconds between turns of a match")
+    parser.add_argument('--duration', type=float, default=20.0, help="seconds to play")
+    parser.add_argument('--spawn', action='store_true', help="start a server process for the test")
+    args = parser.parse_args()
+
+    raise_file_limit()
+    server = None
+    if args.spawn:
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')
+        server = subprocess.Popen([sys.executable, script, '--host', args.host, '--port', str(args.port)],
+                                  stdout=subprocess.PIPE, text=True)
+        server.stdout.readline()  # Wait until it is listening
+    try:
+        asyncio.run(run(args, server.pid if server else None))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
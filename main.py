@@ -1,36 +1,85 @@
+import time
+STARTED = time.perf_counter()  # Before the imports, so --startup-timing includes them
+
+import argparse
 import pygame
 import sys
-from menu import Menu
-from game import Game
-
-# Initialize Pygame
-pygame.init()
+from fonts import cache_stats
+from scenes import SceneManager
 
 # Game configuration
 WIDTH, HEIGHT = 1100, 700
 
-# Set up the screen
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Ular Tangga 1v1")
+class StartupTimer:
+    """Time spent in each startup phase up to the first menu frame"""
+
+    def __init__(self, started):
+        self.started = started
+        self.last = started
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
 
-def main():
+    def report(self):
+        lines = [f"  {phase:<22} {seconds * 1000:8.1f} ms" for phase, seconds in self.phases]
+        lines.append(f"  {'total':<22} {(self.last - self.started) * 1000:8.1f} ms")
+        lookups = cache_stats()['font_lookups']
+        lines.append(f"  system font lookups: {lookups}" + (" (font files cached on disk)" if not lookups else ""))
+        return "Startup:\n" + "\n".join(lines)
+
+def server_address(text):
+    """Parse "host[:port]" for --connect"""
+    from server import DEFAULT_PORT  # Only needed for online play, so not imported at startup
+    host, _, port = text.rpartition(':') if ':' in text else (text, '', '')
     try:
-        while True:
-            # Show menu and get selected mode
-            menu = Menu(screen)
-            selected_mode = menu.run()
-            
-            if selected_mode:
-                # Start game with selected mode
-                game = Game(screen, selected_mode)  # Pass both screen and game_mode
-                result = game.run()
-                
-                if result == "quit":
-                    break
-                # If result is "menu", continue to show menu again
-            else:
-                break
-                
+        return host or '127.0.0.1', int(port) if port else DEFAULT_PORT
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid server address: {text}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ular Tangga")
+    parser.add_argument('board', nargs='?', default=None, help="board spec file (JSON/TOML), classic board by default")
+    parser.add_argument('--seed', type=int, default=None, help="dice seed for games started from the menu (reproduces a match)")
+    parser.add_argument('--connect', type=server_address, default=None, metavar='HOST[:PORT]',
+                        help="play online on a match server (server.py) instead of locally")
+    parser.add_argument('--match', type=int, default=None, help="online match to join (a new one is created by default)")
+    parser.add_argument('--players', type=int, default=2, help="players in a new online match")
+    parser.add_argument('--startup-timing', action='store_true', help="print how long startup took, phase by phase")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    timer = StartupTimer(STARTED)
+    timer.mark("imports")
+
+    # Only the subsystems we use: pygame.init() would also open audio and joysticks
+    pygame.display.init()
+    pygame.font.init()
+    timer.mark("pygame init")
+
+    # Set up the screen
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Ular Tangga 1v1")
+    timer.mark("window")
+
+    def first_menu_frame():
+        # Called right after the menu's first display.flip()
+        timer.mark("menu first frame")
+        if args.startup_timing:
+            print(timer.report(), flush=True)
+
+    scenes = SceneManager(screen, board_path=args.board, seed=args.seed)
+    try:
+        # Online match first; "Menu Utama" afterwards leads to local play
+        if args.connect and scenes.play_online(args.connect, args.match, args.players) == "quit":
+            return
+        scenes.build_menu(on_first_frame=first_menu_frame)
+        timer.mark("menu setup")
+        scenes.run()
+
     except Exception as e:
         print(f"Error occurred: {e}")
         import traceback
@@ -40,4 +89,4 @@ def main():
         sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
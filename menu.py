@@ -1,22 +1,42 @@
 import pygame
 import sys
 import math
+from assets import SurfaceCache
+from fonts import get_font, render_text
+from scheduler import IdleScheduler, window_focused
+
+try:
+    import numpy
+except ImportError:  # Gradient is then drawn line by line, but still only once
+    numpy = None
+
+# Decorative snake animation: one full wave every SNAKE_PERIOD frames. The step
+# is 2*pi / SNAKE_PERIOD (about 0.0499 rad, was 0.05) so the precomputed frames
+# loop seamlessly
+SNAKE_PERIOD = 126  # Frames per full wave
+SNAKE_PHASE_STEP = 2 * math.pi / SNAKE_PERIOD
+
+MIN_PLAYERS = 2
+MAX_PLAYERS = 12
 
 class Menu:
-    def __init__(self, screen):
+    def __init__(self, screen, num_players=MIN_PLAYERS, on_first_frame=None, assets=None):
         self.screen = screen
-        self.clock = pygame.time.Clock()
+        self.assets = assets if assets is not None else SurfaceCache()
+        self.on_first_frame = on_first_frame  # Called once the first frame is on screen
+        self.idle_scheduler = IdleScheduler(fps=60)
         self.width = screen.get_width()
         self.height = screen.get_height()
         
         # Fonts
-        self.font_title = pygame.font.SysFont('Arial', 56, bold=True)
-        self.font_subtitle = pygame.font.SysFont('Arial', 24)
-        self.font_button = pygame.font.SysFont('Arial', 28, bold=True)
-        self.font_small = pygame.font.SysFont('Arial', 18)
-        self.font_instructions = pygame.font.SysFont('Arial', 16)
+        self.font_title = get_font('Arial', 56, bold=True)
+        self.font_subtitle = get_font('Arial', 24)
+        self.font_button = get_font('Arial', 28, bold=True)
+        self.font_small = get_font('Arial', 18)
+        self.font_instructions = get_font('Arial', 16)
         
         self.selected_mode = None
+        self.num_players = num_players  # Players in the next match (humans or computers)
         
         # Animation variables
         self.time = 0
@@ -38,6 +58,10 @@ class Menu:
         self.button_1vcomputer_hard = pygame.Rect(center_x - button_width//2, start_y + 3*(button_height + button_spacing), button_width, button_height)
         self.button_quit = pygame.Rect(center_x - button_width//2, start_y + 4*(button_height + button_spacing), button_width, button_height)
         
+        # Player count selector above the mode buttons
+        self.button_fewer_players = pygame.Rect(center_x - button_width//2, start_y - 56, 44, 44)
+        self.button_more_players = pygame.Rect(center_x + button_width//2 - 44, start_y - 56, 44, 44)
+        
         # Colors
         self.bg_gradient_top = (25, 50, 25)
         self.bg_gradient_bottom = (15, 30, 15)
@@ -49,15 +73,51 @@ class Menu:
         self.text_button = (255, 255, 255)
         self.text_instruction = (180, 180, 180)
         self.instruction_bg = (30, 30, 30, 200)
+        
+        # Precomputed snake animation frames; the static background lives in the asset cache
+        self.snake_frames = self.build_snake_frames()
+
+    def build_gradient_background(self):
+        """Render the vertical gradient once into an off-screen surface"""
+        surface = pygame.Surface((self.width, self.height))
+        
+        if numpy is not None:
+            ratio = (numpy.arange(self.height) / self.height)[:, None]
+            top = numpy.array(self.bg_gradient_top)
+            bottom = numpy.array(self.bg_gradient_bottom)
+            column = (top * (1 - ratio) + bottom * ratio).astype(numpy.uint8)
+            # surfarray is indexed [x][y], so repeat the column across the width
+            pixels = numpy.repeat(column[None, :, :], self.width, axis=0)
+            pygame.surfarray.blit_array(surface, pixels)
+        else:
+            for y in range(self.height):
+                ratio = y / self.height
+                r = int(self.bg_gradient_top[0] * (1 - ratio) + self.bg_gradient_bottom[0] * ratio)
+                g = int(self.bg_gradient_top[1] * (1 - ratio) + self.bg_gradient_bottom[1] * ratio)
+                b = int(self.bg_gradient_top[2] * (1 - ratio) + self.bg_gradient_bottom[2] * ratio)
+                pygame.draw.line(surface, (r, g, b), (0, y), (self.width, y))
+        
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def build_snake_frames(self):
+        """Precompute the snake segment positions for every frame of one wave period"""
+        frames = []
+        for frame in range(SNAKE_PERIOD):
+            points = []
+            for i in range(5):
+                x = self.width - 80 - i * 15
+                y = 200 + math.sin(frame * SNAKE_PHASE_STEP + i * 0.5) * 10
+                points.append((int(x), int(y)))
+            frames.append(points)
+        return frames
 
     def draw_gradient_background(self):
         """Draw a gradient background"""
-        for y in range(self.height):
-            ratio = y / self.height
-            r = int(self.bg_gradient_top[0] * (1 - ratio) + self.bg_gradient_bottom[0] * ratio)
-            g = int(self.bg_gradient_top[1] * (1 - ratio) + self.bg_gradient_bottom[1] * ratio)
-            b = int(self.bg_gradient_top[2] * (1 - ratio) + self.bg_gradient_bottom[2] * ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (self.width, y))
+        background = self.assets.get_or_build(('menu', 'background', self.width, self.height),
+                                              self.build_gradient_background)
+        self.screen.blit(background, (0, 0))
 
     def draw_decorative_elements(self):
         """Draw decorative snake and ladder elements - adjusted for left side"""
@@ -65,14 +125,11 @@ class Menu:
         snake_color = (100, 200, 100)
         
         # Right side snake decoration (moved further right)
-        for i in range(5):
-            x = self.width - 80 - i * 15
-            y = 200 + math.sin(self.time * 0.05 + i * 0.5) * 10
-            pygame.draw.circle(self.screen, snake_color, (int(x), int(y)), 8)
+        points = self.snake_frames[self.time % SNAKE_PERIOD]
+        for i, point in enumerate(points):
+            pygame.draw.circle(self.screen, snake_color, point, 8)
             if i > 0:
-                prev_x = self.width - 80 - (i-1) * 15
-                prev_y = 200 + math.sin(self.time * 0.05 + (i-1) * 0.5) * 10
-                pygame.draw.line(self.screen, snake_color, (int(prev_x), int(prev_y)), (int(x), int(y)), 6)
+                pygame.draw.line(self.screen, snake_color, points[i - 1], point, 6)
         
         # Draw ladder decorations on the right side only
         ladder_color = (160, 120, 80)
@@ -92,22 +149,22 @@ class Menu:
         title_y = 100 + self.logo_bounce
         
         # Draw title shadow first
-        title_shadow = self.font_title.render("ULAR TANGGA", True, (100, 100, 0))
+        title_shadow = render_text(self.font_title, "ULAR TANGGA", (100, 100, 0))
         title_shadow_rect = title_shadow.get_rect(center=(self.width//2 + 3, title_y + 3))
         self.screen.blit(title_shadow, title_shadow_rect)
         
         # Draw main title
-        title_text = self.font_title.render("ULAR TANGGA", True, self.text_title)
+        title_text = render_text(self.font_title, "ULAR TANGGA", self.text_title)
         title_rect = title_text.get_rect(center=(self.width//2, title_y))
         self.screen.blit(title_text, title_rect)
         
         # Draw subtitle
-        subtitle_text = self.font_subtitle.render("Game Klasik Indonesia", True, self.text_subtitle)
+        subtitle_text = render_text(self.font_subtitle, "Game Klasik Indonesia", self.text_subtitle)
         subtitle_rect = subtitle_text.get_rect(center=(self.width//2, title_y + 50))
         self.screen.blit(subtitle_text, subtitle_rect)
         
         # Draw version info
-        version_text = self.font_small.render("Versi 2.0 - Pygame Edition", True, self.text_instruction)
+        version_text = render_text(self.font_small, "Versi 2.0 - Pygame Edition", self.text_instruction)
         version_rect = version_text.get_rect(center=(self.width//2, title_y + 75))
         self.screen.blit(version_text, version_rect)
 
@@ -133,18 +190,29 @@ class Menu:
         
         # Button text with icon
         full_text = f"{icon} {text}" if icon else text
-        text_surface = self.font_button.render(full_text, True, self.text_button)
+        text_surface = render_text(self.font_button, full_text, self.text_button)
         text_rect = text_surface.get_rect(center=button_rect.center)
         self.screen.blit(text_surface, text_rect)
         
         # Hover glow effect
         if is_hovered:
-            glow_surface = pygame.Surface((button_rect.width + 10, button_rect.height + 10))
-            glow_surface.set_alpha(50)
-            glow_surface.fill((255, 255, 255))
+            glow_surface = self.assets.translucent((button_rect.width + 10, button_rect.height + 10), (255, 255, 255), 50)
             glow_rect = glow_surface.get_rect(center=button_rect.center)
             self.screen.blit(glow_surface, glow_rect)
 
+    def draw_player_count(self, mouse_pos):
+        """Draw the player count selector"""
+        self.draw_button(self.button_fewer_players, "<", mouse_pos)
+        self.draw_button(self.button_more_players, ">", mouse_pos)
+        
+        count_text = render_text(self.font_small, f"Jumlah Pemain: {self.num_players}", self.text_subtitle)
+        center_x = (self.button_fewer_players.right + self.button_more_players.left) // 2
+        count_rect = count_text.get_rect(center=(center_x, self.button_fewer_players.centery))
+        self.screen.blit(count_text, count_rect)
+
+    def change_player_count(self, delta):
+        self.num_players = max(MIN_PLAYERS, min(self.num_players + delta, MAX_PLAYERS))
+
     def draw_instructions_left_side(self):
         """Draw enhanced game instructions on the left side"""
         instructions = [
@@ -178,17 +246,15 @@ class Menu:
         panel_height = 400
         
         # Create semi-transparent background
-        instruction_surface = pygame.Surface((panel_width, panel_height))
-        instruction_surface.set_alpha(180)
-        instruction_surface.fill((20, 20, 20))
+        instruction_surface = self.assets.translucent((panel_width, panel_height), (20, 20, 20), 180)
         self.screen.blit(instruction_surface, (panel_x, panel_y))
         
         # Draw border
         pygame.draw.rect(self.screen, (100, 150, 100), (panel_x, panel_y, panel_width, panel_height), 3, border_radius=10)
         
         # Draw title for instructions panel
-        title_font = pygame.font.SysFont('Arial', 20, bold=True)
-        title_text = title_font.render("📋 PANDUAN PERMAINAN", True, (255, 215, 0))
+        title_font = get_font('Arial', 20, bold=True)
+        title_text = render_text(title_font, "📋 PANDUAN PERMAINAN", (255, 215, 0))
         self.screen.blit(title_text, (panel_x + 15, panel_y + 15))
         
         # Draw instructions
@@ -201,17 +267,17 @@ class Menu:
                 
             # Determine font and color based on content
             if instruction.startswith("🤖") or instruction.startswith("🎮") or instruction.startswith("🎲") or instruction.startswith("⌨️"):
-                font = pygame.font.SysFont('Arial', 16, bold=True)
+                font = get_font('Arial', 16, bold=True)
                 color = (255, 255, 150)  # Yellow for headers
             elif instruction.startswith("   "):  # Indented text
-                font = pygame.font.SysFont('Arial', 14)
+                font = get_font('Arial', 14)
                 color = (200, 200, 200)  # Light gray for sub-items
                 instruction = instruction[3:]  # Remove indentation
             else:
-                font = pygame.font.SysFont('Arial', 15)
+                font = get_font('Arial', 15)
                 color = self.text_instruction
             
-            text_surface = font.render(instruction, True, color)
+            text_surface = render_text(font, instruction, color)
             text_y = start_y + i * line_height
             
             # Adjust X position for indented items
@@ -224,7 +290,7 @@ class Menu:
     def draw_footer(self):
         """Draw footer information"""
         footer_text = "Dibuat dengan ❤️ menggunakan Pygame | © 2024"
-        footer_surface = pygame.font.SysFont('Arial', 14).render(footer_text, True, (120, 120, 120))
+        footer_surface = render_text(get_font('Arial', 14), footer_text, (120, 120, 120))
         footer_rect = footer_surface.get_rect(center=(self.width//2, self.height - 20))
         self.screen.blit(footer_surface, footer_rect)
 
@@ -256,6 +322,7 @@ class Menu:
         mouse_pos = pygame.mouse.get_pos()
         
         # Draw buttons (now positioned more to the right)
+        self.draw_player_count(mouse_pos)
         self.draw_button(self.button_1v1, "Pemain vs Pemain", mouse_pos, "👥")
         self.draw_button(self.button_1vcomputer_easy, "vs Komputer (Mudah)", mouse_pos, "🤖😊")
         self.draw_button(self.button_1vcomputer_medium, "vs Komputer (Sedang)", mouse_pos, "🤖😐")
@@ -267,9 +334,11 @@ class Menu:
         
         pygame.display.flip()
 
-    def handle_events(self):
+    def handle_events(self, events=None):
         """Handle user input events"""
-        for event in pygame.event.get():
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -284,6 +353,10 @@ class Menu:
                 if event.key in key_to_mode:
                     self.selected_mode = key_to_mode[event.key]
                     return True
+                elif event.key in (pygame.K_LEFT, pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.change_player_count(-1)
+                elif event.key in (pygame.K_RIGHT, pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                    self.change_player_count(1)
                 elif event.key == pygame.K_ESCAPE or event.key == pygame.K_q:
                     pygame.quit()
                     sys.exit()
@@ -292,7 +365,11 @@ class Menu:
                     mouse_pos = pygame.mouse.get_pos()
                     
                     # Check each button individually
-                    if self.button_1v1.collidepoint(mouse_pos):
+                    if self.button_fewer_players.collidepoint(mouse_pos):
+                        self.change_player_count(-1)
+                    elif self.button_more_players.collidepoint(mouse_pos):
+                        self.change_player_count(1)
+                    elif self.button_1v1.collidepoint(mouse_pos):
                         self.selected_mode = "1v1"
                         return True
                     elif self.button_1vcomputer_easy.collidepoint(mouse_pos):
@@ -310,9 +387,17 @@ class Menu:
         return False
 
     def run(self):
-        """Main menu loop"""
+        """Main menu loop; can be run again each time the menu is shown"""
+        self.selected_mode = None
+        drawn = False
         while True:
-            if self.handle_events():
+            # Animate at 60 FPS while focused, otherwise sleep until the next event;
+            # the first frame is always drawn right away, focused or not
+            events = self.idle_scheduler.wait(window_focused() or not drawn)
+            if self.handle_events(events):
                 return self.selected_mode
             self.draw()
-            self.clock.tick(60)  # 60 FPS for smooth animations
\ No newline at end of file
+            drawn = True
+            if self.on_first_frame is not None:
+                self.on_first_frame()
+                self.on_first_frame = None
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import queue
+import threading
+
+from server import MAX_LINE
+
+# Match Server Client
+# Talks to server.py from a background thread running its own asyncio loop, so
+# the game loop never waits on the network. Requests are handed to the loop
+# with call_soon_threadsafe; server messages come back through a SimpleQueue
+# that the game drains once per frame with poll(). An optional wake callback
+# runs after each message (the game posts a pygame event from it) so an idle
+# game loop blocked on its event queue notices.
+#
+# Besides the server's own messages the inbox carries {"op": "connected"} and
+# {"op": "disconnected", "message": ...}.
+
+
+class MatchClient:
+    """Connection to a match server, served by a background thread"""
+
+    def __init__(self, host, port, wake=None):
+        self.host = host
+        self.port = port
+        self.wake = wake  # Called on the network thread after each message
+        self.inbox = queue.SimpleQueue()
+        self.outbox = []  # Requests made before the connection is up
+        self.writer = None
+        self.loop = asyncio.new_event_loop()
+        self.task = self.loop.create_task(self.receive())
+        self.thread = threading.Thread(target=self.run, name="match-client", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.close()
+
+    async def receive(self):
+        try:
+            reader, self.writer = await asyncio.open_connection(self.host, self.port, limit=MAX_LINE)
+            self.deliver({'op': 'connected'})
+            for data in self.outbox:
+                self.writer.write(data)
+            self.outbox = []
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    self.deliver(json.loads(line))
+                except ValueError:
+                    continue  # Not JSON; ignore it
+            self.deliver({'op': 'disconnected', 'message': "Server menutup koneksi"})
+        except (OSError, ValueError) as error:
+            self.deliver({'op': 'disconnected', 'message': str(error) or type(error).__name__})
+        finally:
+            if self.writer is not None:
+                self.writer.close()
+
+    def deliver(self, message):
+        self.inbox.put(message)
+        if self.wake is not None:
+            self.wake()
+
+    def send(self, payload):
+        """Queue a request for the server; never blocks"""
+        data = json.dumps(payload, separators=(',', ':')).encode('utf-8') + b'\n'
+        try:
+            self.loop.call_soon_threadsafe(self.write, data)
+        except RuntimeError:
+            pass  # Loop already closed: the connection is gone
+
+    def write(self, data):
+        # Runs on the network thread
+        if self.writer is None:
+            self.outbox.append(data)
+        elif not self.writer.is_closing():
+            self.writer.write(data)
+
+    def poll(self):
+        """Messages received since the last call, oldest first"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.inbox.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def close(self):
+        """Drop the connection (the server treats it as leaving) and stop the thread"""
+        try:
+            self.loop.call_soon_threadsafe(self.task.cancel)
+        except RuntimeError:
+            pass
+        self.thread.join(timeout=1.0)
@@ -0,0 +1,272 @@
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+
+from engine import GameState
+from rng import MatchRNG
+from utils import data_dir
+
+# Match Replays
+# A replay stores what is needed to re-run a match through the engine: the
+# board's spec hash, the RNG seed, the player roster and one 3-bit value per
+# turn (the dice value 1-6, or 0 when a seat was skipped). Positions are
+# never stored; they are rebuilt on load and kept as periodic keyframes so any
+# turn can be reached in a bounded number of steps.
+#
+# File layout (little endian):
+#   header   '<4sBB32sQI': magic, version, flags, spec hash, seed, turn count
+#   mode     length-prefixed UTF-8 game mode
+#   roster   player count, then per player: kind index, length-prefixed UTF-8 name
+#   turns    3 bits per turn, packed least significant bit first
+#
+# Archives (.utra) bundle many replays, e.g. one per month: the magic b'UTRA'
+# followed by records of a '<I' byte length and the replay bytes. They are read
+# through mmap one record at a time, so an archive never has to fit in memory.
+
+REPLAY_MAGIC = b'UTR1'
+REPLAY_VERSION = 1
+REPLAY_HEADER = struct.Struct('<4sBB32sQI')
+FLAG_SEEDED = 1
+
+PASS = 0  # Turn value of a seat skipped without a roll (a player who left an online match)
+PLAYER_KINDS = ("human", "computer", "easy", "medium", "hard")
+KEYFRAME_INTERVAL = 64  # Turns between stored positions when seeking
+
+ARCHIVE_MAGIC = b'UTRA'
+ARCHIVE_RECORD = struct.Struct('<I')
+
+# positions: tuple of squares per seat, current: seat to move next, winner: seat or None
+ReplayFrame = namedtuple('ReplayFrame', 'turn positions current winner')
+
+
+class ReplayError(ValueError):
+    """Raised when a replay file is malformed or does not match its board"""
+
+
+def pack_turns(turns):
+    """Pack turn values (0-7) at 3 bits each"""
+    packed = bytearray()
+    for start in range(0, len(turns), 8):
+        # 8 turns fill exactly 3 bytes
+        chunk = 0
+        for offset, value in enumerate(turns[start:start + 8]):
+            chunk |= value << (3 * offset)
+        packed += chunk.to_bytes(3, 'little')
+    return bytes(packed[:(len(turns) * 3 + 7) // 8])
+
+
+def unpack_turns(data, count):
+    """Inverse of pack_turns"""
+    if len(data) < (count * 3 + 7) // 8:
+        raise ReplayError("Replay ends before its last turn")
+    data = bytes(data) + bytes(3)  # Pad the last group
+    turns = bytearray(count)
+    for start in range(0, count, 8):
+        chunk = int.from_bytes(data[start // 8 * 3:start // 8 * 3 + 3], 'little')
+        for offset in range(min(8, count - start)):
+            turns[start + offset] = (chunk >> (3 * offset)) & 7
+    return turns
+
+
+class Replay:
+    """Recorded turns of one match"""
+
+    def __init__(self, spec_hash, roster, seed=None, game_mode="", turns=b''):
+        self.spec_hash = spec_hash  # Hex digest of the board spec (see board_spec.spec_hash)
+        self.roster = list(roster)  # (name, kind) per seat, kind from PLAYER_KINDS
+        self.seed = seed
+        self.game_mode = game_mode
+        self.turns = bytearray(turns)
+        self.saved_path = None  # Set once the replay has been written to disk
+
+    def record(self, dice):
+        """Append one turn: the dice value, or PASS"""
+        if not 0 <= dice <= 6:
+            raise ReplayError(f"Invalid turn value: {dice}")
+        self.turns.append(dice)
+
+    def to_bytes(self):
+        flags = FLAG_SEEDED if self.seed is not None else 0
+        parts = [REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, flags, bytes.fromhex(self.spec_hash),
+                                    self.seed or 0, len(self.turns)),
+                 _pack_text(self.game_mode),
+                 bytes([len(self.roster)])]
+        for name, kind in self.roster:
+            parts.append(bytes([PLAYER_KINDS.index(kind)]))
+            parts.append(_pack_text(name))
+        parts.append(pack_turns(self.turns))
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        try:
+            magic, version, flags, digest, seed, count = REPLAY_HEADER.unpack_from(data)
+        except struct.error as error:
+            raise ReplayError("Replay header is truncated") from error
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ReplayError("Not a replay file (or an unsupported version)")
+
+        offset = REPLAY_HEADER.size
+        game_mode, offset = _unpack_text(data, offset)
+        roster = []
+        try:
+            players = data[offset]
+            offset += 1
+            for _ in range(players):
+                kind = PLAYER_KINDS[data[offset]]
+                name, offset = _unpack_text(data, offset + 1)
+                roster.append((name, kind))
+        except IndexError as error:
+            raise ReplayError("Replay roster is truncated or invalid") from error
+
+        turns = unpack_turns(data[offset:], count)
+        if any(value > 6 for value in turns):
+            raise ReplayError("Replay contains an invalid turn value")
+        return cls(digest.hex(), roster, seed if flags & FLAG_SEEDED else None, game_mode, turns)
+
+    def save(self, path=None):
+        """Write the replay (to a new file in the replays directory by default) and return its path"""
+        if path is None:
+            stem = os.path.join(data_dir('replays'), time.strftime('%Y%m%d-%H%M%S'))
+            path = stem + '.utr'
+            suffix = 1
+            while os.path.exists(path):
+                suffix += 1
+                path = f"{stem}-{suffix}.utr"
+        with open(path, 'wb') as replay_file:
+            replay_file.write(self.to_bytes())
+        self.saved_path = path
+        return path
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'rb') as replay_file:
+                return cls.from_bytes(replay_file.read())
+        except OSError as error:
+            raise ReplayError(f"{path}: {error}") from error
+
+
+def write_archive(replays, path):
+    """Write replays into one archive file; returns how many were written"""
+    count = 0
+    with open(path, 'wb') as archive:
+        archive.write(ARCHIVE_MAGIC)
+        for replay in replays:
+            data = replay.to_bytes()
+            archive.write(ARCHIVE_RECORD.pack(len(data)))
+            archive.write(data)
+            count += 1
+    return count
+
+
+def iter_archive(path, errors=None):
+    """Yield the replays of an archive in order, reading it through mmap.
+
+    With an `errors` Counter, a malformed record is counted as 'unreadable'
+    and skipped; the records after it are still read. Without one it raises.
+    """
+    try:
+        with open(path, 'rb') as archive:
+            if os.fstat(archive.fileno()).st_size < len(ARCHIVE_MAGIC):
+                raise ReplayError(f"{path}: not a replay archive")
+            with mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC:
+                    raise ReplayError(f"{path}: not a replay archive")
+                offset = len(ARCHIVE_MAGIC)
+                while offset < len(data):
+                    if offset + ARCHIVE_RECORD.size > len(data):
+                        raise ReplayError(f"{path}: archive ends inside a record")
+                    length, = ARCHIVE_RECORD.unpack_from(data, offset)
+                    offset += ARCHIVE_RECORD.size
+                    if offset + length > len(data):
+                        raise ReplayError(f"{path}: archive ends inside a record")
+                    record = data[offset:offset + length]  # Copies just this record
+                    offset += length
+                    try:
+                        replay = Replay.from_bytes(record)
+                    except ReplayError:
+                        if errors is None:
+                            raise
+                        errors['unreadable'] += 1
+                        continue
+                    yield replay
+    except OSError as error:
+        raise ReplayError(f"{path}: {error}") from error
+
+
+class ReplayIndex:
+    """Re-runs a replay on its board once and keeps keyframes for fast seeking"""
+
+    def __init__(self, replay, layout, interval=KEYFRAME_INTERVAL):
+        if layout.spec_hash != replay.spec_hash:
+            raise ReplayError("Replay was recorded on a different board")
+        self.replay = replay
+        self.interval = interval
+        if replay.seed is not None:
+            self.check_seed()
+        self.state = GameState(len(replay.roster), layout.squares, layout.cells, layout.jump)
+        self.turn = 0  # Turns (rolls and passes) applied to self.state
+        self.keyframes = [self.snapshot()]
+        for value in replay.turns:
+            self.step(value)
+            if self.turn % interval == 0:
+                self.keyframes.append(self.snapshot())
+
+    def check_seed(self):
+        """Recorded dice must be the seed's roll stream, in order (passes consume no roll)"""
+        rng = MatchRNG(self.replay.seed)
+        for turn, value in enumerate(self.replay.turns, 1):
+            if value != PASS and value != rng.roll():
+                raise ReplayError(f"Turn {turn} does not match the replay's seed")
+
+    @property
+    def turn_count(self):
+        return len(self.replay.turns)
+
+    def snapshot(self):
+        state = self.state
+        return ReplayFrame(self.turn, tuple(state.positions), state.current, state.winner)
+
+    def step(self, value):
+        """Apply one recorded turn to self.state"""
+        state = self.state
+        if state.game_over:
+            raise ReplayError("Replay continues after the game was won")
+        if value == PASS:
+            state.advance_turn()
+        else:
+            state.apply_roll(value)
+        self.turn += 1
+
+    def frame_at(self, turn):
+        """Positions after `turn` turns, replaying at most interval - 1 turns from a keyframe"""
+        turn = max(0, min(turn, self.turn_count))
+        keyframe = self.keyframes[turn // self.interval]
+        state = self.state
+        state.positions[:] = keyframe.positions
+        state.current = keyframe.current
+        state.winner = keyframe.winner
+        self.turn = keyframe.turn
+        for value in self.replay.turns[keyframe.turn:turn]:
+            self.step(value)
+        return self.snapshot()
+
+
+def _pack_text(text):
+    # Cut at 255 bytes without splitting a multi-byte character
+    encoded = text.encode('utf-8')[:255].decode('utf-8', 'ignore').encode('utf-8')
+    return bytes([len(encoded)]) + encoded
+
+
+def _unpack_text(data, offset):
+    try:
+        length = data[offset]
+        text = bytes(data[offset + 1:offset + 1 + length]).decode('utf-8')
+    except (IndexError, UnicodeDecodeError) as error:
+        raise ReplayError("Replay text field is truncated or invalid") from error
+    if offset + 1 + length > len(data):
+        raise ReplayError("Replay text field is truncated")
+    return text, offset + 1 + length
@@ -0,0 +1,280 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from engine import GameState, START_SQUARE
+from board_spec import load_board, spec_paths
+from replay import Replay, ReplayError, PASS, iter_archive, write_archive
+from utils import data_dir
+
+# Replay Analytics
+# Streams saved replays (loose .utr files and .utra archives) through a set of
+# aggregators in one pass. Each replay is re-run with the engine, giving the
+# same MoveResult per roll that Game.move_player works with; every aggregator
+# sees that move list and keeps only running counts, so memory does not grow
+# with the number of games. Inputs are split into shards (each archive, and
+# groups of loose files) that worker processes handle in parallel; the
+# partial aggregates are merged at the end. The board spec files are hashed
+# once up front and every worker gets the resulting map.
+
+SHARD_FILES = 500  # Loose replay files per shard
+COMEBACK_DEFICIT = 0.25  # Winner trailed the leader by this share of the board
+
+
+class LandingHeatmap:
+    """Squares rolls land on, before snakes and ladders move the token, per board"""
+    name = 'heatmap'
+
+    def __init__(self):
+        self.squares = {}  # spec hash -> Counter of landing squares
+
+    def add(self, replay, moves):
+        counts = self.squares.setdefault(replay.spec_hash, Counter())
+        counts.update(move.landing for move in moves)
+
+    def merge(self, other):
+        for digest, counts in other.squares.items():
+            self.squares.setdefault(digest, Counter()).update(counts)
+
+    def report(self, boards, top=10):
+        lines = []
+        for digest, counts in self.squares.items():
+            total = sum(counts.values())
+            lines.append(f"Kotak paling sering didarati ({board_name(boards, digest)}, {total:,} lemparan):")
+            for square, hits in counts.most_common(top):
+                lines.append(f"  {square:>5}: {hits / total:.2%}")
+        return lines
+
+
+class JumpRates:
+    """How often rolls hit a snake or a ladder, and which ones"""
+    name = 'jumps'
+
+    def __init__(self):
+        self.rolls = 0
+        self.kinds = Counter()  # 'ladder' / 'snake' -> hits
+        self.starts = {}  # spec hash -> Counter of (kind, square landed on)
+
+    def add(self, replay, moves):
+        starts = self.starts.setdefault(replay.spec_hash, Counter())
+        self.rolls += len(moves)
+        for move in moves:
+            if move.jump is not None:
+                self.kinds[move.jump] += 1
+                starts[move.jump, move.landing] += 1
+
+    def merge(self, other):
+        self.rolls += other.rolls
+        self.kinds.update(other.kinds)
+        for digest, starts in other.starts.items():
+            self.starts.setdefault(digest, Counter()).update(starts)
+
+    def report(self, boards, top=5):
+        rolls = max(self.rolls, 1)
+        lines = [f"Dari {self.rolls:,} lemparan: tangga {self.kinds['ladder'] / rolls:.2%}, "
+                 f"ular {self.kinds['snake'] / rolls:.2%}"]
+        for digest, starts in self.starts.items():
+            for kind, label in (('ladder', "Tangga"), ('snake', "Ular")):
+                hits = [(square, count) for (jump, square), count in starts.most_common() if jump == kind][:top]
+                if hits:
+                    listed = ", ".join(f"{square} ({count / rolls:.2%})" for square, count in hits)
+                    lines.append(f"  {label} tersering ({board_name(boards, digest)}): {listed}")
+        return lines
+
+
+class Comebacks:
+    """Wins by a player who was far behind the leader at some point"""
+    name = 'comebacks'
+
+    def __init__(self):
+        self.games = 0
+        self.decided = 0
+        self.comebacks = 0
+        self.largest = 0  # Largest deficit (in squares) a winner overcame
+        self.deficits = Counter()  # Winner's worst deficit, in tenths of the board
+
+    def add(self, replay, moves):
+        self.games += 1
+        if not moves or not moves[-1].won:
+            return
+        winner = moves[-1].player
+        positions = [START_SQUARE] * len(replay.roster)
+        final_square = moves[-1].position
+        worst = 0
+        for move in moves:
+            positions[move.player] = move.position
+            worst = max(worst, max(positions) - positions[winner])
+        self.decided += 1
+        self.comebacks += worst >= COMEBACK_DEFICIT * final_square
+        self.largest = max(self.largest, worst)
+        self.deficits[min(9, worst * 10 // final_square)] += 1
+
+    def merge(self, other):
+        self.games += other.games
+        self.decided += other.decided
+        self.comebacks += other.comebacks
+        self.largest = max(self.largest, other.largest)
+        self.deficits.update(other.deficits)
+
+    def report(self, boards):
+        decided = max(self.decided, 1)
+        lines = [f"{self.decided:,} dari {self.games:,} permainan selesai; "
+                 f"{self.comebacks / decided:.2%} dimenangkan setelah tertinggal "
+                 f"≥{COMEBACK_DEFICIT:.0%} papan (terjauh {self.largest} kotak)"]
+        for tenth in sorted(self.deficits):
+            lines.append(f"  tertinggal {tenth * 10:>2}-{tenth * 10 + 9}% papan: "
+                         f"{self.deficits[tenth] / decided:.2%}")
+        return lines
+
+
+AGGREGATORS = {aggregator.name: aggregator for aggregator in (LandingHeatmap, JumpRates, Comebacks)}
+
+
+def board_name(boards, digest):
+    return boards.get(digest) or digest[:12]
+
+
+def replay_moves(replay, board, squares):
+    """MoveResult per roll of a replay (passes only hand the turn on)"""
+    state = GameState(len(replay.roster), squares, board.cells, board.jump)
+    moves = []
+    for value in replay.turns:
+        if state.game_over:
+            raise ReplayError("Replay continues after the game was won")
+        if value == PASS:
+            state.advance_turn()
+        else:
+            moves.append(state.apply_roll(value))
+    return moves
+
+
+def find_inputs(paths):
+    """Replay files and archives named directly or found in directories"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(sorted(glob.glob(os.path.join(path, '*.utr')) + glob.glob(os.path.join(path, '*.utra'))))
+        else:
+            found.append(path)
+    return found
+
+
+def make_shards(paths, shard_files=SHARD_FILES):
+    """Each archive is its own shard; loose replay files are grouped"""
+    archives = [[path] for path in paths if path.endswith('.utra')]
+    loose = [path for path in paths if not path.endswith('.utra')]
+    return archives + [loose[start:start + shard_files] for start in range(0, len(loose), shard_files)]
+
+
+def iter_replays(paths, errors):
+    """Replays from files and archives, one at a time.
+
+    `errors` counts the replays 'read' and the 'unreadable' ones skipped; a bad
+    archive record only skips that record.
+    """
+    for path in paths:
+        try:
+            if path.endswith('.utra'):
+                for replay in iter_archive(path, errors):
+                    errors['read'] += 1
+                    yield replay
+            else:
+                replay = Replay.load(path)
+                errors['read'] += 1
+                yield replay
+        except ReplayError:
+            errors['unreadable'] += 1
+
+
+def iter_games(replays, errors, boards, specs):
+    """(replay, moves) for every replay whose board is in `specs` (spec file path by hash)"""
+    for replay in replays:
+        if replay.spec_hash not in boards:
+            spec = specs.get(replay.spec_hash)
+            board = load_board(spec) if spec else None
+            boards[replay.spec_hash] = (board, board.squares) if board else None
+        known = boards[replay.spec_hash]
+        if known is None:
+            errors['unknown board'] += 1
+            continue
+        try:
+            yield replay, replay_moves(replay, *known)
+        except ReplayError:
+            errors['invalid'] += 1
+
+
+def process_shard(task):
+    """Worker entry point: run the named aggregators over one shard"""
+    paths, names, specs = task
+    aggregators = [AGGREGATORS[name]() for name in names]
+    counts = Counter()  # 'games' analyzed, replays 'read', plus skipped replays by reason
+    boards = {}
+    for replay, moves in iter_games(iter_replays(paths, counts), counts, boards, specs):
+        counts['games'] += 1
+        for aggregator in aggregators:
+            aggregator.add(replay, moves)
+    board_names = {digest: known[0].name for digest, known in boards.items() if known}
+    return aggregators, counts, board_names
+
+
+def analyze(paths, names=tuple(AGGREGATORS), workers=None, specs=None):
+    """Run the aggregators over every shard in parallel and merge the results.
+
+    `specs` maps spec hashes to board spec files (the bundled boards by
+    default). Returns (aggregators, counts, board names by spec hash).
+    """
+    if specs is None:
+        specs = spec_paths()
+    tasks = [(shard, names, specs) for shard in make_shards(find_inputs(paths))]
+    merged = [AGGREGATORS[name]() for name in names]
+    counts = Counter()
+    boards = {}
+    if not tasks:
+        return merged, counts, boards
+    with Pool(processes=min(workers or os.cpu_count(), len(tasks))) as pool:
+        for aggregators, shard_counts, shard_boards in pool.imap_unordered(process_shard, tasks):
+            for total, partial in zip(merged, aggregators):
+                total.merge(partial)
+            counts.update(shard_counts)
+            boards.update(shard_boards)
+    return merged, counts, boards
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistics over saved Ular Tangga replays")
+    parser.add_argument('inputs', nargs='*', help="replay files, .utra archives or directories "
+                                                  "(the replays directory by default)")
+    parser.add_argument('--only', action='append', choices=sorted(AGGREGATORS), help="aggregator to run (repeatable)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--pack', metavar='ARCHIVE', default=None,
+                        help="bundle the inputs into one .utra archive instead of analyzing them")
+    args = parser.parse_args()
+
+    inputs = args.inputs or [data_dir('replays')]
+    if args.pack:
+        errors = Counter()
+        count = write_archive(iter_replays(find_inputs(inputs), errors), args.pack)
+        print(f"{count:,} replays written to {args.pack}" +
+              (f" ({errors['unreadable']} unreadable skipped)" if errors['unreadable'] else ""))
+        return
+
+    started = time.perf_counter()
+    aggregators, counts, boards = analyze(inputs, tuple(args.only or AGGREGATORS), args.workers)
+    games = counts.pop('games', 0)
+    read = counts.pop('read', 0)
+    if not games:
+        sys.exit("No replays found" + (f" ({counts['unreadable']} unreadable)" if counts['unreadable'] else ""))
+    for aggregator in aggregators:
+        print("\n".join(aggregator.report(boards)))
+        print()
+    skipped = ", ".join(f"{count} {reason}" for reason, count in counts.items())
+    print(f"{games:,} replays analyzed ({read:,} read) in {time.perf_counter() - started:.2f} s" +
+          (f" (skipped: {skipped})" if skipped else ""))
+
+
+if __name__ == "__main__":
+    main()
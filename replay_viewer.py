@@ -0,0 +1,283 @@
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pygame
+
+from board import Board
+from player import Player, player_color
+from engine import GameState
+from fonts import get_font, render_text
+from scheduler import IdleScheduler
+from board_spec import find_spec
+from replay import Replay, ReplayIndex, ReplayError, PASS
+from utils import data_dir
+
+# Replay Viewer
+# Shows a saved match with the game's Board and Player renderers. Turns are
+# looked up through ReplayIndex keyframes, so jumping anywhere is instant and
+# playback speed does not depend on the 30-frame dice animation.
+
+MIN_SPEED = 0.25   # Turns per second
+MAX_SPEED = 1024.0
+CONTROLS = [
+    "Spasi: putar / jeda",
+    "← →: mundur / maju 1 giliran",
+    "PgUp PgDn: 10 giliran",
+    "Home End: awal / akhir",
+    "↑ ↓: kecepatan x2 / ÷2",
+    "R: balik arah",
+    "Klik garis waktu: lompat",
+    "H: peta panas",
+]
+
+
+class ReplayViewer:
+    def __init__(self, screen, replay, board_path):
+        self.screen = screen
+        self.idle_scheduler = IdleScheduler(fps=60)
+        self.replay = replay
+        self.board = Board(board_path)
+        self.index = ReplayIndex(replay, self.board.layout)
+
+        # Display state the Player renderers read their positions from
+        self.state = GameState(len(replay.roster), self.board.squares, self.board.final_square, self.board.jump)
+        self.players = [Player(name, player_color(index), is_computer=kind != "human")
+                        for index, (name, kind) in enumerate(replay.roster)]
+        for index, player in enumerate(self.players):
+            player.bind(self.state, index)
+
+        self.cursor = 0.0  # Fractional turn while playing
+        self.speed = 4.0
+        self.direction = 1
+        self.playing = False
+        self.seeking = False  # Dragging on the timeline
+        self.dragging = False  # Right mouse button drags the board
+        self.turn = None
+        self.last_value = None
+        self.message = ""
+        self.drawn = None  # What the screen currently shows, to skip identical frames
+        self.timeline_rect = pygame.Rect(30, 662, 1050, 20)
+        self.show_turn(0)
+
+    def show_turn(self, turn):
+        """Load the positions after `turn` turns into the display state"""
+        turn = max(0, min(turn, self.index.turn_count))
+        if turn == self.turn:
+            return
+        self.turn = turn
+        if turn == 0:
+            frame = self.index.frame_at(0)
+            self.last_value = None
+            self.message = "Awal permainan"
+        else:
+            before = self.index.frame_at(turn - 1)
+            value = self.replay.turns[turn - 1]
+            self.index.step(value)
+            frame = self.index.snapshot()
+            seat = before.current
+            mover = self.players[seat]
+            self.last_value = value
+            if value == PASS:
+                self.message = f"{mover.name} dilewati (keluar dari pertandingan)"
+            else:
+                self.message = f"{mover.name}: {before.positions[seat]} → {frame.positions[seat]}"
+            self.board.follow(frame.positions[seat])
+
+        self.state.positions[:] = frame.positions
+        self.state.current = frame.current
+        self.state.winner = frame.winner
+        if frame.winner is not None:
+            self.message += f" | {self.players[frame.winner].name} menang!"
+
+    def seek(self, turn):
+        self.cursor = float(max(0, min(turn, self.index.turn_count)))
+        self.show_turn(int(self.cursor))
+
+    def update(self, elapsed):
+        if not self.playing:
+            return
+        self.cursor += self.direction * self.speed * elapsed
+        if not 0 <= self.cursor <= self.index.turn_count:
+            self.playing = False  # Stop at either end
+        self.seek(self.cursor)
+
+    def handle_input(self, events):
+        camera = self.board.camera
+        for event in events:
+            if event.type == pygame.QUIT:
+                return "quit"
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.ACTIVEEVENT):
+                self.drawn = None
+            elif event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_ESCAPE, pygame.K_q):
+                    return "quit"
+                elif event.key == pygame.K_SPACE:
+                    if not self.playing and self.turn in (0, self.index.turn_count):
+                        # Restart from the end the playback direction starts at
+                        self.direction = 1 if self.turn == 0 else -1
+                    self.playing = not self.playing
+                elif event.key in (pygame.K_RIGHT, pygame.K_LEFT, pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                    steps = {pygame.K_RIGHT: 1, pygame.K_LEFT: -1, pygame.K_PAGEUP: 10, pygame.K_PAGEDOWN: -10}
+                    self.playing = False
+                    self.seek(self.turn + steps[event.key])
+                elif event.key == pygame.K_HOME:
+                    self.seek(0)
+                elif event.key == pygame.K_END:
+                    self.seek(self.index.turn_count)
+                elif event.key == pygame.K_UP:
+                    self.speed = min(self.speed * 2, MAX_SPEED)
+                elif event.key == pygame.K_DOWN:
+                    self.speed = max(self.speed / 2, MIN_SPEED)
+                elif event.key == pygame.K_r:
+                    self.direction = -self.direction
+                elif event.key == pygame.K_h:
+                    self.board.toggle_overlay()
+            elif event.type == pygame.MOUSEWHEEL:
+                mouse_pos = pygame.mouse.get_pos()
+                if camera.viewport.collidepoint(mouse_pos):
+                    camera.zoom_by(event.y, mouse_pos)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button == 1 and self.timeline_rect.collidepoint(event.pos):
+                    self.seeking = True
+                    self.seek_to_pointer(event.pos[0])
+                elif event.button == 3 and camera.viewport.collidepoint(event.pos):
+                    self.dragging = True
+            elif event.type == pygame.MOUSEBUTTONUP:
+                if event.button == 1:
+                    self.seeking = False
+                elif event.button == 3:
+                    self.dragging = False
+            elif event.type == pygame.MOUSEMOTION:
+                if self.seeking:
+                    self.seek_to_pointer(event.pos[0])
+                elif self.dragging:
+                    camera.scroll(-event.rel[0], -event.rel[1])
+        return None
+
+    def seek_to_pointer(self, x):
+        """Jump to the turn under the mouse on the timeline"""
+        fraction = (x - self.timeline_rect.x) / self.timeline_rect.width
+        self.playing = False
+        self.seek(round(fraction * self.index.turn_count))
+
+    def draw(self):
+        """Draw the frame if anything visible changed"""
+        key = (self.turn, self.board.camera.state, self.board.overlay, self.playing, self.speed, self.direction)
+        if key == self.drawn:
+            return
+        self.drawn = key
+
+        self.screen.fill((34, 139, 34))
+        board_bg = pygame.Rect(30, 30, 820, 620)
+        pygame.draw.rect(self.screen, (0, 80, 0), board_bg)
+        pygame.draw.rect(self.screen, (255, 255, 255), board_bg, 2)
+        self.board.draw(self.screen)
+        for player in self.players:
+            if player.get_draw_rect(self.board).colliderect(self.board.camera.viewport):
+                player.draw(self.screen, self.board)
+
+        self.draw_panel()
+        self.draw_timeline()
+        pygame.display.flip()
+
+    def draw_panel(self):
+        """Right panel: turn counter, playback state, last move and positions"""
+        panel = pygame.Rect(860, 30, 220, 620)
+        pygame.draw.rect(self.screen, (40, 40, 40), panel)
+        pygame.draw.rect(self.screen, (255, 255, 255), panel, 2)
+        x = 870
+
+        lines = [
+            (get_font('Arial', 20, bold=True), "REPLAY", (255, 255, 255)),
+            (get_font('Arial', 14), f"Papan: {self.board.layout.name}", (200, 200, 200)),
+            (get_font('Arial', 16, bold=True), f"Giliran {self.turn} / {self.index.turn_count}", (255, 255, 255)),
+            (get_font('Arial', 14), f"{'Putar' if self.playing else 'Jeda'} | "
+                                    f"{'maju' if self.direction > 0 else 'mundur'} {self.speed:g} giliran/detik",
+             (200, 200, 200)),
+        ]
+        if self.last_value:
+            lines.append((get_font('Arial', 16, bold=True), f"Dadu: {self.last_value}", (255, 255, 0)))
+        lines.append((get_font('Arial', 14), self.message, (255, 255, 255)))
+
+        y = 40
+        for font, text, color in lines:
+            surface = render_text(font, text, color)
+            self.screen.blit(surface, (x, y), pygame.Rect(0, 0, 200, surface.get_height()))
+            y += surface.get_height() + 6
+
+        # Positions, current player highlighted
+        y += 6
+        row_height = max(14, min(22, (430 - y) // max(1, len(self.players))))
+        font = get_font('Arial', 14 if row_height >= 18 else 12)
+        for seat, player in enumerate(self.players[:(430 - y) // row_height]):
+            color = player.color if seat == self.state.current else (200, 200, 200)
+            surface = render_text(font, f"{player.name}: {player.position}", color)
+            self.screen.blit(surface, (x, y))
+            y += row_height
+
+        font = get_font('Arial', 12)
+        for row, text in enumerate(CONTROLS):
+            self.screen.blit(render_text(font, text, (160, 160, 160)), (x, 500 + row * 18))
+
+    def draw_timeline(self):
+        rect = self.timeline_rect
+        pygame.draw.rect(self.screen, (40, 40, 40), rect)
+        if self.index.turn_count:
+            filled = rect.copy()
+            filled.width = round(rect.width * self.turn / self.index.turn_count)
+            pygame.draw.rect(self.screen, (255, 215, 0), filled)
+        pygame.draw.rect(self.screen, (255, 255, 255), rect, 1)
+
+    def run(self):
+        last = time.monotonic()
+        while True:
+            events = self.idle_scheduler.wait(self.playing or self.seeking)
+            now = time.monotonic()
+            result = self.handle_input(events)
+            if result:
+                return result
+            self.update(now - last)
+            last = now
+            self.draw()
+
+
+def latest_replay():
+    """Most recently saved replay, or None"""
+    paths = glob.glob(os.path.join(data_dir('replays'), '*.utr'))
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a saved Ular Tangga replay")
+    parser.add_argument('replay', nargs='?', default=None, help="replay file (the latest one by default)")
+    parser.add_argument('--board', default=None, help="board spec file, found by its hash in boards/ by default")
+    args = parser.parse_args()
+
+    path = args.replay or latest_replay()
+    if path is None:
+        sys.exit("No replays saved yet")
+    try:
+        replay = Replay.load(path)
+    except ReplayError as error:
+        sys.exit(f"Cannot read replay: {error}")
+    board_path = args.board or find_spec(replay.spec_hash)
+    if board_path is None:
+        sys.exit("Board of this replay not found; pass its spec with --board")
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((1100, 700))
+    pygame.display.set_caption("Ular Tangga - Replay")
+    try:
+        ReplayViewer(screen, replay, board_path).run()
+    except ReplayError as error:
+        print(f"Cannot play replay: {error}")
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
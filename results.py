@@ -0,0 +1,206 @@
+import argparse
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from utils import data_dir
+
+# Match Results Store
+# Finished matches are kept in an SQLite database (WAL mode) in the data
+# directory. record() only queues the row; a background thread writes whatever
+# has queued up in one transaction, so a busy simulation commits large batches
+# while a single interactive match is written right away. Reads use their own
+# connection, which WAL lets run alongside the writer.
+
+BATCH_SIZE = 5000  # Most rows written in one transaction
+
+# mode: menu mode ("1v1", "1vcomputer_hard", "online") or "tournament"
+# difficulty: AI difficulty of the opponents, or the pairing in tournaments
+# winner / winner_kind: name and roster kind ("human", "easy", ...) of the winner, None for draws
+# duration: seconds from the first turn to the win; board: spec hash; finished_at: Unix time
+MatchResult = namedtuple('MatchResult', 'mode difficulty players turns winner winner_kind duration board seed finished_at')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    difficulty TEXT,
+    players INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    winner TEXT,
+    winner_kind TEXT,
+    duration REAL NOT NULL,
+    board TEXT,
+    seed INTEGER,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matches_winner ON matches (winner) WHERE winner IS NOT NULL;
+CREATE INDEX IF NOT EXISTS matches_difficulty ON matches (mode, difficulty, winner_kind);
+CREATE INDEX IF NOT EXISTS matches_finished ON matches (finished_at);
+"""
+INSERT = f"INSERT INTO matches ({', '.join(MatchResult._fields)}) VALUES ({', '.join('?' * len(MatchResult._fields))})"
+
+
+def default_path():
+    return os.path.join(data_dir(), 'results.sqlite3')
+
+
+class ResultsStore:
+    """Match results database with a background writer thread"""
+
+    def __init__(self, path=None, batch_size=BATCH_SIZE):
+        self.path = path or default_path()
+        self.batch_size = batch_size
+        self.queue = queue.SimpleQueue()  # MatchResult rows, threading.Event flush markers, None to stop
+        self.reader = None
+        self.closed = False
+        # Create the schema up front so errors surface here and not on the thread
+        with self.connect() as connection:
+            connection.executescript(SCHEMA)
+        connection.close()
+        self.thread = threading.Thread(target=self.run, name="results-writer", daemon=True)
+        self.thread.start()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL; commits skip the fsync
+        return connection
+
+    def record(self, result):
+        """Queue one MatchResult for writing; never blocks"""
+        if not self.closed:
+            self.queue.put(result)
+
+    def record_many(self, results):
+        for result in results:
+            self.record(result)
+
+    def flush(self, timeout=None):
+        """Wait until everything recorded so far is committed"""
+        if self.closed:
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """Write what is queued and stop the writer thread"""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def run(self):
+        connection = self.connect()
+        running = True
+        while running:
+            rows = []
+            markers = []
+            item = self.queue.get()
+            # Take whatever else is already waiting, up to one batch
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    rows.append(item)
+                if len(rows) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if rows:
+                try:
+                    with connection:
+                        connection.executemany(INSERT, rows)
+                except sqlite3.Error as error:
+                    print(f"Could not save {len(rows)} match results: {error}")
+            for marker in markers:
+                marker.set()
+        connection.close()
+
+    # Queries
+
+    def query(self, sql, parameters=()):
+        if self.reader is None:
+            self.reader = self.connect()
+        return self.reader.execute(sql, parameters).fetchall()
+
+    def leaderboard(self, limit=10, mode=None):
+        """(winner, wins) with the most wins first, optionally for one mode"""
+        if mode is None:
+            return self.query("SELECT winner, COUNT(*) AS wins FROM matches WHERE winner IS NOT NULL "
+                              "GROUP BY winner ORDER BY wins DESC, winner LIMIT ?", (limit,))
+        return self.query("SELECT winner, COUNT(*) AS wins FROM matches WHERE winner IS NOT NULL AND mode = ? "
+                          "GROUP BY winner ORDER BY wins DESC, winner LIMIT ?", (mode, limit))
+
+    def win_rates(self):
+        """(difficulty, matches, human wins) for matches against the computer"""
+        return self.query("SELECT difficulty, COUNT(*), SUM(winner_kind = 'human') FROM matches "
+                          "WHERE mode GLOB '1vcomputer*' GROUP BY mode, difficulty ORDER BY difficulty")
+
+    def recent(self, limit=20):
+        """Latest results, newest first"""
+        rows = self.query(f"SELECT {', '.join(MatchResult._fields)} FROM matches "
+                          "ORDER BY finished_at DESC LIMIT ?", (limit,))
+        return [MatchResult(*row) for row in rows]
+
+
+_default = None
+
+
+def default_store():
+    """Process-wide store in the data directory, or None if it cannot be opened"""
+    global _default
+    if _default is None:
+        try:
+            _default = ResultsStore()
+        except (sqlite3.Error, OSError) as error:
+            print(f"Match results will not be saved: {error}")
+            _default = False
+        else:
+            atexit.register(_default.close)
+    return _default or None
+
+
+def format_report(store, limit=10):
+    lines = ["Papan peringkat:"]
+    for rank, (winner, wins) in enumerate(store.leaderboard(limit), 1):
+        lines.append(f"  {rank:>2}. {winner}: {wins} menang")
+    lines.append("\nMenang melawan komputer:")
+    for difficulty, games, human_wins in store.win_rates():
+        lines.append(f"  {difficulty or 'computer'}: {human_wins / games:.1%} dari {games} permainan")
+    lines.append("\nPermainan terakhir:")
+    for result in store.recent(limit):
+        finished = time.strftime('%Y-%m-%d %H:%M', time.localtime(result.finished_at))
+        winner = result.winner or "seri"
+        lines.append(f"  {finished}  {result.mode:<18} {winner:<16} {result.turns} giliran, {result.duration:.0f} dtk")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leaderboard and history of saved Ular Tangga matches")
+    parser.add_argument('--db', default=None, help="results database (the one in the data directory by default)")
+    parser.add_argument('--limit', type=int, default=10, help="rows per list")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    try:
+        print(format_report(store, args.limit))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import hashlib
+import random
+from functools import cached_property
+
+# Match Random Streams
+# Every match owns a MatchRNG built from one integer seed. Real dice rolls come
+# from their own stream and are drawn in batches: a block of random bytes is
+# mapped to dice values with one bytes.translate call (bytes 252-255 are
+# dropped so every value stays equally likely). AI coin flips and the dice
+# animation use separate streams, so neither shifts the rolls: the same seed
+# always produces the same sequence of dice, whatever happens on screen.
+
+ROLL_BATCH = 256  # Random bytes drawn per refill (about 250 rolls)
+SEED_BITS = 63
+
+# byte -> dice value for bytes below 252 (= 42 * 6); the rest are rejected
+ROLL_TABLE = bytes(byte % 6 + 1 if byte < 252 else 0 for byte in range(256))
+REJECTED = bytes(range(252, 256))
+
+
+def new_seed():
+    """Fresh random seed for a match"""
+    return random.SystemRandom().getrandbits(SEED_BITS)
+
+
+def cosmetic_seed(seed):
+    """Seed for animation-only streams, derived one-way: it reveals nothing about the rolls"""
+    digest = hashlib.sha256(f"{seed}:cosmetic".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'little') >> (64 - SEED_BITS)
+
+
+class MatchRNG:
+    """Seeded random streams of one match"""
+
+    def __init__(self, seed=None, batch_size=ROLL_BATCH):
+        self.seed = new_seed() if seed is None else seed
+        self.batch_size = batch_size
+        self.rolls = random.Random(self.seed)
+        self.buffer = b''
+        self.index = 0
+
+    @cached_property
+    def decisions(self):
+        """Stream for random AI choices (easy AI)"""
+        return random.Random(f"{self.seed}:decisions")
+
+    @cached_property
+    def cosmetic(self):
+        """Stream for values that are only shown, like the rolling dice faces"""
+        return random.Random(f"{self.seed}:cosmetic")
+
+    def roll(self):
+        """Next real dice roll (1-6)"""
+        if self.index >= len(self.buffer):
+            self.refill()
+        value = self.buffer[self.index]
+        self.index += 1
+        return value
+
+    def refill(self):
+        """Draw the next batch of rolls into the buffer"""
+        buffer = b''
+        while not buffer:
+            raw = self.rolls.getrandbits(8 * self.batch_size).to_bytes(self.batch_size, 'little')
+            buffer = raw.translate(ROLL_TABLE, REJECTED)
+        self.buffer = buffer
+        self.index = 0
+
+    def cosmetic_roll(self):
+        """Dice face for animation only; never affects the game"""
+        return self.cosmetic.randint(1, 6)
+
+
+_default = None
+
+
+def default_rng():
+    """Process-wide stream for code that is not tied to a match"""
+    global _default
+    if _default is None:
+        _default = MatchRNG()
+    return _default
@@ -0,0 +1,60 @@
+from assets import SurfaceCache
+from menu import Menu, MIN_PLAYERS
+
+# Scene Manager
+# The menu and the local game are built once and kept alive between visits:
+# going back to the menu reruns the same Menu, and starting another match
+# resets the existing Game (same board, tiles, dice and fonts) instead of
+# building a new one. Both draw through one size-bounded surface cache.
+# Online matches still get their own Game, since each one owns a connection.
+
+
+class SceneManager:
+    """Runs the menu and game scenes, reusing them across round trips"""
+
+    def __init__(self, screen, board_path=None, seed=None, assets=None):
+        self.screen = screen
+        self.board_path = board_path
+        self.seed = seed  # Dice seed for every match started from the menu
+        self.assets = assets if assets is not None else SurfaceCache()
+        self.menu = None
+        self.game = None
+
+    def build_menu(self, num_players=MIN_PLAYERS, on_first_frame=None):
+        """The menu scene, created on first use"""
+        if self.menu is None:
+            self.menu = Menu(self.screen, num_players, on_first_frame=on_first_frame, assets=self.assets)
+        return self.menu
+
+    def show_menu(self):
+        """Run the menu; returns the selected mode, or None to quit"""
+        return self.build_menu().run()
+
+    def play(self, game_mode, num_players):
+        """Run a local match in `game_mode`; returns "menu" or "quit" """
+        # The game (and the engine, AI and networking behind it) loads after
+        # the menu is first shown, keeping it off the startup path
+        from game import Game
+        if self.game is None:
+            self.game = Game(self.screen, game_mode, board_path=self.board_path, num_players=num_players,
+                             seed=self.seed, assets=self.assets)
+        else:
+            self.game.new_match(game_mode, num_players, self.seed)
+        return self.game.run()
+
+    def play_online(self, server, match_id, num_players):
+        """Run one online match on `server` (host, port); returns "menu" or "quit" """
+        from game import Game
+        game = Game(self.screen, "online", board_path=self.board_path, num_players=num_players,
+                    server=server, match_id=match_id, assets=self.assets)
+        return game.run()
+
+    def run(self):
+        """Alternate between the menu and matches until the player quits"""
+        while True:
+            selected_mode = self.show_menu()
+            if not selected_mode:
+                return
+            # The player count chosen in the menu stays there for the next visit
+            if self.play(selected_mode, self.menu.num_players) == "quit":
+                return
@@ -0,0 +1,46 @@
+import pygame
+
+# Idle Scheduler
+class IdleScheduler:
+    """Frame pacing for the main loops.
+
+    While something is animating the loop runs at full frame rate. Otherwise it
+    blocks on the event queue until input arrives or the next scheduled action
+    (e.g. a computer move) is due, so an idle window costs no CPU.
+    """
+
+    def __init__(self, fps=60):
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+
+    def wait(self, animating, timeout=None):
+        """Return the events for the next frame.
+
+        animating: run at full frame rate and just poll the queue.
+        timeout: seconds until something must happen without input, or None
+        to block until the next event.
+        """
+        # Never exceed the frame rate, even when events arrive in bursts
+        self.clock.tick(self.fps)
+        if animating or (timeout is not None and timeout <= 0):
+            return pygame.event.get()
+
+        # pygame.event.wait(0) blocks forever, so always wait at least 1 ms
+        timeout_ms = 0 if timeout is None else max(1, int(timeout * 1000) + 1)
+        event = pygame.event.wait(timeout_ms)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+
+        # Don't count the time spent blocked as a long frame
+        self.clock.tick()
+        return events
+
+
+def window_visible():
+    """True unless the window is minimized"""
+    return pygame.display.get_active()
+
+
+def window_focused():
+    """True while the window is visible and has keyboard focus"""
+    return pygame.display.get_active() and pygame.key.get_focused()
@@ -0,0 +1,457 @@
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from engine import GameState
+from board_spec import load_board
+from rng import MatchRNG, cosmetic_seed
+from replay import Replay, PASS
+from results import MatchResult, ResultsStore
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    import uvloop
+except ImportError:  # The standard event loop is used
+    uvloop = None
+
+# Match Server
+# Hosts many matches in one asyncio process over TCP. The protocol is one JSON
+# object per line in each direction; every message has an "op" field.
+#
+#   client -> server                         server -> client
+#   {"op": "create", "players": 2,           {"op": "joined", "match": 7, "seat": 0, "board": ..., ...}
+#    "name": "Budi"}
+#   {"op": "join", "match": 7, "name": ...}  {"op": "joined", ...}, then to everyone:
+#                                            {"op": "player_joined", "seat": 1, "name": ...}
+#                                            {"op": "start", "current": 0, ...} once full
+#   {"op": "roll"}                           {"op": "moved", "seat": 0, "dice": 4, "landing": 5,
+#                                             "position": 5, "jump": null, "won": false,
+#                                             "current": 1, "turn": 1}  to everyone
+#   {"op": "state"}                          {"op": "state", "positions": [...], ...}
+#   {"op": "leave"}                          {"op": "player_left", "seat": 0}  to the others
+#   {"op": "ping"}                           {"op": "pong"}
+#   {"op": "watch", "match": 7}              {"op": "snapshot", "turn": 0, "players": [...],
+#                                             "positions": [...], "current": 0, ...}, then per turn:
+#                                            {"op": "turn", "turn": 1, "seat": 0, "dice": 4,
+#                                             "position": 38, "jump": "ladder", "won": false,
+#                                             "current": 1}
+#   {"op": "unwatch"}                        (nothing; the feed stops)
+#   anything invalid                         {"op": "error", "message": "..."}
+#
+# Dice are rolled by the server from each match's MatchRNG and moves follow the
+# engine rules (GameState.apply_roll), like Game.move_player. The roll seed never
+# leaves the server; clients get a one-way "cosmetic_seed" for the dice animation.
+# With --record, every finished match is saved like a local one: its replay in
+# the data directory and a row in the results database.
+#
+# Spectators get a full snapshot when they start watching and then one small
+# delta per turn. A spectator whose socket falls SPECTATOR_BACKLOG bytes behind
+# stops receiving deltas and is sent a fresh snapshot (a keyframe) once its
+# backlog has drained, so slow spectators skip turns instead of holding memory.
+
+DEFAULT_PORT = 8765
+MAX_LINE = 4096  # Longest accepted request line
+MAX_PLAYERS = 12
+WRITE_HIGH_WATER = 64 * 1024  # Clients that fall this far behind are disconnected
+SPECTATOR_BACKLOG = 16 * 1024  # Spectators this far behind miss deltas...
+SPECTATOR_RESUME = 4 * 1024  # ...until they are back under this and get a keyframe
+
+
+class Match:
+    """Compact server-side state of one match"""
+    __slots__ = ('match_id', 'state', 'rng', 'seats', 'names', 'replay', 'started', 'started_at', 'feed')
+
+    def __init__(self, match_id, num_players, layout, seed=None):
+        self.match_id = match_id
+        # The board's squares and jump table are shared by every match
+        self.state = GameState(num_players, layout.squares, layout.cells, layout.jump)
+        self.rng = MatchRNG(seed)
+        self.seats = [None] * num_players  # Connection per seat, None when empty or left
+        self.names = [""] * num_players
+        self.replay = Replay(layout.spec_hash, [], seed=self.rng.seed, game_mode="online")
+        self.started = False
+        self.started_at = None  # time.monotonic() when the last seat was taken
+        self.feed = None  # SpectatorFeed, created for the first spectator
+
+    def open_seat(self):
+        """First seat nobody has taken yet, or None when the match is full"""
+        for seat, name in enumerate(self.names):
+            if not name:
+                return seat
+        return None
+
+    def connected(self):
+        return [connection for connection in self.seats if connection is not None]
+
+    def info(self):
+        state = self.state
+        return {'match': self.match_id, 'players': self.names, 'positions': state.positions,
+                'current': state.current, 'winner': state.winner, 'turn': len(self.replay.turns),
+                'started': self.started, 'cosmetic_seed': cosmetic_seed(self.rng.seed)}
+
+
+class Connection:
+    __slots__ = ('writer', 'match', 'seat', 'watching')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.match = None
+        self.seat = None
+        self.watching = None  # Match whose feed this connection follows
+
+
+class SpectatorFeed:
+    """Snapshot-then-delta stream of one match to its spectators"""
+
+    def __init__(self, match):
+        self.match = match
+        self.subscribers = {}  # Connection -> True while it has missed deltas and needs a keyframe
+        self.version = 0  # Bumped on every change, to reuse one encoded keyframe
+        self.keyframe = (None, b'')
+
+    def encoded_keyframe(self):
+        """The match's current snapshot, encoded once per version"""
+        version, data = self.keyframe
+        if version != self.version:
+            data = encode({'op': 'snapshot', **self.match.info()})
+            self.keyframe = (self.version, data)
+        return data
+
+    def subscribe(self, connection):
+        self.subscribers[connection] = False
+        connection.writer.write(self.encoded_keyframe())
+
+    def unsubscribe(self, connection):
+        self.subscribers.pop(connection, None)
+
+    def publish(self, payload):
+        """Send a delta to every spectator (encoded once); lagging ones wait for a keyframe"""
+        self.version += 1
+        self.fan_out(encode(payload))
+
+    def publish_keyframe(self):
+        """Send everyone a full snapshot, for changes that are not turns (a player leaving)"""
+        self.version += 1
+        self.fan_out(self.encoded_keyframe())
+
+    def fan_out(self, data):
+        for connection, stale in list(self.subscribers.items()):
+            writer = connection.writer
+            if writer.is_closing():
+                del self.subscribers[connection]
+                continue
+            backlog = writer.transport.get_write_buffer_size()
+            if stale:
+                if backlog <= SPECTATOR_RESUME:
+                    # Caught up: the current snapshot replaces every missed delta
+                    writer.write(self.encoded_keyframe())
+                    self.subscribers[connection] = False
+            elif backlog > SPECTATOR_BACKLOG:
+                self.subscribers[connection] = True
+            else:
+                writer.write(data)
+
+    def close(self):
+        """The match is over: stale spectators get its final snapshot, as no later keyframe will come"""
+        for connection, stale in self.subscribers.items():
+            connection.watching = None
+            if stale and not connection.writer.is_closing():
+                connection.writer.write(self.encoded_keyframe())
+        self.subscribers.clear()
+
+
+class MatchServer:
+    """Hosts matches on one board and routes client requests to them"""
+
+    def __init__(self, layout, on_finished=None):
+        self.layout = layout
+        self.matches = {}
+        self.match_ids = itertools.count(1)
+        self.on_finished = on_finished  # Called with each finished Match
+        self.handlers = {
+            'create': self.handle_create,
+            'join': self.handle_join,
+            'roll': self.handle_roll,
+            'state': self.handle_state,
+            'leave': self.handle_leave,
+            'ping': self.handle_ping,
+            'watch': self.handle_watch,
+            'unwatch': self.handle_unwatch,
+        }
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE, backlog=1024)
+
+    async def handle_client(self, reader, writer):
+        connection = Connection(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    self.send(connection, error("Request line too long"))
+                    break
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    handler = self.handlers[message['op']]
+                except (ValueError, KeyError, TypeError):
+                    self.send(connection, error("Expected a JSON object with a known 'op'"))
+                    continue
+                try:
+                    handler(connection, message)
+                except (TypeError, ValueError, AttributeError):
+                    self.send(connection, error("Malformed request"))
+        except ConnectionError:
+            pass
+        finally:
+            self.handle_unwatch(connection)
+            self.handle_leave(connection)
+            writer.close()
+
+    def send(self, connection, payload):
+        """Queue one message for a client, dropping clients that stop reading"""
+        self.write(connection, encode(payload))
+
+    def write(self, connection, data):
+        writer = connection.writer
+        if writer.is_closing():
+            return
+        writer.write(data)
+        if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+            writer.close()
+
+    def broadcast(self, match, payload, exclude=None):
+        """Send one message to every connected player of a match (encoded once)"""
+        data = encode(payload)
+        for connection in match.connected():
+            if connection is not exclude:
+                self.write(connection, data)
+
+    def handle_create(self, connection, message):
+        if connection.match is not None:
+            return self.send(connection, error("Already in a match"))
+        players = message.get('players', 2)
+        if not isinstance(players, int) or not 2 <= players <= MAX_PLAYERS:
+            return self.send(connection, error(f"'players' must be between 2 and {MAX_PLAYERS}"))
+        match = Match(next(self.match_ids), players, self.layout)
+        self.matches[match.match_id] = match
+        self.take_seat(connection, match, message)
+
+    def handle_join(self, connection, message):
+        if connection.match is not None:
+            return self.send(connection, error("Already in a match"))
+        match = self.matches.get(message.get('match'))
+        if match is None or match.open_seat() is None:
+            return self.send(connection, error("No such match, or it is full"))
+        self.take_seat(connection, match, message)
+
+    def take_seat(self, connection, match, message):
+        seat = match.open_seat()
+        name = str(message.get('name') or f"Player {seat + 1}")[:32]
+        match.seats[seat] = connection
+        match.names[seat] = name
+        connection.match = match
+        connection.seat = seat
+
+        self.send(connection, {'op': 'joined', 'seat': seat, 'board': self.layout.spec_hash, **match.info()})
+        self.broadcast(match, {'op': 'player_joined', 'seat': seat, 'name': name}, exclude=connection)
+        if match.open_seat() is None:
+            match.started = True
+            match.started_at = time.monotonic()
+            match.replay.roster = [(name, "human") for name in match.names]
+            self.broadcast(match, {'op': 'start', **match.info()})
+        if match.feed is not None:
+            match.feed.publish_keyframe()
+
+    def handle_roll(self, connection, message):
+        match = connection.match
+        if match is None or not match.started:
+            return self.send(connection, error("The match has not started"))
+        state = match.state
+        if state.game_over:
+            return self.send(connection, error("The match is over"))
+        if state.current != connection.seat:
+            return self.send(connection, error("Not your turn"))
+
+        dice = match.rng.roll()
+        result = state.apply_roll(dice)
+        match.replay.record(dice)
+        self.skip_absent(match)
+        self.broadcast(match, {'op': 'moved', 'seat': result.player, 'dice': dice, 'landing': result.landing,
+                               'position': result.position, 'jump': result.jump, 'won': result.won,
+                               'current': state.current, 'turn': len(match.replay.turns)})
+        if match.feed is not None:
+            match.feed.publish(turn_delta(result, state.current, len(match.replay.turns)))
+        if result.won:
+            self.finish(match)
+
+    def skip_absent(self, match):
+        """Pass the turn over seats whose player has left"""
+        state = match.state
+        for _ in range(state.num_players):
+            if state.game_over or match.seats[state.current] is not None:
+                return
+            state.advance_turn()
+            match.replay.record(PASS)
+
+    def handle_state(self, connection, message):
+        if connection.match is None:
+            return self.send(connection, error("Not in a match"))
+        self.send(connection, {'op': 'state', **connection.match.info()})
+
+    def handle_leave(self, connection, message=None):
+        match = connection.match
+        if match is None:
+            return
+        seat = connection.seat
+        match.seats[seat] = None
+        if not match.started:
+            match.names[seat] = ""  # Someone else can take the seat
+        connection.match = connection.seat = None
+        if not match.connected():
+            # Nobody left to play: drop the match
+            self.close_feed(match)
+            self.matches.pop(match.match_id, None)
+            return
+        self.broadcast(match, {'op': 'player_left', 'seat': seat})
+        if match.started and not match.state.game_over and match.state.current == seat:
+            self.skip_absent(match)
+            self.broadcast(match, {'op': 'state', **match.info()})
+        if match.feed is not None:
+            match.feed.publish_keyframe()
+
+    def handle_ping(self, connection, message):
+        self.send(connection, {'op': 'pong'})
+
+    def handle_watch(self, connection, message):
+        match = self.matches.get(message.get('match'))
+        if match is None:
+            return self.send(connection, error("No such match"))
+        self.handle_unwatch(connection)
+        if match.feed is None:
+            match.feed = SpectatorFeed(match)
+        match.feed.subscribe(connection)
+        connection.watching = match
+
+    def handle_unwatch(self, connection, message=None):
+        match = connection.watching
+        if match is None:
+            return
+        connection.watching = None
+        if match.feed is not None:
+            match.feed.unsubscribe(connection)
+
+    def close_feed(self, match):
+        """The match is gone: its spectators stop watching"""
+        if match.feed is None:
+            return
+        match.feed.close()
+        match.feed = None
+
+    def finish(self, match):
+        """A match was won: hand it to the on_finished hook and forget it"""
+        self.matches.pop(match.match_id, None)
+        for connection in match.connected():
+            connection.match = connection.seat = None  # Free to create or join another match
+        self.close_feed(match)
+        if self.on_finished is not None:
+            self.on_finished(match)
+
+
+class MatchRecorder:
+    """on_finished hook that saves every finished match: its replay and a results row"""
+
+    def __init__(self, store):
+        self.store = store
+        # One thread, so replay files are written off the event loop and never race for a name
+        self.saver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="replay-saver")
+
+    def __call__(self, match):
+        state = match.state
+        replay = match.replay
+        # The roll seed stays on the server, but is kept with its own records
+        self.store.record(MatchResult(
+            mode="online", difficulty=None, players=state.num_players, turns=len(replay.turns),
+            winner=match.names[state.winner], winner_kind=replay.roster[state.winner][1],
+            duration=time.monotonic() - match.started_at, board=replay.spec_hash, seed=match.rng.seed,
+            finished_at=time.time()))
+        self.saver.submit(save_replay, replay)
+
+    def close(self):
+        """Wait for pending replays and results to be written"""
+        self.saver.shutdown()
+        self.store.close()
+
+
+def save_replay(replay):
+    try:
+        replay.save()
+    except OSError as error:
+        print(f"Could not save replay: {error}")
+
+
+def turn_delta(result, current, turn):
+    """Spectator delta for one turn, from the engine's MoveResult (as used by Game.move_player)"""
+    return {'op': 'turn', 'turn': turn, 'seat': result.player, 'dice': result.dice,
+            'position': result.position, 'jump': result.jump, 'won': result.won, 'current': current}
+
+
+def encode(payload):
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def error(message):
+    return {'op': 'error', 'message': message}
+
+
+def raise_file_limit():
+    """Allow as many open sockets as the hard limit permits"""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def serve(host, port, board_path=None, recorder=None):
+    server = MatchServer(load_board(board_path), on_finished=recorder)
+    listener = await server.start(host, port)
+    print(f"Serving Ular Tangga matches on {host}:{port}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ular Tangga match server (line-delimited JSON over TCP)")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument('--board', default=None, help="board spec file (JSON/TOML), classic board by default")
+    parser.add_argument('--record', nargs='?', const='', default=None, metavar='DB',
+                        help="save every finished match: its replay in the data directory and its result in a "
+                             "results database (the one in the data directory by default)")
+    args = parser.parse_args()
+
+    raise_file_limit()
+    if uvloop is not None:
+        uvloop.install()
+    recorder = MatchRecorder(ResultsStore(args.record or None)) if args.record is not None else None
+    try:
+        asyncio.run(serve(args.host, args.port, args.board, recorder))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if recorder is not None:
+            recorder.close()
+
+
+if __name__ == "__main__":
+    main()
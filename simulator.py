@@ -0,0 +1,126 @@
+import argparse
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import engine
+from engine import START_SQUARE, FINAL_SQUARE, default_squares
+from board_spec import load_board
+
+# Batched Monte Carlo Simulator
+# Advances many independent games at once as NumPy arrays, using the same
+# rules as engine.GameState (clamp to the last square, then one snake/ladder).
+
+# lengths: rolls per finished game, wins: per-seat win counts,
+# landings: how often each square was landed on (before snakes/ladders)
+SimulationStats = namedtuple('SimulationStats', 'games lengths wins landings unfinished elapsed')
+
+
+def build_jump_table(squares, final_square=FINAL_SQUARE):
+    """Return the final_square + 1 entry table mapping a landing square to where the token ends up"""
+    return np.array(engine.build_jump_table(squares, final_square), dtype=np.int16)
+
+
+def build_move_table(jump_table):
+    """Extend the jump table so index `position + roll` also applies the clamp to the last square"""
+    final_square = len(jump_table) - 1
+    overshoot = np.full(6, jump_table[final_square], dtype=jump_table.dtype)
+    return np.concatenate([jump_table, overshoot])
+
+
+def simulate(games, squares=None, num_players=2, seed=None, batch_size=1_000_000, max_turns=100_000,
+             final_square=FINAL_SQUARE):
+    """Play `games` independent matches and collect length, win and landing statistics"""
+    if squares is None:
+        squares = default_squares()
+    jump_table = build_jump_table(squares, final_square)
+    final_square = len(jump_table) - 1
+    move_table = build_move_table(jump_table)
+    clamp_table = np.minimum(np.arange(len(move_table)), final_square)
+
+    rng = np.random.default_rng(seed)
+    lengths = []
+    wins = np.zeros(num_players, dtype=np.int64)
+    landings = np.zeros(final_square + 1, dtype=np.int64)
+    unfinished = 0
+
+    started = time.perf_counter()
+    remaining = games
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        remaining -= batch
+
+        # One row per seat so each seat's positions are contiguous
+        positions = np.full((num_players, batch), START_SQUARE, dtype=np.int16)
+        batch_lengths = np.zeros(batch, dtype=np.int32)
+        active = np.arange(batch)
+        turn = 0
+        while active.size and turn < max_turns:
+            for seat in range(num_players):
+                rolls = rng.integers(1, 7, size=active.size, dtype=np.int16)
+                reached = positions[seat] + rolls
+                landings += np.bincount(clamp_table[reached], minlength=final_square + 1)
+                moved = move_table[reached]
+                positions[seat] = moved
+                turn += 1
+
+                # All active games are in the same round, so they share the turn count
+                done = moved == final_square
+                if done.any():
+                    wins[seat] += np.count_nonzero(done)
+                    batch_lengths[active[done]] = turn
+                    keep = ~done
+                    active = active[keep]
+                    positions = positions[:, keep]
+                    if not active.size:
+                        break
+
+        unfinished += active.size
+        finished = np.ones(batch, dtype=bool)
+        finished[active] = False
+        lengths.append(batch_lengths[finished])
+
+    elapsed = time.perf_counter() - started
+    return SimulationStats(games, np.concatenate(lengths), wins, landings, unfinished, elapsed)
+
+
+def format_report(stats, top=10):
+    """Human readable summary of a simulation run"""
+    lengths = stats.lengths
+    finished = len(lengths)
+    rate = stats.games / stats.elapsed if stats.elapsed > 0 else float('inf')
+    lines = [
+        f"Simulated {stats.games:,} games in {stats.elapsed:.2f} s ({rate:,.0f} games/s)",
+        f"Game length (rolls): mean {lengths.mean():.2f}, median {np.median(lengths):.0f}, "
+        f"p95 {np.percentile(lengths, 95):.0f}, max {lengths.max()}",
+    ]
+    for seat, seat_wins in enumerate(stats.wins):
+        lines.append(f"Player {seat + 1} wins: {seat_wins / finished:.2%}")
+    if stats.unfinished:
+        lines.append(f"Unfinished (hit max turns): {stats.unfinished:,}")
+
+    total = stats.landings.sum()
+    busiest = np.argsort(stats.landings)[::-1][:top]
+    lines.append(f"Most landed squares: " + ", ".join(
+        f"{square} ({stats.landings[square] / total:.2%})" for square in busiest))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo statistics for the Ular Tangga board")
+    parser.add_argument('--games', type=int, default=1_000_000, help="number of games to simulate")
+    parser.add_argument('--players', type=int, default=2, help="players per game")
+    parser.add_argument('--seed', type=int, default=None, help="seed for reproducible runs")
+    parser.add_argument('--batch-size', type=int, default=1_000_000, help="games advanced together")
+    parser.add_argument('--board', default=None, help="board spec file (JSON/TOML), classic board by default")
+    args = parser.parse_args()
+
+    layout = load_board(args.board)
+    stats = simulate(args.games, layout.squares, num_players=args.players, seed=args.seed,
+                     batch_size=args.batch_size, final_square=layout.cells)
+    print(format_report(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # pygame tests run without a display
+# SDL would take over SIGTERM, and Pool workers forked by later tests could not be terminated
+os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1')
+
+
+@pytest.fixture(autouse=True)
+def user_dirs(tmp_path, monkeypatch):
+    """Keep board caches, replays and results out of the real user directories"""
+    monkeypatch.setenv('ULAR_TANGGA_CACHE', str(tmp_path / 'cache'))
+    monkeypatch.setenv('ULAR_TANGGA_DATA', str(tmp_path / 'data'))
+
+
+@pytest.fixture(scope='session')
+def screen():
+    """The game window, opened once: shared fonts stay valid across tests"""
+    pygame = pytest.importorskip('pygame')
+    pygame.display.init()
+    pygame.font.init()
+    return pygame.display.set_mode((1100, 700))
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+import analysis
+from board_spec import load_board
+from engine import START_SQUARE
+from simulator import simulate
+
+GAMES = 100_000
+
+
+@pytest.fixture(scope='module')
+def classic():
+    return load_board(None, use_cache=False)
+
+
+@pytest.fixture(scope='module')
+def solo_run(classic):
+    # One player per game: every roll until the finish counts, as in the analysis
+    return simulate(GAMES, classic.squares, num_players=1, seed=11, final_square=classic.cells)
+
+
+def test_expected_turns_match_simulation(classic, solo_run):
+    expected = analysis.expected_turns(classic.squares, classic.cells)[START_SQUARE]
+    assert solo_run.lengths.mean() == pytest.approx(expected, abs=0.6)
+
+
+def test_first_player_win_matches_simulation(classic):
+    stats = simulate(GAMES, classic.squares, num_players=2, seed=12, final_square=classic.cells)
+    result = analysis.analyze(classic.squares, classic.cells)
+    assert stats.wins[0] / GAMES == pytest.approx(result.first_player_win, abs=0.01)
+
+
+def test_landing_frequencies_match_simulation(classic, solo_run):
+    exact = analysis.landing_frequencies(classic.squares, classic.cells)
+    simulated = solo_run.landings / solo_run.landings.sum()
+    assert np.abs(exact - simulated).max() < 1e-3
+    # Squares with a snake or ladder are landed on, even though nobody stays there
+    for square in classic.squares:
+        if square != START_SQUARE:
+            assert exact[square] > 0.001
+
+
+def test_win_table_agrees_with_race_analysis(classic):
+    table = analysis.win_table(classic.squares, classic.cells)
+    result = analysis.analyze(classic.squares, classic.cells)
+    start = [START_SQUARE, START_SQUARE]
+    assert table.win_chances(start, 0)[0] == pytest.approx(result.first_player_win, abs=1e-9)
+    assert sum(table.win_chances([10, 40, 70], 1)) == pytest.approx(1.0, abs=1e-9)
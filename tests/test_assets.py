@@ -0,0 +1,70 @@
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from assets import SurfaceCache
+
+
+def surface(width, height=10):
+    return pygame.Surface((width, height))
+
+
+def test_least_recently_used_is_evicted_over_the_pixel_budget():
+    cache = SurfaceCache(max_pixels=1000)
+    cache.put(('tiles', 1), surface(40))
+    cache.put(('tiles', 2), surface(40))
+    assert cache.pixels == 800
+    assert cache.get(('tiles', 1)) is not None  # Now the most recently used
+    cache.put(('tiles', 3), surface(40))
+    assert cache.peek(('tiles', 2)) is None
+    assert cache.peek(('tiles', 1)) is not None and cache.peek(('tiles', 3)) is not None
+    assert cache.pixels == 800 and len(cache) == 2
+
+
+def test_replacing_a_key_updates_the_pixel_count():
+    cache = SurfaceCache(max_pixels=1000)
+    cache.put('a', surface(50))
+    cache.put('a', surface(20))
+    assert cache.pixels == 200 and len(cache) == 1
+
+
+def test_oversized_surface_is_kept_alone():
+    cache = SurfaceCache(max_pixels=100)
+    cache.put('small', surface(5))
+    big = cache.put('big', surface(100))
+    assert cache.peek('big') is big and cache.peek('small') is None
+    assert cache.pixels == 1000
+
+
+def test_get_or_build_counts_hits_and_misses():
+    cache = SurfaceCache()
+    built = []
+
+    def build():
+        built.append(1)
+        return surface(10)
+    first = cache.get_or_build('panel', build)
+    assert cache.get_or_build('panel', build) is first
+    assert len(built) == 1
+    cache.peek('panel')  # Not counted
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'surfaces': 1, 'pixels': 100}
+
+
+def test_discard_drops_one_owner():
+    cache = SurfaceCache()
+    board, other = object(), object()
+    for index in range(3):
+        cache.put((board, index), surface(10))
+    cache.put((other, 0), surface(10))
+    cache.discard(board)
+    assert len(cache) == 1 and cache.pixels == 100
+    cache.clear()
+    assert len(cache) == 0 and cache.pixels == 0
+
+
+def test_translucent_surfaces_are_shared():
+    cache = SurfaceCache()
+    glow = cache.translucent((30, 20), (255, 255, 255), 50)
+    assert glow.get_alpha() == 50 and glow.get_size() == (30, 20)
+    assert cache.translucent([30, 20], [255, 255, 255], 50) is glow
+    assert cache.translucent((30, 20), (255, 255, 255), 80) is not glow
@@ -0,0 +1,72 @@
+import pytest
+
+from board_spec import (BoardSpecError, compile_jump_table, compile_spec, load_board, spec_from_squares,
+                        validate_spec)
+from engine import default_squares
+
+
+def test_compile_resolves_chains():
+    # Ladder 10 -> 20 ends on the snake 20 -> 5, so landing on 10 ends on 5
+    spec = validate_spec({'rows': 5, 'cols': 5, 'ladders': {'10': 20, '3': 12}, 'snakes': {'20': 5, '12': 2}})
+    board = compile_spec(spec, use_cache=False)
+    assert board.jump[10] == 5
+    assert board.jump[3] == 2
+    assert board.squares == {3: 2, 10: 5, 12: 2, 20: 5}
+    assert board.jump[7] == 7
+
+
+def test_loops_are_rejected():
+    with pytest.raises(BoardSpecError):
+        validate_spec({'ladders': {'10': 20}, 'snakes': {'20': 10}})
+    with pytest.raises(BoardSpecError):
+        compile_jump_table({10: 20, 20: 10}, 100)
+
+
+def test_cached_board_matches_fresh_compile():
+    fresh = load_board(None, use_cache=False)
+    load_board(None)  # Writes the cache
+    cached = load_board(None)
+    assert cached.spec_hash == fresh.spec_hash
+    assert list(cached.jump) == list(fresh.jump)
+    assert cached.squares == fresh.squares == default_squares()
+
+
+def test_invalid_specs_are_rejected():
+    for spec in ({'rows': 1}, {'ladders': {'5': 3}}, {'snakes': {'5': 9}}, {'ladders': {'0': 3}},
+                 {'ladders': {'5': 9}, 'snakes': {'5': 2}}):
+        with pytest.raises(BoardSpecError):
+            validate_spec(spec)
+
+
+def test_board_set_at_runtime_plays_like_its_spec():
+    board_module = pytest.importorskip('board')
+    board = board_module.Board()
+    board.squares = {10: 20, 20: 5, 30: 40}
+    spec = validate_spec({'ladders': {'10': 20, '30': 40}, 'snakes': {'20': 5}})
+    compiled = compile_spec(spec, use_cache=False)
+    assert board.squares == compiled.squares
+    assert list(board.jump) == list(compiled.jump)
+
+
+def test_runtime_edits_rehash_the_layout():
+    board_module = pytest.importorskip('board')
+    board = board_module.Board()
+    classic = load_board(None, use_cache=False)
+    assert board.layout.spec_hash == classic.spec_hash
+    version = board.version
+
+    board.squares[2] = 60
+    board.invalidate()
+    assert board.version == version + 1
+    assert board.layout.spec_hash != classic.spec_hash
+    assert board.jump[2] == board.squares[2] == 60
+    spec = spec_from_squares({**classic.squares, 2: 60}, classic.rows, classic.cols, classic.name)
+    assert board.layout.spec_hash == compile_spec(spec, use_cache=False).spec_hash
+
+    # Setting the original squares back gives the original board
+    board.squares = classic.squares
+    assert board.layout.spec_hash == classic.spec_hash
+
+    with pytest.raises(BoardSpecError):
+        board.squares = {10: 20, 20: 10}
+    assert board.squares == classic.squares
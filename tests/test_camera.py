@@ -0,0 +1,67 @@
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from camera import ZOOM_LEVELS, Camera
+
+VIEWPORT = pygame.Rect(50, 50, 800, 600)
+
+
+def test_starts_at_full_size_on_square_one():
+    camera = Camera(VIEWPORT, (8000, 6000))  # 100x100 squares of 80x60
+    assert camera.zoom == 1.0
+    # Bottom-left corner of the board in view
+    assert camera.state == (camera.level, 0, 6000 - 600)
+    assert camera.world_to_screen(0, 6000) == VIEWPORT.bottomleft
+
+
+def test_zoom_is_clamped():
+    camera = Camera(VIEWPORT, (8000, 6000))
+    # Showing the whole board would take 10%; zooming out stops at the smallest level
+    assert camera.levels[0] == 0.2 and camera.levels[-1] == ZOOM_LEVELS[-1]
+    camera.zoom_by(-100)
+    assert camera.zoom == 0.2
+    camera.zoom_by(100)
+    assert camera.zoom == 2.0
+
+    classic = Camera(VIEWPORT, (800, 600))
+    assert classic.levels[0] == 1.0  # Already fits; no zooming out past it
+    classic.zoom_by(-1)
+    assert classic.zoom == 1.0
+
+
+def test_small_boards_start_at_full_size_and_are_centered():
+    camera = Camera(VIEWPORT, (400, 300))
+    assert camera.zoom == 1.0 and camera.levels[0] == 1.0
+    assert camera.world_to_screen(0, 0) == (VIEWPORT.x + 200, VIEWPORT.y + 150)
+    camera.scroll(500, -500)
+    assert camera.world_to_screen(0, 0) == (VIEWPORT.x + 200, VIEWPORT.y + 150)
+
+
+def test_scroll_stays_on_the_board():
+    camera = Camera(VIEWPORT, (8000, 6000))
+    camera.scroll(-100, 10_000)
+    assert (camera.x, camera.y) == (0, 6000 - 600)
+    camera.scroll(100_000, -100_000)
+    assert (camera.x, camera.y) == (8000 - 800, 0)
+    left, top, right, bottom = camera.visible_world_rect()
+    assert (left, top, right, bottom) == (7200, 0, 8000, 600)
+
+
+def test_zoom_keeps_the_anchor_in_place():
+    camera = Camera(VIEWPORT, (8000, 6000))
+    camera.center_on(4000, 3000)
+    anchor = (300, 200)
+    world = camera.screen_to_world(*anchor)
+    camera.zoom_by(2, anchor)
+    assert camera.zoom == 1.6
+    assert camera.world_to_screen(*world) == anchor
+
+
+def test_ensure_visible_recenters():
+    camera = Camera(VIEWPORT, (8000, 6000))
+    state = camera.state
+    camera.ensure_visible(100, 5900)  # Already in view
+    assert camera.state == state
+    camera.ensure_visible(4000, 3000)
+    assert camera.world_to_screen(4000, 3000) == VIEWPORT.center
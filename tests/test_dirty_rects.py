@@ -0,0 +1,74 @@
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from dirty_rects import DirtyRectTracker, merge_rects
+
+
+def tracker():
+    """A tracker past its first (full) frame"""
+    dirty = DirtyRectTracker()
+    assert dirty.collect() == (True, [])
+    return dirty
+
+
+def test_first_frame_and_requests_repaint_everything():
+    dirty = DirtyRectTracker()
+    dirty.track('dice', pygame.Rect(0, 0, 10, 10), 1)
+    assert dirty.collect() == (True, [])
+    assert dirty.collect() == (False, [])
+    dirty.track('dice', pygame.Rect(0, 0, 10, 10), 2)
+    dirty.request_full_redraw()
+    # Rects marked before the full redraw are not carried over
+    assert dirty.collect() == (True, [])
+    assert dirty.collect() == (False, [])
+
+
+def test_unchanged_regions_stay_clean():
+    dirty = tracker()
+    dirty.track('message', pygame.Rect(0, 0, 50, 20), "Giliran Ani")
+    assert dirty.collect() == (False, [pygame.Rect(0, 0, 50, 20)])
+    dirty.track('message', pygame.Rect(0, 0, 50, 20), "Giliran Ani")
+    assert dirty.collect() == (False, [])
+
+
+def test_changed_signature_marks_the_region():
+    dirty = tracker()
+    dirty.track('dice_value', pygame.Rect(0, 0, 50, 20), 3)
+    dirty.collect()
+    dirty.track('dice_value', pygame.Rect(0, 0, 50, 20), 5)
+    assert dirty.collect() == (False, [pygame.Rect(0, 0, 50, 20)])
+
+
+def test_moved_region_erases_its_old_rect():
+    dirty = tracker()
+    dirty.track('player', pygame.Rect(0, 0, 30, 30), 1)
+    dirty.collect()
+    dirty.track('player', pygame.Rect(100, 100, 30, 30), 1)
+    full, rects = dirty.collect()
+    assert not full and sorted(map(tuple, rects)) == [(0, 0, 30, 30), (100, 100, 30, 30)]
+
+
+def test_forget_erases_the_region():
+    dirty = tracker()
+    dirty.track('win_panel', pygame.Rect(5, 5, 40, 40), True)
+    dirty.collect()
+    dirty.forget('win_panel')
+    dirty.forget('never tracked')
+    assert dirty.collect() == (False, [pygame.Rect(5, 5, 40, 40)])
+    # Tracking it again reports it as new
+    dirty.track('win_panel', pygame.Rect(5, 5, 40, 40), True)
+    assert dirty.collect() == (False, [pygame.Rect(5, 5, 40, 40)])
+
+
+def test_merge_rects():
+    # A chain: the union of the first two reaches the third
+    rects = merge_rects([(0, 0, 10, 10), (200, 0, 10, 10), (5, 5, 10, 10), (14, 14, 10, 10)])
+    assert sorted(map(tuple, rects)) == [(0, 0, 24, 24), (200, 0, 10, 10)]
+    # Touching edges do not overlap
+    assert len(merge_rects([(0, 0, 10, 10), (10, 0, 10, 10)])) == 2
+    assert merge_rects([]) == []
+    # No pixel is covered twice
+    rects = merge_rects([(x * 7, (x * 13) % 50, 12, 12) for x in range(30)])
+    for index, rect in enumerate(rects):
+        assert rect.collidelist(rects[index + 1:]) == -1
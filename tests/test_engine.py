@@ -0,0 +1,92 @@
+from engine import TurnScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def scheduler():
+    clock = FakeClock()
+    return TurnScheduler(clock), clock
+
+
+def test_callbacks_run_in_due_order():
+    turns, clock = scheduler()
+    fired = []
+    turns.schedule(2.0, fired.append, "b")
+    turns.schedule(1.0, fired.append, "a")
+    turns.schedule(2.0, fired.append, "c")  # Same time as "b": scheduled later, runs later
+    assert turns.time_until_next() == 1.0
+    assert turns.run_due() == 0
+
+    clock.now += 1.0
+    assert turns.run_due() == 1 and fired == ["a"]
+    clock.now += 5.0
+    assert turns.time_until_next() == 0.0
+    assert turns.run_due() == 2 and fired == ["a", "b", "c"]
+    assert turns.time_until_next() is None
+
+
+def test_cancel_and_clear():
+    turns, clock = scheduler()
+    fired = []
+    first = turns.schedule(1.0, fired.append, 1)
+    turns.schedule(3.0, fired.append, 3)
+    turns.cancel(first)
+    # The cancelled callback no longer counts for the next wake-up
+    assert turns.time_until_next() == 3.0
+    clock.now += 5.0
+    assert turns.run_due() == 1 and fired == [3]
+
+    turns.schedule(1.0, fired.append, 4)
+    turns.clear()
+    clock.now += 5.0
+    assert turns.run_due() == 0 and turns.time_until_next() is None
+
+
+def test_pause_keeps_the_remaining_time():
+    turns, clock = scheduler()
+    fired = []
+    turns.schedule(1.5, fired.append, "computer")
+    clock.now += 1.0
+    turns.pause()
+    assert turns.paused and turns.time_until_next() is None
+    clock.now += 60.0  # Minimized for a minute
+    assert turns.run_due() == 0 and not fired
+    turns.pause()  # Pausing again does not restart the pause
+    clock.now += 1.0
+
+    turns.resume()
+    assert turns.time_until_next() == 0.5
+    clock.now += 0.4
+    assert turns.run_due() == 0
+    clock.now += 0.1
+    assert turns.run_due() == 1 and fired == ["computer"]
+
+
+def test_scheduled_while_paused_counts_from_resume():
+    turns, clock = scheduler()
+    fired = []
+    turns.pause()
+    turns.schedule(1.0, fired.append, "later")
+    clock.now += 10.0
+    turns.resume()
+    assert turns.time_until_next() == 1.0
+
+
+def test_callbacks_can_schedule_more():
+    turns, clock = scheduler()
+    fired = []
+
+    def turn(count):
+        fired.append(count)
+        if count < 3:
+            turns.schedule(0.0, turn, count + 1)
+
+    turns.schedule(1.0, turn, 1)
+    clock.now += 1.0
+    assert turns.run_due() == 3 and fired == [1, 2, 3]
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from board_spec import load_board
+from net_client import MatchClient
+from server import MatchServer
+
+pytest.importorskip('pygame')
+
+
+@pytest.fixture
+def server():
+    """A MatchServer on a loopback port, run by its own thread like a separate process"""
+    loop = asyncio.new_event_loop()
+    match_server = MatchServer(load_board(None, use_cache=False))
+    listener = loop.run_until_complete(match_server.start('127.0.0.1', 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield ('127.0.0.1', listener.sockets[0].getsockname()[1]), match_server
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    listener.close()
+    loop.run_until_complete(listener.wait_closed())
+    loop.close()
+
+
+def wait_for(condition, step=None, timeout=10.0):
+    """Call step() until condition() holds"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        if step is not None:
+            step()
+        time.sleep(0.001)
+
+
+def test_client_thread_delivers_messages_in_order(server):
+    address, match_server = server
+    wakes = []
+    client = MatchClient(*address, wake=lambda: wakes.append(threading.current_thread().name))
+    # Sent before the connection is up: queued and written once it is
+    client.send({'op': 'create', 'players': 3, 'name': 'Ani'})
+    client.send({'op': 'ping'})
+    messages = []
+    wait_for(lambda: len(messages) >= 3, lambda: messages.extend(client.poll()))
+    assert [message['op'] for message in messages] == ['connected', 'joined', 'pong']
+    assert messages[1]['players'] == ['Ani', '', '']
+    assert set(wakes) == {'match-client'} and len(wakes) == 3
+    assert client.poll() == []
+
+    client.close()
+    assert not client.thread.is_alive()
+    # The server treats the closed connection as leaving, which drops the empty match
+    wait_for(lambda: not match_server.matches)
+    client.send({'op': 'ping'})  # Ignored once closed
+
+
+def test_client_reports_a_refused_connection():
+    client = MatchClient('127.0.0.1', 1)
+    messages = []
+    wait_for(lambda: messages, lambda: messages.extend(client.poll()))
+    assert messages[0]['op'] == 'disconnected' and messages[0]['message']
+    client.close()
+
+
+def online_game(screen, address, match_id=None, board_path=None, num_players=2):
+    from game import Game
+    return Game(screen, "online", board_path=board_path, num_players=num_players, server=address,
+                match_id=match_id)
+
+
+def start_online_match(screen, address, players=2):
+    games = [online_game(screen, address, num_players=players)]
+    wait_for(lambda: games[0].seat is not None, games[0].update_game)
+    match_id = int(games[0].message.split()[1])  # "Match 7 (bergabung dengan --match 7) | ..."
+    for _ in range(players - 1):
+        games.append(online_game(screen, address, match_id))
+    for game in games:
+        wait_for(lambda: game.match_started, game.update_game)
+    return games
+
+
+def test_predicted_rolls_reconcile_with_the_server(screen, server):
+    address, match_server = server
+    games = start_online_match(screen, address)
+    try:
+        assert [game.seat for game in games] == [0, 1]
+        [match] = match_server.matches.values()
+        for turn in range(6):
+            roller = games[turn % 2]
+            assert roller.our_turn_online() and not games[1 - turn % 2].our_turn_online()
+            roller.roll_and_move()
+            # The animation starts before the server has answered
+            assert roller.dice.rolling and roller.dice.awaiting_result()
+            for game in games:
+                wait_for(lambda: len(game.replay.turns) == turn + 1 and not game.dice.rolling, game.update_game)
+            for game in games:
+                assert game.state.positions == match.state.positions
+                assert game.state.current == match.state.current
+                assert game.dice.get_value() == match.replay.turns[-1]
+        # Cosmetic seeds never reproduce the server's rolls
+        assert all(game.replay.seed is None for game in games)
+        assert games[0].replay.turns == games[1].replay.turns == match.replay.turns
+    finally:
+        for game in games:
+            game.close_connection()
+
+
+def test_skipped_seats_are_reconciled(screen, server):
+    address, match_server = server
+    games = start_online_match(screen, address, players=3)
+    try:
+        games[1].close_connection()  # Seat 1 leaves
+        wait_for(lambda: "keluar" in games[0].message, games[0].update_game)
+        games[0].roll_and_move()
+        wait_for(lambda: games[0].replay.turns and not games[0].dice.rolling, games[0].update_game)
+        [match] = match_server.matches.values()
+        # The server passed over seat 1; the client followed instead of waiting for it
+        assert games[0].state.current == match.state.current == 2
+        assert games[0].state.positions == match.state.positions
+        assert games[0].replay.turns == match.replay.turns and games[0].replay.turns[1] == 0
+    finally:
+        for game in games:
+            game.close_connection()
+
+
+def test_board_mismatch_disconnects(screen, server, tmp_path):
+    address, match_server = server
+    spec = tmp_path / 'small.json'
+    spec.write_text(json.dumps({'name': "Kecil", 'rows': 5, 'cols': 5, 'ladders': {'3': 12}, 'snakes': {'20': 4}}))
+    game = online_game(screen, address, board_path=str(spec))
+    wait_for(lambda: game.message == "Server memakai papan yang berbeda", game.update_game)
+    assert not game.connected and not game.client.thread.is_alive()
+    assert game.seat is None and not game.match_started
+    wait_for(lambda: not match_server.matches)
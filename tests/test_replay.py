@@ -0,0 +1,99 @@
+from collections import Counter
+
+import pytest
+
+from board_spec import load_board
+from engine import GameState
+from replay import (PASS, Replay, ReplayError, ReplayIndex, iter_archive, pack_turns, unpack_turns,
+                    write_archive)
+from rng import MatchRNG
+
+
+@pytest.fixture(scope='module')
+def classic():
+    return load_board(None, use_cache=False)
+
+
+def play(seed, layout, players=2, pass_every=5):
+    """A finished match recorded the way the server does, skipping a seat now and then; also returns positions per turn"""
+    rng = MatchRNG(seed)
+    state = GameState(players, layout.squares, layout.cells, layout.jump)
+    replay = Replay(layout.spec_hash, [(f"P{seat}", "human") for seat in range(players)], seed=seed,
+                    game_mode="1v1")
+    positions = [tuple(state.positions)]
+    while not state.game_over:
+        if len(replay.turns) % pass_every == pass_every - 1:
+            state.advance_turn()
+            replay.record(PASS)
+        else:
+            dice = rng.roll()
+            state.apply_roll(dice)
+            replay.record(dice)
+        positions.append(tuple(state.positions))
+    return replay, positions
+
+
+def test_turn_packing_round_trip():
+    for count in (0, 1, 7, 8, 9, 100):
+        turns = bytes((index * 5) % 7 for index in range(count))
+        packed = pack_turns(turns)
+        assert len(packed) == (count * 3 + 7) // 8
+        assert bytes(unpack_turns(packed, count)) == turns
+
+
+def test_replay_round_trip(classic):
+    replay, _ = play(42, classic, players=3)
+    replay.roster[1] = ("Budi ✓", "hard")
+    copy = Replay.from_bytes(replay.to_bytes())
+    assert copy.spec_hash == replay.spec_hash
+    assert copy.roster == replay.roster
+    assert copy.seed == 42
+    assert copy.game_mode == "1v1"
+    assert copy.turns == replay.turns
+
+    unseeded = Replay.from_bytes(Replay(classic.spec_hash, [("A", "human")]).to_bytes())
+    assert unseeded.seed is None and not unseeded.turns
+
+
+def test_truncated_replay_is_rejected(classic):
+    data = play(3, classic)[0].to_bytes()
+    with pytest.raises(ReplayError):
+        Replay.from_bytes(data[:-1])
+    with pytest.raises(ReplayError):
+        Replay.from_bytes(data[:10])
+
+
+def test_index_seeks_to_every_turn(classic):
+    replay, positions = play(7, classic)
+    index = ReplayIndex(replay, classic, interval=4)
+    for turn in (len(positions) - 1, 0, 5, 4, 13, 1):
+        assert index.frame_at(turn).positions == positions[turn]
+    assert index.frame_at(len(positions) - 1).winner is not None
+
+
+def test_index_rejects_dice_not_from_the_seed(classic):
+    replay, _ = play(7, classic)
+    first_roll = next(index for index, value in enumerate(replay.turns) if value != PASS)
+    replay.turns[first_roll] = replay.turns[first_roll] % 6 + 1
+    with pytest.raises(ReplayError):
+        ReplayIndex(replay, classic)
+
+
+def test_archive_skips_bad_records(classic, tmp_path):
+    replays = [play(seed, classic)[0] for seed in range(5)]
+    path = str(tmp_path / 'games.utra')
+    assert write_archive(replays, path) == 5
+    assert [replay.turns for replay in iter_archive(path)] == [replay.turns for replay in replays]
+
+    # Break the magic of the second record: only that one is lost
+    data = bytearray(open(path, 'rb').read())
+    second = 4 + 4 + len(replays[0].to_bytes())
+    data[second + 4] ^= 0xFF
+    with open(path, 'wb') as archive:
+        archive.write(data)
+    errors = Counter()
+    read = list(iter_archive(path, errors))
+    assert [replay.seed for replay in read] == [0, 2, 3, 4]
+    assert errors['unreadable'] == 1
+    with pytest.raises(ReplayError):
+        list(iter_archive(path))
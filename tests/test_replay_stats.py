@@ -0,0 +1,90 @@
+from collections import Counter
+
+import pytest
+
+from board_spec import load_board
+from engine import GameState, MoveResult
+from replay import Replay, write_archive
+from replay_stats import AGGREGATORS, Comebacks, LandingHeatmap, analyze, make_shards, replay_moves
+from rng import MatchRNG
+
+
+@pytest.fixture(scope='module')
+def classic():
+    return load_board(None, use_cache=False)
+
+
+def play(seed, layout, players=2):
+    rng = MatchRNG(seed)
+    state = GameState(players, layout.squares, layout.cells, layout.jump)
+    replay = Replay(layout.spec_hash, [(f"P{seat}", "human") for seat in range(players)], seed=seed)
+    while not state.game_over:
+        dice = rng.roll()
+        state.apply_roll(dice)
+        replay.record(dice)
+    return replay
+
+
+def aggregate(replays, layout):
+    aggregators = [aggregator() for aggregator in AGGREGATORS.values()]
+    for replay in replays:
+        moves = replay_moves(replay, layout, layout.squares)
+        for aggregator in aggregators:
+            aggregator.add(replay, moves)
+    return aggregators
+
+
+def test_heatmap_counts_squares_before_jumps(classic):
+    replay = Replay(classic.spec_hash, [("A", "human")])
+    # A roll of 3 lands on the ladder at 4, which ends on 14
+    moves = [MoveResult(0, 1, 3, 4, 14, 'ladder', False), MoveResult(0, 14, 2, 16, 6, 'snake', False)]
+    heatmap = LandingHeatmap()
+    heatmap.add(replay, moves)
+    assert heatmap.squares == {classic.spec_hash: Counter({4: 1, 16: 1})}
+    assert "Kotak paling sering didarati" in heatmap.report({classic.spec_hash: classic.name})[0]
+
+
+def test_comeback_deficit():
+    replay = Replay('00' * 32, [("A", "human"), ("B", "human")])
+    moves = [MoveResult(0, 1, 6, 7, 40, 'ladder', False), MoveResult(1, 1, 2, 3, 3, None, False),
+             MoveResult(0, 40, 4, 44, 44, None, False), MoveResult(1, 3, 1, 4, 100, 'ladder', True)]
+    comebacks = Comebacks()
+    comebacks.add(replay, moves)
+    assert (comebacks.games, comebacks.decided, comebacks.comebacks, comebacks.largest) == (1, 1, 1, 41)
+    assert comebacks.deficits == Counter({4: 1})
+
+
+def test_merged_shards_equal_one_pass(classic):
+    replays = [play(seed, classic, players=2 + seed % 3) for seed in range(12)]
+    whole = aggregate(replays, classic)
+    first, second = aggregate(replays[:5], classic), aggregate(replays[5:], classic)
+    for total, partial in zip(first, second):
+        total.merge(partial)
+    for merged, single in zip(first, whole):
+        assert vars(merged) == vars(single)
+    heatmap, jumps = whole[0], whole[1]
+    assert sum(heatmap.squares[classic.spec_hash].values()) == jumps.rolls == sum(len(r.turns) for r in replays)
+
+
+def test_make_shards():
+    paths = ['a.utra', '1.utr', '2.utr', '3.utr', 'b.utra', '4.utr', '5.utr']
+    assert make_shards(paths, shard_files=2) == [['a.utra'], ['b.utra'], ['1.utr', '2.utr'], ['3.utr', '4.utr'],
+                                                 ['5.utr']]
+    assert make_shards([]) == []
+
+
+def test_analyze_files_and_archives(classic, tmp_path):
+    replays = [play(seed, classic) for seed in range(7)]
+    write_archive(replays[:4], str(tmp_path / 'games.utra'))
+    for index, replay in enumerate(replays[4:]):
+        replay.save(str(tmp_path / f'{index}.utr'))
+    Replay('ab' * 32, [("A", "human")], turns=b'\x03').save(str(tmp_path / 'other-board.utr'))
+
+    aggregators, counts, boards = analyze([str(tmp_path)], workers=1)
+    assert counts['games'] == 7 and counts['read'] == 8 and counts['unknown board'] == 1
+    assert boards == {classic.spec_hash: classic.name}
+    assert vars(aggregators[1]) == vars(aggregate(replays, classic)[1])
+
+    # Boards are only looked up in the spec map handed to the workers
+    _, counts, boards = analyze([str(tmp_path)], ('jumps',), workers=1, specs={})
+    assert counts['games'] == 0 and counts['unknown board'] == 8 and not boards
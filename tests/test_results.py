@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+from results import MatchResult, ResultsStore, default_path, format_report
+
+
+def result(winner, mode="1v1", difficulty=None, winner_kind="human", finished_at=None, turns=30):
+    return MatchResult(mode, difficulty, 2, turns, winner, winner_kind, 12.5, 'ab' * 32, 7,
+                       finished_at or time.time())
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / 'results.sqlite3'))
+    yield store
+    store.close()
+
+
+def test_default_path_is_in_the_data_dir():
+    assert default_path() == os.path.join(os.environ['ULAR_TANGGA_DATA'], 'results.sqlite3')
+
+
+def test_wal_mode(store):
+    assert store.query("PRAGMA journal_mode") == [('wal',)]
+
+
+def test_record_does_not_wait_for_the_writer(store):
+    # Another connection holds the write lock, so the writer thread is stuck
+    blocker = sqlite3.connect(store.path)
+    blocker.execute("BEGIN IMMEDIATE")
+    store.record(result("Ani"))
+    time.sleep(0.05)  # Let the writer pick it up and block on the lock
+    started = time.perf_counter()
+    store.record_many(result(f"P{index}") for index in range(1000))
+    assert time.perf_counter() - started < 0.5
+    assert store.query("SELECT COUNT(*) FROM matches") == [(0,)]
+    blocker.rollback()
+    blocker.close()
+    store.flush()
+    assert store.query("SELECT COUNT(*) FROM matches") == [(1001,)]
+
+
+def test_close_drains_the_queue(tmp_path):
+    path = str(tmp_path / 'results.sqlite3')
+    store = ResultsStore(path, batch_size=7)
+    store.record_many(result("Ani") for _ in range(100))
+    store.close()
+    store.record(result("late"))  # Ignored once closed
+    store.flush()
+    reopened = ResultsStore(path)
+    assert reopened.query("SELECT COUNT(*) FROM matches") == [(100,)]
+    reopened.close()
+
+
+def test_leaderboard_and_history(store):
+    now = time.time()
+    for index, winner in enumerate(["Ani", "Budi", "Ani", "Citra", "Ani", "Budi"]):
+        store.record(result(winner, finished_at=now - 100 + index))
+    store.record(result("Computer", mode="1vcomputer_hard", difficulty="hard", winner_kind="hard",
+                        finished_at=now))
+    store.record(result("Player", mode="1vcomputer_hard", difficulty="hard", finished_at=now + 1))
+    store.record(result(None, mode="tournament", difficulty="easy vs hard", winner_kind=None, finished_at=now - 500))
+    store.flush()
+
+    assert store.leaderboard() == [("Ani", 3), ("Budi", 2), ("Citra", 1), ("Computer", 1), ("Player", 1)]
+    assert store.leaderboard(limit=2) == [("Ani", 3), ("Budi", 2)]
+    assert store.leaderboard(mode="1vcomputer_hard") == [("Computer", 1), ("Player", 1)]
+    assert store.win_rates() == [("hard", 2, 1)]
+    recent = store.recent(3)
+    assert [row.winner for row in recent] == ["Player", "Computer", "Budi"]
+    assert recent[0] == result("Player", mode="1vcomputer_hard", difficulty="hard", finished_at=now + 1)
+
+    report = format_report(store, limit=3)
+    assert "   1. Ani: 3 menang" in report
+    assert "hard: 50.0% dari 2 permainan" in report
+
+
+def test_leaderboard_uses_its_index(store):
+    plan = store.query("EXPLAIN QUERY PLAN SELECT winner, COUNT(*) FROM matches WHERE winner IS NOT NULL "
+                       "GROUP BY winner")
+    assert any('matches_winner' in row[-1] for row in plan)
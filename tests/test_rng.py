@@ -0,0 +1,36 @@
+from rng import MatchRNG, SEED_BITS, cosmetic_seed
+
+
+def rolls(rng, count):
+    return [rng.roll() for _ in range(count)]
+
+
+def test_same_seed_same_rolls():
+    assert rolls(MatchRNG(1234), 1000) == rolls(MatchRNG(1234), 1000)
+    assert rolls(MatchRNG(1234), 1000) != rolls(MatchRNG(1235), 1000)
+
+
+def test_rolls_are_dice_values():
+    values = rolls(MatchRNG(5), 6000)
+    assert set(values) == {1, 2, 3, 4, 5, 6}
+    for face in range(1, 7):
+        assert 850 < values.count(face) < 1150
+
+
+def test_other_streams_do_not_shift_the_rolls():
+    plain = MatchRNG(77)
+    busy = MatchRNG(77)
+    expected = rolls(plain, 50)
+    actual = []
+    for _ in range(50):
+        busy.cosmetic_roll()
+        busy.decisions.random()
+        actual.append(busy.roll())
+    assert actual == expected
+
+
+def test_cosmetic_seed_is_stable_and_separate():
+    assert cosmetic_seed(77) == cosmetic_seed(77)
+    assert cosmetic_seed(77) != 77
+    assert cosmetic_seed(77) != cosmetic_seed(78)
+    assert 0 <= cosmetic_seed(77) < 2 ** SEED_BITS
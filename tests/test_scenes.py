@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip('pygame')
+
+from board_spec import load_board
+from game import Game
+from menu import Menu
+from scenes import SceneManager
+
+
+@pytest.fixture
+def scenes(screen, monkeypatch):
+    # Scenes return right away instead of running their loops
+    monkeypatch.setattr(Game, 'run', lambda game: "menu")
+    return SceneManager(screen, seed=11)
+
+
+def test_menu_is_built_once(scenes):
+    menu = scenes.build_menu(num_players=4)
+    assert scenes.build_menu() is menu
+    assert menu.num_players == 4 and menu.assets is scenes.assets
+
+
+def test_game_is_reset_between_matches(scenes):
+    assert scenes.play("1v1", 2) == "menu"
+    game = scenes.game
+    board, dice = game.board, game.dice
+    assert game.assets is scenes.assets and board.assets is scenes.assets
+    game.state.apply_roll(6)
+    game.game_over = True
+
+    scenes.play("1vcomputer_hard", 3)
+    assert scenes.game is game and game.board is board and game.dice is dice
+    assert game.game_mode == "1vcomputer_hard" and len(game.players) == 3
+    assert [player.is_computer for player in game.players] == [False, True, True]
+    assert game.state.positions == [1, 1, 1] and not game.game_over
+    assert game.rng.seed == 11 and not game.replay.turns
+    assert game.board.layout.spec_hash == load_board(None).spec_hash
+
+
+def test_run_alternates_menu_and_matches(scenes, monkeypatch):
+    choices = iter(["1v1", "1vcomputer_easy", None])
+    games = []
+    monkeypatch.setattr(Menu, 'run', lambda menu: next(choices))
+    monkeypatch.setattr(Game, 'run', lambda game: games.append(game) or "menu")
+    scenes.run()
+    assert len(games) == 2 and games[0] is games[1]
+    assert games[1].game_mode == "1vcomputer_easy"
+
+
+def test_quit_from_a_match_ends_the_loop(scenes, monkeypatch):
+    choices = iter(["1v1", "1v1"])
+    monkeypatch.setattr(Menu, 'run', lambda menu: next(choices))
+    monkeypatch.setattr(Game, 'run', lambda game: "quit")
+    scenes.run()
+    assert next(choices) == "1v1"  # The menu was shown only once
@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+
+import loadtest
+from board_spec import load_board
+from replay import Replay
+from results import ResultsStore
+from server import (MAX_LINE, SPECTATOR_BACKLOG, SPECTATOR_RESUME, Connection, Match, MatchRecorder, MatchServer,
+                    SpectatorFeed, turn_delta)
+
+
+def run(test, on_finished=None):
+    """Run `test(server, port)` against a MatchServer listening on a free loopback port"""
+    async def main():
+        server = MatchServer(load_board(None, use_cache=False), on_finished=on_finished)
+        listener = await server.start('127.0.0.1', 0)
+        async with listener:
+            return await asyncio.wait_for(test(server, listener.sockets[0].getsockname()[1]), 30)
+    return asyncio.run(main())
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, port):
+        return cls(*await asyncio.open_connection('127.0.0.1', port))
+
+    def send(self, payload):
+        self.writer.write(payload if isinstance(payload, bytes) else json.dumps(payload).encode() + b'\n')
+
+    async def read(self):
+        return json.loads(await self.reader.readline())
+
+    async def request(self, payload):
+        self.send(payload)
+        return await self.read()
+
+
+async def start_match(port):
+    """Two connected players of a started match"""
+    first, second = await Client.connect(port), await Client.connect(port)
+    joined = await first.request({'op': 'create', 'players': 2, 'name': 'Ani'})
+    assert (joined['op'], joined['seat'], joined['started']) == ('joined', 0, False)
+    joined = await second.request({'op': 'join', 'match': joined['match'], 'name': 'Budi'})
+    assert (joined['op'], joined['seat'], joined['players']) == ('joined', 1, ['Ani', 'Budi'])
+    assert await first.read() == {'op': 'player_joined', 'seat': 1, 'name': 'Budi'}
+    for client in (first, second):
+        start = await client.read()
+        assert start['op'] == 'start' and start['current'] == 0
+        assert 'seed' not in start and isinstance(start['cosmetic_seed'], int)
+    return first, second
+
+
+async def play_out(players):
+    """Roll in turn until someone wins; returns the last "moved" message"""
+    current = 0
+    while True:
+        moved = await players[current].request({'op': 'roll'})
+        assert moved['op'] == 'moved' and moved['seat'] == current
+        assert await players[1 - current].read() == moved
+        if moved['won']:
+            return moved
+        current = moved['current']
+
+
+def test_join_and_roll():
+    async def test(server, port):
+        first, second = await start_match(port)
+        moved = await first.request({'op': 'roll'})
+        assert moved['op'] == 'moved' and 1 <= moved['dice'] <= 6
+        assert (moved['seat'], moved['current'], moved['turn']) == (0, 1, 1)
+        assert moved['landing'] == 1 + moved['dice']
+        assert await second.read() == moved
+        state = await second.request({'op': 'state'})
+        assert state['positions'][0] == moved['position'] and state['current'] == 1
+    run(test)
+
+
+def test_out_of_turn_and_bad_requests():
+    async def test(server, port):
+        first, second = await start_match(port)
+        assert await second.request({'op': 'roll'}) == {'op': 'error', 'message': "Not your turn"}
+        outsider = await Client.connect(port)
+        assert (await outsider.request({'op': 'roll'}))['message'] == "The match has not started"
+        assert (await outsider.request({'op': 'join', 'match': 99}))['message'] == "No such match, or it is full"
+        assert (await outsider.request({'op': 'create', 'players': 13}))['op'] == 'error'
+        for line in (b'not json\n', b'[1, 2]\n', b'{"op": "fly"}\n'):
+            assert (await outsider.request(line))['message'] == "Expected a JSON object with a known 'op'"
+        assert (await outsider.request({'op': 'join', 'match': []}))['op'] == 'error'
+        assert await outsider.request({'op': 'ping'}) == {'op': 'pong'}
+        # The match is unaffected
+        assert (await first.request({'op': 'roll'}))['op'] == 'moved'
+
+        # An overlong line ends the connection after an error
+        outsider.send(b'x' * (MAX_LINE * 2) + b'\n')
+        assert (await outsider.read())['message'] == "Request line too long"
+        assert await outsider.reader.read() == b''
+    run(test)
+
+
+def test_leaving_player_is_skipped():
+    async def test(server, port):
+        first, second = await start_match(port)
+        second.send({'op': 'leave'})
+        assert await first.read() == {'op': 'player_left', 'seat': 1}
+        # Seat 1 is gone, so every roll comes back to seat 0
+        for _ in range(3):
+            moved = await first.request({'op': 'roll'})
+            if moved['won']:
+                break
+            assert moved['current'] == 0
+    run(test)
+
+
+def test_finished_match_is_recorded(tmp_path):
+    store = ResultsStore(str(tmp_path / 'results.sqlite3'))
+    recorder = MatchRecorder(store)
+
+    async def test(server, port):
+        players = await start_match(port)
+        moved = await play_out(players)
+        assert not server.matches
+        return moved
+    moved = run(test, on_finished=recorder)
+    recorder.close()
+
+    reader = ResultsStore(str(tmp_path / 'results.sqlite3'))
+    [result] = reader.recent()
+    reader.close()
+    assert (result.mode, result.players, result.turns) == ("online", 2, moved['turn'])
+    assert result.winner == ['Ani', 'Budi'][moved['seat']] and result.winner_kind == "human"
+    [path] = glob.glob(os.path.join(os.environ['ULAR_TANGGA_DATA'], 'replays', '*.utr'))
+    replay = Replay.load(path)
+    assert replay.seed == result.seed and len(replay.turns) == moved['turn']
+    assert replay.roster == [("Ani", "human"), ("Budi", "human")]
+
+
+def test_loadtest_smoke(capsys):
+    async def test(server, port):
+        args = argparse.Namespace(host='127.0.0.1', port=port, idle=20, active=3, interval=0.001, duration=0.5)
+        await loadtest.run(args)
+    run(test)
+    output = capsys.readouterr().out
+    assert "20 idle matches open" in output
+    assert "3 active matches" in output
+    assert "Turn latency: p50" in output
+
+
+class FakeWriter:
+    """Stream writer whose socket backlog the test sets"""
+
+    def __init__(self):
+        self.transport = self
+        self.backlog = 0
+        self.lines = []
+
+    def get_write_buffer_size(self):
+        return self.backlog
+
+    def is_closing(self):
+        return False
+
+    def write(self, data):
+        self.lines.append(json.loads(data))
+
+
+def feed_with_spectator():
+    match = Match(1, 2, load_board(None, use_cache=False), seed=5)
+    feed = SpectatorFeed(match)
+    spectator = Connection(FakeWriter())
+    spectator.watching = match
+    feed.subscribe(spectator)
+    return match, feed, spectator.writer
+
+
+def play_turn(match, feed):
+    result = match.state.apply_roll(match.rng.roll())
+    match.replay.record(result.dice)
+    feed.publish(turn_delta(result, match.state.current, len(match.replay.turns)))
+
+
+def test_spectators_get_a_snapshot_then_deltas():
+    async def test(server, port):
+        players = await start_match(port)
+        spectator = await Client.connect(port)
+        spectator.send({'op': 'watch', 'match': 1})
+        snapshot = await spectator.read()
+        assert snapshot['op'] == 'snapshot' and snapshot['turn'] == 0 and snapshot['players'] == ['Ani', 'Budi']
+        moved = await play_out(players)
+        positions = list(snapshot['positions'])
+        for turn in range(1, moved['turn'] + 1):
+            delta = await spectator.read()
+            assert delta['op'] == 'turn' and delta['turn'] == turn
+            positions[delta['seat']] = delta['position']
+        assert delta['won'] and positions[moved['seat']] == moved['position']
+    run(test)
+
+
+def test_lagging_spectator_skips_to_a_keyframe():
+    match, feed, writer = feed_with_spectator()
+    play_turn(match, feed)
+    assert [line['op'] for line in writer.lines] == ['snapshot', 'turn']
+
+    # Over the backlog limit: deltas stop
+    writer.backlog = SPECTATOR_BACKLOG + 1
+    play_turn(match, feed)
+    # Draining, but not yet under the resume threshold: still nothing
+    writer.backlog = SPECTATOR_RESUME + 1
+    play_turn(match, feed)
+    assert len(writer.lines) == 2
+
+    # Caught up: the current snapshot replaces the missed turns, then deltas resume
+    writer.backlog = SPECTATOR_RESUME
+    play_turn(match, feed)
+    keyframe = writer.lines[2]
+    assert keyframe['op'] == 'snapshot' and keyframe['turn'] == 4
+    assert keyframe['positions'] == match.state.positions
+    play_turn(match, feed)
+    assert writer.lines[3]['op'] == 'turn' and writer.lines[3]['turn'] == 5
+
+
+def test_closed_feed_sends_stale_spectators_the_final_snapshot():
+    match, feed, writer = feed_with_spectator()
+    current = FakeWriter()
+    feed.subscribe(Connection(current))
+    writer.backlog = SPECTATOR_BACKLOG + 1
+    while not match.state.game_over:
+        play_turn(match, feed)
+    turns = len(match.replay.turns)
+    assert len(writer.lines) == 1 and len(current.lines) == 1 + turns
+
+    feed.close()
+    assert not feed.subscribers
+    final = writer.lines[-1]
+    assert len(writer.lines) == 2 and final['op'] == 'snapshot'
+    assert final['turn'] == turns and final['winner'] == match.state.winner
+    assert len(current.lines) == 1 + turns  # Already had every delta
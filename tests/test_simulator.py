@@ -0,0 +1,27 @@
+import numpy as np
+
+from engine import default_squares
+from simulator import simulate
+
+
+def test_same_seed_same_statistics():
+    first = simulate(2000, seed=7, batch_size=500)
+    second = simulate(2000, seed=7, batch_size=500)
+    assert np.array_equal(first.lengths, second.lengths)
+    assert np.array_equal(first.wins, second.wins)
+    assert np.array_equal(first.landings, second.landings)
+
+
+def test_every_game_finishes_with_one_winner():
+    stats = simulate(5000, num_players=3, seed=1)
+    assert stats.unfinished == 0
+    assert stats.wins.sum() == len(stats.lengths) == 5000
+    assert stats.lengths.min() >= 1
+
+
+def test_landings_are_counted_before_jumps():
+    stats = simulate(5000, num_players=1, seed=2)
+    # Snake heads and ladder feet are landed on even though no token stays there
+    for square in (4, 16, 28, 47, 80, 98):
+        assert square in default_squares()
+        assert stats.landings[square] > 0
@@ -0,0 +1,50 @@
+import pytest
+
+from tournament import format_report, play_chunk, wilson_interval
+
+
+def test_pairings_are_decided_without_draws():
+    for pairing in (("easy", "medium"), ("easy", "hard"), ("medium", "hard")):
+        _, totals, _ = play_chunk((pairing, 0, 200, 0, 1000, None, False))
+        assert totals['games'] == 200
+        assert totals['draws'] == 0
+        assert sum(totals['wins']) == 200
+        assert min(totals['wins']) > 40
+
+
+def test_recorded_rows_name_the_winning_seat():
+    pairing = ("easy", "hard")
+    _, totals, rows = play_chunk((pairing, 0, 20, 0, 1000, None, True))
+    assert len(rows) == 20
+    wins = [0, 0]
+    for game, row in enumerate(rows):
+        difficulties = pairing[::-1] if game % 2 else pairing
+        seat = int(row.winner.split()[-1]) - 1
+        assert row.winner == f"Computer {seat + 1}"
+        assert row.winner_kind == difficulties[seat]
+        assert row.difficulty == "easy vs hard"
+        wins[pairing.index(row.winner_kind)] += 1
+    assert wins == totals['wins']
+
+
+def test_wilson_interval():
+    low, high = wilson_interval(30, 90)
+    assert low == pytest.approx(0.24453, abs=1e-5)
+    assert high == pytest.approx(0.43578, abs=1e-5)
+    assert wilson_interval(0, 0) == (0.0, 0.0)
+    low, high = wilson_interval(0, 10)
+    assert low == pytest.approx(0.0, abs=1e-12) and 0 < high < 0.3
+
+
+def test_report_win_rates_and_intervals():
+    results = {("easy", "hard"): {'games': 100, 'wins': [30, 60], 'draws': 10, 'first_seat_wins': 50,
+                                  'turns': 4000, 'turns_sq': 170_000}}
+    lines = format_report(results, 2.0).splitlines()
+    assert lines[0] == "Played 100 matches in 2.00 s (50 matches/s)"
+    # Win rates leave out the draws
+    assert "  easy wins: 33.33% (95% CI 24.45% - 43.58%)" in lines
+    assert "  hard wins: 66.67%" in lines
+    assert "  Draws (max turns): 10" in lines
+    assert "  First seat wins: 55.56%" in lines
+    # Standard deviation 10 over 100 matches
+    assert "  Mean turns: 40.00 ± 1.96" in lines
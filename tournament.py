@@ -0,0 +1,163 @@
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from multiprocessing import Pool
+
+import ai
+from engine import GameState
+from rng import MatchRNG, SEED_BITS
+from board_spec import load_board
+from results import MatchResult, ResultsStore
+
+# Headless AI Tournament
+# Plays AI-vs-AI matches with the engine rules and no move_delay or dice
+# animation. As in the game, every AI rolls on each of its turns, so the
+# report shows how balanced the difficulty levels are, the first-seat
+# advantage and how long matches run on a board. Matches that reach
+# max_turns count as draws.
+
+CHUNK_SIZE = 250  # Matches per worker task
+
+
+def empty_totals():
+    """Counters aggregated per difficulty pairing"""
+    return {'games': 0, 'wins': [0, 0], 'draws': 0, 'first_seat_wins': 0,
+            'turns': 0, 'turns_sq': 0}
+
+
+def play_match(difficulties, squares, rng, max_turns=1000, layout=None):
+    """Play one AI-vs-AI match with a MatchRNG; returns (winning seat or None, turns)"""
+    if layout is None:
+        state = GameState(len(difficulties), squares)
+    else:
+        state = GameState(len(difficulties), squares, layout.cells, layout.jump)
+    while not state.game_over and state.turn < max_turns:
+        state.apply_roll(rng.roll())
+    return state.winner, state.turn
+
+
+def play_chunk(task):
+    """Worker entry point: play one chunk of a pairing with its own RNG stream"""
+    pairing, chunk_index, games, seed, max_turns, board_path, record = task
+    # String seeds are hashed deterministically, so each chunk's match seeds only
+    # depend on (seed, pairing, chunk) and not on which worker runs it
+    match_seeds = random.Random(f"{seed}:{pairing[0]}:{pairing[1]}:{chunk_index}")
+    layout = load_board(board_path)
+    squares = layout.squares
+
+    totals = empty_totals()
+    rows = []  # MatchResult per match when recording
+    for game in range(games):
+        # Alternate seats so neither side keeps the first-move advantage
+        swapped = (chunk_index * games + game) % 2 == 1
+        difficulties = (pairing[1], pairing[0]) if swapped else pairing
+        rng = MatchRNG(match_seeds.getrandbits(SEED_BITS))  # Any single match can be re-run from its seed
+        started = time.perf_counter()
+        winner, turns = play_match(difficulties, squares, rng, max_turns, layout)
+        if record:
+            # Seats are named like the game's computers; the kind is the winner's difficulty
+            winner_name = None if winner is None else f"Computer {winner + 1}"
+            winner_kind = None if winner is None else difficulties[winner]
+            rows.append(MatchResult("tournament", f"{pairing[0]} vs {pairing[1]}", 2, turns, winner_name,
+                                    winner_kind, time.perf_counter() - started, layout.spec_hash, rng.seed,
+                                    time.time()))
+
+        totals['games'] += 1
+        totals['turns'] += turns
+        totals['turns_sq'] += turns * turns
+        if winner is None:
+            totals['draws'] += 1
+        else:
+            totals['wins'][winner ^ swapped] += 1
+            totals['first_seat_wins'] += winner == 0
+    return pairing, totals, rows
+
+
+def run_tournament(games_per_pairing, difficulties=ai.DIFFICULTIES, seed=0, workers=None, max_turns=1000,
+                   board_path=None, store=None):
+    """Run every difficulty pairing in parallel and aggregate the results per pairing.
+
+    Every match is also recorded in `store` (a ResultsStore) if one is given.
+    """
+    pairings = list(itertools.combinations(difficulties, 2))
+    tasks = []
+    for pairing in pairings:
+        chunks = math.ceil(games_per_pairing / CHUNK_SIZE)
+        for chunk_index in range(chunks):
+            games = min(CHUNK_SIZE, games_per_pairing - chunk_index * CHUNK_SIZE)
+            tasks.append((pairing, chunk_index, games, seed, max_turns, board_path, store is not None))
+
+    results = {pairing: empty_totals() for pairing in pairings}
+    with Pool(processes=workers or os.cpu_count()) as pool:
+        for pairing, totals, rows in pool.imap_unordered(play_chunk, tasks):
+            if store is not None:
+                store.record_many(rows)
+            merged = results[pairing]
+            for key, value in totals.items():
+                if key == 'wins':
+                    merged['wins'][0] += value[0]
+                    merged['wins'][1] += value[1]
+                else:
+                    merged[key] += value
+    return results
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """95% Wilson score interval for a win rate"""
+    if trials == 0:
+        return 0.0, 0.0
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return center - margin, center + margin
+
+
+def format_report(results, elapsed):
+    """Human readable tournament report"""
+    total_games = sum(totals['games'] for totals in results.values())
+    lines = [f"Played {total_games:,} matches in {elapsed:.2f} s ({total_games / elapsed:,.0f} matches/s)"]
+    for (first, second), totals in results.items():
+        games = totals['games']
+        decided = games - totals['draws']
+        low, high = wilson_interval(totals['wins'][0], decided)
+        mean = totals['turns'] / games
+        variance = max(0.0, totals['turns_sq'] / games - mean * mean)
+        margin = 1.96 * math.sqrt(variance / games)
+        lines.append(f"\n{first} vs {second} ({games:,} matches)")
+        lines.append(f"  {first} wins: {totals['wins'][0] / max(decided, 1):.2%} "
+                     f"(95% CI {low:.2%} - {high:.2%})")
+        lines.append(f"  {second} wins: {totals['wins'][1] / max(decided, 1):.2%}")
+        lines.append(f"  Draws (max turns): {totals['draws']:,}")
+        lines.append(f"  First seat wins: {totals['first_seat_wins'] / max(decided, 1):.2%}")
+        lines.append(f"  Mean turns: {mean:.2f} ± {margin:.2f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless AI-vs-AI tournament between difficulty levels")
+    parser.add_argument('--games', type=int, default=10_000, help="matches per difficulty pairing")
+    parser.add_argument('--seed', type=int, default=0, help="base seed of the per-chunk RNG streams")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--max-turns', type=int, default=1000, help="turns before a match is a draw")
+    parser.add_argument('--board', default=None, help="board spec file (JSON/TOML), classic board by default")
+    parser.add_argument('--record', nargs='?', const='', default=None, metavar='DB',
+                        help="save every match to a results database (the one in the data directory by default)")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.record or None) if args.record is not None else None
+    started = time.perf_counter()
+    try:
+        results = run_tournament(args.games, seed=args.seed, workers=args.workers, max_turns=args.max_turns,
+                                 board_path=args.board, store=store)
+    finally:
+        if store is not None:
+            store.close()
+    print(format_report(results, time.perf_counter() - started))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,38 @@
-import random
+import os
+from rng import default_rng
 
-def roll_dice():
-    """Simulate dice roll (1-6)"""
-    return random.randint(1, 6)
+def roll_dice(rng=None):
+    """Simulate dice roll (1-6) from a match's MatchRNG, or the process-wide stream"""
+    return (rng or default_rng()).roll()
 
-def get_board_coordinates(position):
-    """Convert board position (1-100) to row, col coordinates"""
-    if position < 1 or position > 100:
+def get_board_coordinates(position, rows=10, cols=10):
+    """Convert board position (1..rows*cols) to row, col coordinates"""
+    if position < 1 or position > rows * cols:
         return None, None
     
     # Adjust for 0-based indexing
     pos = position - 1
-    row = pos // 10
-    col = pos % 10
+    row = pos // cols
+    col = pos % cols
     
     # Handle zigzag pattern (odd rows go right to left)
     if row % 2 == 1:
-        col = 9 - col
+        col = cols - 1 - col
     
-    return row, col
\ No newline at end of file
+    return row, col
+
+def cache_dir(*parts):
+    """Per-user cache directory (override with ULAR_TANGGA_CACHE), created on demand"""
+    base = os.environ.get('ULAR_TANGGA_CACHE') or os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'ular_tangga')
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def data_dir(*parts):
+    """Per-user data directory for saved files such as replays (override with ULAR_TANGGA_DATA)"""
+    base = os.environ.get('ULAR_TANGGA_DATA') or os.path.join(
+        os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share'), 'ular_tangga')
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path